@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Daemon bot dengan state hangat + API job lokal (HTTP).
+
+Akun diturunkan sekali, koneksi RPC, NonceManager, FeeOracle, cache state
+dan controller concurrency tetap hidup antar job. Job masuk antrian dan
+dijalankan oleh beberapa runner thread, jadi campaign bisa tumpang tindih.
+
+API (default http://127.0.0.1:9500):
+    POST /jobs          {"action": "owlto", "params": {...}, "lines": [1, 2]}  → {"id": ..., "status": "queued"}
+    GET  /jobs          daftar job (tanpa results)
+    GET  /jobs/<id>     status + summary + results
+    GET  /status        akun, antrian, runner, cache & concurrency per network
+
+Pemakaian:
+    python daemon.py serve
+    python daemon.py submit --action erc20 --name cuan --symbol CUAN
+    python daemon.py status [job_id]
+"""
+
+import argparse
+import itertools
+import json
+import queue
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+from utils import MultiAccountFromPK, ConfigManager, RetryPolicy
+from sharding import run_action, summarize
+from keystore import load_accounts
+
+DEFAULT_PORT = 9500
+ACTIONS = ('owlto', 'erc20', 'gmon', 'omnihub', 'bridge', 'workflow', 'all_in', 'balances')
+
+
+class BotDaemon:
+    """Satu bot + akun yang di-load sekali, dengan antrian job dan runner thread."""
+
+    def __init__(self, config, job_workers=2):
+        self.config = {**config, 'save_results': False}
+        self.bot = MultiAccountFromPK(
+            config['rpc_url'], config.get('giwa_rpc_url'), RetryPolicy.from_config(config.get('retry')),
+            config.get('concurrency'), config.get('fee_schedule'), config.get('websocket')
+        )
+        started = time.time()
+        # Keystore di-unlock sekali di background; job boleh mulai dengan akun yang sudah terbuka
+        self.accounts = load_accounts(self.bot, config)
+        print(f"🔑 {len(self.accounts)} accounts registered in {time.time() - started:.1f}s")
+
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._runners = [
+            threading.Thread(target=self._runner, name=f"job-runner-{i}", daemon=True) for i in range(job_workers)
+        ]
+        for t in self._runners:
+            t.start()
+
+    # -----------
+    # Jobs
+    # -----------
+
+    def submit(self, action, params=None, lines=None):
+        """Masukkan job ke antrian. Return record job."""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action} (pilih: {', '.join(ACTIONS)})")
+        with self._lock:
+            job_id = str(next(self._ids))
+            job = {
+                'id': job_id,
+                'action': action,
+                'params': params or {},
+                'lines': lines,
+                'status': 'queued',
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'summary': None,
+                'results': None,
+                'error': None,
+            }
+            self.jobs[job_id] = job
+        print(f"📥 Job {job_id}: {action} queued")
+        self._queue.put(job_id)
+        return job
+
+    def _select_accounts(self, lines):
+        if not lines:
+            return self.accounts
+        wanted = set(lines)
+        return [acc for acc in self.accounts if acc['line_number'] in wanted]
+
+    def _execute(self, job):
+        accounts = self._select_accounts(job['lines'])
+        action = job['action']
+        if action == 'all_in':
+            # import di sini supaya modul main (menu interaktif) tidak ikut ter-load saat start
+            from main import try_all_in
+            return try_all_in(self.bot, self.config, accounts, network='giwa')
+        if action == 'balances':
+            return self.bot.check_bridge_balances(accounts)
+        return run_action(self.bot, self.config, accounts, action, job['params'])
+
+    def _runner(self):
+        while True:
+            job_id = self._queue.get()
+            job = self.jobs[job_id]
+            job['status'] = 'running'
+            job['started_at'] = time.time()
+            print(f"🏃 Job {job_id}: {job['action']} started")
+            try:
+                results = self._execute(job)
+                job['results'] = results
+                job['summary'] = summarize(results) if job['action'] != 'balances' else {'total': len(results)}
+                job['status'] = 'done'
+            except Exception as e:
+                job['error'] = str(e)
+                job['status'] = 'failed'
+            job['finished_at'] = time.time()
+            print(f"🏁 Job {job_id}: {job['status']} in {job['finished_at'] - job['started_at']:.1f}s")
+
+    def list_jobs(self):
+        with self._lock:
+            return [{k: v for k, v in job.items() if k != 'results'} for job in self.jobs.values()]
+
+    def status(self):
+        networks = {}
+        for name, client in self.bot.clients.items():
+            networks[name] = {
+                'cache': client.state.stats(),
+                'concurrency': client.concurrency.limit if client.concurrency else None,
+            }
+        counts = {}
+        for job in self.list_jobs():
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {
+            'accounts': len(self.accounts),
+            'queued': self._queue.qsize(),
+            'runners': len(self._runners),
+            'jobs': counts,
+            'networks': networks,
+        }
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """HTTP JSON API di atas BotDaemon."""
+
+    daemon = None
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, code, body):
+        data = json.dumps(body, default=str).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        parts = [p for p in self.path.split('/') if p]
+        if parts == ['status']:
+            return self._reply(200, self.daemon.status())
+        if parts == ['jobs']:
+            return self._reply(200, self.daemon.list_jobs())
+        if len(parts) == 2 and parts[0] == 'jobs':
+            job = self.daemon.jobs.get(parts[1])
+            if job is None:
+                return self._reply(404, {'error': f"job {parts[1]} not found"})
+            return self._reply(200, job)
+        self._reply(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            return self._reply(404, {'error': 'not found'})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            job = self.daemon.submit(body.get('action'), body.get('params'), body.get('lines'))
+        except (ValueError, TypeError) as e:
+            return self._reply(400, {'error': str(e)})
+        self._reply(202, {'id': job['id'], 'status': job['status']})
+
+
+def serve(config, host='127.0.0.1', port=DEFAULT_PORT, job_workers=2):
+    """Jalankan daemon sampai Ctrl+C."""
+    JobRequestHandler.daemon = BotDaemon(config, job_workers)
+    with ThreadingHTTPServer((host, port), JobRequestHandler) as server:
+        print(f"🛰️  Daemon listening on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Daemon stopped")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long-running bot daemon with a local job API")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve_p = sub.add_parser('serve', help='Jalankan daemon')
+    serve_p.add_argument('--config', default='config.json')
+    serve_p.add_argument('--host', default='127.0.0.1')
+    serve_p.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_p.add_argument('--workers', type=int, default=2, help='Job yang boleh jalan bersamaan')
+
+    submit_p = sub.add_parser('submit', help='Kirim job ke daemon')
+    submit_p.add_argument('--action', choices=ACTIONS, required=True)
+    submit_p.add_argument('--lines', default='', help='Nomor baris akun.txt, dipisah koma (default: semua)')
+    submit_p.add_argument('--name')
+    submit_p.add_argument('--symbol')
+    submit_p.add_argument('--amount')
+    submit_p.add_argument('--url', default=f'http://127.0.0.1:{DEFAULT_PORT}')
+
+    status_p = sub.add_parser('status', help='Status daemon atau satu job')
+    status_p.add_argument('job_id', nargs='?')
+    status_p.add_argument('--url', default=f'http://127.0.0.1:{DEFAULT_PORT}')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        config = ConfigManager.load_config(args.config)
+        if not config:
+            sys.exit(1)
+        serve(config, args.host, args.port, args.workers)
+        return
+
+    if args.command == 'submit':
+        params = {k: v for k, v in (('name', args.name), ('symbol', args.symbol), ('amount', args.amount)) if v}
+        lines = [int(x) for x in args.lines.split(',') if x.strip()] or None
+        response = requests.post(f"{args.url}/jobs", json={'action': args.action, 'params': params, 'lines': lines})
+    else:
+        path = f"/jobs/{args.job_id}" if args.job_id else "/status"
+        response = requests.get(f"{args.url}{path}")
+    print(json.dumps(response.json(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Ledger biaya gas aktual (vs estimasi) dari receipt.
+
+`estimate_total_gas_cost` menghitung worst case (akun × gas_limit × gas price).
+Ledger ini mengambil receipt semua TX satu batch (batch JSON-RPC), mencatat
+gasUsed × effectiveGasPrice per operasi, per akun dan per run, lalu hasil
+ukurnya dipakai lagi untuk estimasi biaya & gas_limit run berikutnya.
+
+Config:
+    "gas_ledger": {
+        "enabled": false,          # opt-in: menunggu receipt setelah tiap batch
+        "file": "gas_ledger.json",
+        "receipt_timeout": 60,     # detik menunggu receipt setelah batch
+        "auto_gas_limit": true,    # gas_limit = max gasUsed terukur × headroom
+        "headroom": 1.3,
+        "min_samples": 10          # minimal TX terukur sebelum gas_limit diganti
+    }
+
+Pemakaian:
+    python gas_ledger.py report [--runs 10]
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+
+from web3 import Web3
+
+MAX_RUNS = 200
+
+
+def tx_hashes_by_operation(operation, results):
+    """
+    (operation, tx_hash, address) dari list hasil batch. Hasil Try All In
+    (owlto_sc / erc20 / gmon per akun) dipecah per operasi.
+    """
+    out = []
+    for r in results:
+        if not isinstance(r, dict):
+            continue
+        nested = [(op, r.get(key)) for key, op in (('owlto_sc', 'owlto'), ('erc20', 'erc20'), ('gmon', 'gmon'))
+                  if isinstance(r.get(key), dict)]
+        # All-in bundler punya tx_hash di level akun (ketiga step berbagi satu TX)
+        if nested and not r.get('tx_hash'):
+            out += [(op, step['tx_hash'], r.get('address')) for op, step in nested if step.get('tx_hash')]
+        elif r.get('tx_hash'):
+            out.append((operation, r['tx_hash'], r.get('address')))
+    return out
+
+
+class GasLedger:
+    """
+    Ledger JSON: agregat per network:operasi, per akun, dan riwayat run.
+
+    Args:
+        path: File JSON ledger
+        headroom: Pengali max gasUsed terukur untuk gas_limit otomatis
+        min_samples: Minimal TX terukur sebelum gas_limit otomatis dipakai
+    """
+
+    def __init__(self, path='gas_ledger.json', headroom=1.3, min_samples=10, receipt_timeout=60,
+                 auto_gas_limit=True):
+        self.path = path
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.receipt_timeout = receipt_timeout
+        self.auto_gas_limit = auto_gas_limit
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r') as f:
+                self.data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.data = {}
+        self.data.setdefault('operations', {})
+        self.data.setdefault('accounts', {})
+        self.data.setdefault('runs', [])
+
+    @classmethod
+    def from_config(cls, config):
+        """GasLedger dari blok `gas_ledger` config (None kalau dimatikan)."""
+        cfg = config.get('gas_ledger') or {}
+        if not cfg.get('enabled', False):
+            return None
+        return cls(
+            path=cfg.get('file', 'gas_ledger.json'),
+            headroom=cfg.get('headroom', 1.3),
+            min_samples=cfg.get('min_samples', 10),
+            receipt_timeout=cfg.get('receipt_timeout', 60),
+            auto_gas_limit=cfg.get('auto_gas_limit', True),
+        )
+
+    def _save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    # -----------
+    # Recording
+    # -----------
+
+    def record(self, bot, network, operation, results, gas_limit=None):
+        """
+        Ambil receipt semua TX di `results` (batch polling) dan catat biaya aktualnya.
+        `gas_limit` (int, atau dict per operasi) dipakai untuk membandingkan dengan estimasi worst case.
+        Return ringkasan run (juga disimpan ke ledger).
+        """
+        entries = tx_hashes_by_operation(operation, results)
+        if not entries:
+            return None
+        receipts = bot.wait_for_receipts(network, [h for _, h, _ in entries], timeout=self.receipt_timeout)
+
+        run = {
+            'id': f"{int(time.time())}-{operation}",
+            'time': time.time(),
+            'network': network,
+            'operation': operation,
+            'txs': len({bot._normalize_hash(h) for _, h, _ in entries}),
+            'measured': 0,
+            'gas_used': 0,
+            'fee_wei': 0,
+            'estimated_wei': 0,
+            'operations': {},
+        }
+        seen = set()
+        with self._lock:
+            for op, tx_hash, address in entries:
+                receipt = receipts.get(bot._normalize_hash(tx_hash))
+                if receipt is None or tx_hash in seen:
+                    continue
+                seen.add(tx_hash)
+                gas_used = int(receipt.get('gasUsed', '0x0'), 16)
+                price = int(receipt.get('effectiveGasPrice') or '0x0', 16)
+                fee = gas_used * price
+
+                run['measured'] += 1
+                run['gas_used'] += gas_used
+                run['fee_wei'] += fee
+                limit = gas_limit.get(op) if isinstance(gas_limit, dict) else gas_limit
+                if limit:
+                    run['estimated_wei'] += int(limit) * price
+                per_op = run['operations'].setdefault(op, {'txs': 0, 'gas_used': 0, 'fee_wei': 0})
+                per_op['txs'] += 1
+                per_op['gas_used'] += gas_used
+                per_op['fee_wei'] += fee
+
+                # Hanya TX sukses yang dipakai untuk gas_limit (TX revert bisa habis gas)
+                if int(receipt.get('status', '0x0'), 16) == 1:
+                    agg = self.data['operations'].setdefault(f"{network}:{op}", {
+                        'count': 0, 'gas_used': 0, 'max_gas_used': 0, 'fee_wei': 0,
+                    })
+                    agg['count'] += 1
+                    agg['gas_used'] += gas_used
+                    agg['max_gas_used'] = max(agg['max_gas_used'], gas_used)
+                    agg['fee_wei'] += fee
+                if address:
+                    acc = self.data['accounts'].setdefault(f"{network}:{address}", {'txs': 0, 'gas_used': 0, 'fee_wei': 0})
+                    acc['txs'] += 1
+                    acc['gas_used'] += gas_used
+                    acc['fee_wei'] += fee
+
+            self.data['runs'] = (self.data['runs'] + [run])[-MAX_RUNS:]
+            self._save()
+        self.print_run(run)
+        return run
+
+    # -----------
+    # Feedback
+    # -----------
+
+    def stats(self, network, operation):
+        """Agregat terukur untuk operasi, atau None kalau sampel belum cukup."""
+        agg = self.data['operations'].get(f"{network}:{operation}")
+        if not agg or agg['count'] < self.min_samples:
+            return None
+        return {**agg, 'avg_gas_used': agg['gas_used'] / agg['count']}
+
+    def expected_gas(self, network, operation):
+        """Rata-rata gasUsed terukur per TX (None kalau belum cukup sampel)."""
+        stats = self.stats(network, operation)
+        return int(stats['avg_gas_used']) if stats else None
+
+    def gas_limit(self, network, operation, default):
+        """
+        gas_limit untuk operasi: max gasUsed terukur × headroom (tidak pernah di atas
+        `default`). Tanpa sampel cukup / auto_gas_limit mati → `default`.
+        """
+        stats = self.stats(network, operation)
+        if not self.auto_gas_limit or not stats or default is None:
+            return default
+        return min(int(default), math.ceil(stats['max_gas_used'] * self.headroom))
+
+    # -----------
+    # Report
+    # -----------
+
+    @staticmethod
+    def print_run(run):
+        actual = Web3.from_wei(run['fee_wei'], 'ether')
+        print(f"\n🧾 Gas ledger ({run['network']} {run['operation']}): {run['measured']}/{run['txs']} TX terukur")
+        for op, v in run['operations'].items():
+            print(f"  {op}: avg gasUsed {v['gas_used'] // max(v['txs'], 1):,} → "
+                  f"{Web3.from_wei(v['fee_wei'], 'ether'):.8f} ETH")
+        if run['estimated_wei']:
+            estimated = Web3.from_wei(run['estimated_wei'], 'ether')
+            ratio = run['fee_wei'] / run['estimated_wei']
+            print(f"  Actual {actual:.8f} ETH vs estimated {estimated:.8f} ETH ({ratio:.0%})")
+        else:
+            print(f"  Actual {actual:.8f} ETH")
+
+    def report(self, runs=10):
+        print("📒 Measured per operation:")
+        for key, agg in sorted(self.data['operations'].items()):
+            avg = agg['gas_used'] // max(agg['count'], 1)
+            print(f"  {key}: {agg['count']} TX, avg gasUsed {avg:,}, max {agg['max_gas_used']:,}, "
+                  f"total {Web3.from_wei(agg['fee_wei'], 'ether'):.8f} ETH")
+        print(f"\n🕘 Last {runs} runs:")
+        for run in self.data['runs'][-runs:]:
+            when = time.strftime('%Y-%m-%d %H:%M', time.localtime(run['time']))
+            print(f"  {when} {run['network']} {run['operation']}: {run['measured']} TX, "
+                  f"{Web3.from_wei(run['fee_wei'], 'ether'):.8f} ETH")
+        top = sorted(self.data['accounts'].items(), key=lambda kv: -kv[1]['fee_wei'])[:5]
+        if top:
+            print("\n💸 Top spending accounts:")
+            for key, acc in top:
+                print(f"  {key}: {acc['txs']} TX, {Web3.from_wei(acc['fee_wei'], 'ether'):.8f} ETH")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Actual gas cost ledger")
+    sub = parser.add_subparsers(dest='command', required=True)
+    report_p = sub.add_parser('report', help='Ringkasan biaya gas terukur')
+    report_p.add_argument('--file', default='gas_ledger.json')
+    report_p.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == 'report':
+        GasLedger(args.file).report(args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Index lokal (SQLite) aktivitas akun kita di chain.
+
+Yang di-index per akun:
+  - owlto / erc20 : TX contract creation (scan tx data blok GIWA), plus status receipt
+  - gmon          : TX ke factory GMONChain (scan tx data blok GIWA), plus status receipt
+  - bundle        : TX ke kontrak bundler all-in → dicatat sebagai owlto + erc20 + gmon (alamat dari event Bundled)
+  - omnihub       : log Transfer(0x0 → akun) dari kontrak Omnihub (eth_getLogs GIWA)
+  - bridge        : log TransactionDeposited(from = akun) di OptimismPortal (eth_getLogs Sepolia)
+
+Scan berjalan per range blok dengan checkpoint per sumber, jadi sync berikutnya
+hanya memproses blok baru. Batch di main.py bisa melewati akun yang sudah
+selesai dengan satu query ke index (config `skip_indexed`).
+
+Pemakaian:
+    python indexer.py sync                 # scan incremental semua sumber
+    python indexer.py sync --from-block giwa=123000
+    python indexer.py status
+"""
+
+import argparse
+import sqlite3
+import sys
+import threading
+
+from web3 import Web3
+
+from keystore import account_addresses
+from utils import MultiAccountFromPK, ConfigManager, TRANSACTION_DEPOSITED_TOPIC
+
+KINDS = ('owlto', 'erc20', 'gmon', 'omnihub', 'bridge')
+# keccak("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+ZERO_TOPIC = "0x" + "00" * 32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity (
+    network  TEXT NOT NULL,
+    kind     TEXT NOT NULL,
+    address  TEXT NOT NULL,
+    tx_hash  TEXT NOT NULL,
+    block    INTEGER NOT NULL,
+    status   INTEGER,
+    contract TEXT,
+    PRIMARY KEY (network, kind, tx_hash)
+);
+CREATE INDEX IF NOT EXISTS activity_done ON activity (network, kind, status, address);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    network    TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    last_block INTEGER NOT NULL,
+    PRIMARY KEY (network, source)
+);
+"""
+
+
+def _topic_for(address):
+    return "0x" + address[2:].lower().rjust(64, "0")
+
+
+def _address_from_topic(topic):
+    return Web3.to_checksum_address("0x" + topic[-40:])
+
+
+class EventIndex:
+    """
+    Index SQLite untuk deploy, mint & deposit milik akun kita.
+
+    Args:
+        bot: MultiAccountFromPK (klien & batch RPC)
+        db_path: File SQLite
+        lookback: Jumlah blok ke belakang untuk sync pertama (tanpa checkpoint / start_block)
+        start_blocks: {network: blok awal} untuk sync pertama, override `lookback`
+        log_range: Range blok per eth_getLogs
+        block_batch: Jumlah blok per batch eth_getBlockByNumber
+        confirmations: Blok terakhir yang belum di-index (hindari reorg)
+    """
+
+    def __init__(self, bot, db_path='index.db', lookback=50_000, start_blocks=None, log_range=2_000,
+                 block_batch=50, confirmations=5):
+        self.bot = bot
+        self.lookback = lookback
+        self.start_blocks = start_blocks or {}
+        self.log_range = log_range
+        self.block_batch = block_batch
+        self.confirmations = confirmations
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, bot, config):
+        """Bangun index dari blok `indexer` di config.json (semua key opsional)."""
+        cfg = config.get('indexer', {})
+        return cls(
+            bot,
+            db_path=cfg.get('db_file', 'index.db'),
+            lookback=cfg.get('lookback', 50_000),
+            start_blocks=cfg.get('start_block', {}),
+            log_range=cfg.get('log_range', 2_000),
+            block_batch=cfg.get('block_batch', 50),
+            confirmations=cfg.get('confirmations', 5),
+        )
+
+    # -----------
+    # Checkpoints
+    # -----------
+
+    def checkpoint(self, network, source):
+        with self._lock:
+            row = self.db.execute(
+                "SELECT last_block FROM checkpoints WHERE network = ? AND source = ?", (network, source)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _save_checkpoint(self, network, source, block):
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT INTO checkpoints (network, source, last_block) VALUES (?, ?, ?) "
+                "ON CONFLICT (network, source) DO UPDATE SET last_block = excluded.last_block",
+                (network, source, block),
+            )
+
+    def _save_rows(self, rows):
+        """rows: (network, kind, address, tx_hash, block, status, contract)"""
+        if not rows:
+            return
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT INTO activity (network, kind, address, tx_hash, block, status, contract) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (network, kind, tx_hash) DO UPDATE SET status = excluded.status, "
+                "contract = COALESCE(excluded.contract, activity.contract)",
+                rows,
+            )
+
+    def _ranges(self, network, source, head, step, from_block=None):
+        """Range (start, end) yang belum di-index untuk satu sumber, sampai head - confirmations."""
+        last = self.checkpoint(network, source)
+        if from_block is not None:
+            start = from_block
+        elif last is not None:
+            start = last + 1
+        else:
+            start = self.start_blocks.get(network, max(0, head - self.lookback))
+        end = head - self.confirmations
+        for lo in range(start, end + 1, step):
+            yield lo, min(lo + step - 1, end)
+
+    # -----------
+    # Sync
+    # -----------
+
+    def sync(self, accounts, networks=('giwa', 'sepolia'), from_blocks=None):
+        """
+        Scan incremental semua sumber untuk `accounts` di `networks`.
+        `from_blocks` ({network: blok}) memaksa rescan dari blok tertentu (mis. akun baru).
+
+        Returns:
+            Dict jumlah baris baru per kind.
+        """
+        from_blocks = from_blocks or {}
+        addresses = {acc['address'].lower(): acc['address'] for acc in accounts}
+        found = {kind: 0 for kind in KINDS}
+
+        for network in networks:
+            if network not in self.bot.clients:
+                continue
+            client = self.bot.client(network)
+            head = client.w3.eth.block_number
+            start = from_blocks.get(network)
+            if network == 'giwa':
+                for kind, n in self._sync_giwa_blocks(addresses, head, start).items():
+                    found[kind] += n
+                found['omnihub'] += self._sync_omnihub_logs(addresses, head, start)
+            elif network == 'sepolia':
+                found['bridge'] += self._sync_portal_logs(addresses, head, start)
+
+        print("🗂️  Index synced: " + ", ".join(f"{k}+{v}" for k, v in found.items()))
+        return found
+
+    def _classify_tx(self, tx, factory, owlto_code, erc20_code):
+        if not tx.get('to'):
+            data = (tx.get('input') or tx.get('data') or '').lower()
+            if data.startswith(owlto_code):
+                return 'owlto'
+            if data.startswith(erc20_code):
+                return 'erc20'
+            return None
+        if tx['to'].lower() == factory:
+            return 'gmon'
+        # TX ke kontrak bundler: init code Owlto mulai setelah header 4 word
+        data = (tx.get('input') or tx.get('data') or '').lower()
+        if data[2 + 256:].startswith(owlto_code[2:]):
+            return 'bundle'
+        return None
+
+    def _sync_giwa_blocks(self, addresses, head, from_block=None):
+        """Scan tx data blok GIWA: deploy Owlto/ERC20 & panggilan factory GMON dari akun kita."""
+        network, source = 'giwa', 'blocks'
+        rpc_url = self.bot._rpc_url(network)
+        factory = self.bot.get_gmonchain_call_params()[0].lower()
+        owlto_code = self.bot.get_owlto_hex_data().lower()
+        erc20_code = self.bot.get_owlto_erc20_bytecode().lower()
+        found = {kind: 0 for kind in KINDS}
+
+        for lo, hi in self._ranges(network, source, head, self.block_batch, from_block):
+            blocks = self.bot._rpc_batch(
+                rpc_url, [("eth_getBlockByNumber", [hex(n), True]) for n in range(lo, hi + 1)]
+            )
+            matches = []
+            for block in blocks:
+                if not block or 'error' in block:
+                    raise RuntimeError(f"Block fetch failed in range {lo}-{hi}: {block}")
+                for tx in block.get('transactions', []):
+                    sender = addresses.get(tx['from'].lower())
+                    if not sender:
+                        continue
+                    kind = self._classify_tx(tx, factory, owlto_code, erc20_code)
+                    if kind:
+                        matches.append((kind, sender, tx))
+
+            rows = []
+            if matches:
+                receipts = self.bot._rpc_batch(
+                    rpc_url, [("eth_getTransactionReceipt", [tx['hash']]) for _, _, tx in matches]
+                )
+                for (kind, sender, tx), receipt in zip(matches, receipts):
+                    ok = receipt and 'error' not in receipt
+                    status = int(receipt['status'], 16) if ok else None
+                    if kind == 'bundle':
+                        # Satu TX bundler = owlto + erc20 + gmon, alamat kontrak dari event Bundled
+                        owlto, erc20 = self.bot.parse_bundled_logs(receipt).get(sender, (None, None)) if ok else (None, None)
+                        parts = (('owlto', owlto), ('erc20', erc20), ('gmon', None))
+                    else:
+                        contract = receipt.get('contractAddress') if ok else None
+                        parts = ((kind, contract and Web3.to_checksum_address(contract)),)
+                    for part_kind, contract in parts:
+                        rows.append((network, part_kind, sender, tx['hash'].lower(), int(tx['blockNumber'], 16),
+                                     status, contract))
+                        found[part_kind] += 1
+            self._save_rows(rows)
+            self._save_checkpoint(network, source, hi)
+        return found
+
+    def _get_logs(self, network, address, topics, lo, hi):
+        return self.bot.client(network).w3.eth.get_logs({
+            'address': Web3.to_checksum_address(address),
+            'topics': topics,
+            'fromBlock': lo,
+            'toBlock': hi,
+        })
+
+    def _address_chunks(self, addresses, size=100):
+        topics = [_topic_for(a) for a in addresses.values()]
+        for i in range(0, len(topics), size):
+            yield topics[i:i + size]
+
+    def _sync_omnihub_logs(self, addresses, head, from_block=None):
+        """Log Transfer(0x0 → akun kita) dari kontrak Omnihub = mint sukses."""
+        network, source = 'giwa', 'omnihub_logs'
+        omnihub = self.bot.get_omnihub_mint_params()[0]
+        count = 0
+        for lo, hi in self._ranges(network, source, head, self.log_range, from_block):
+            rows = []
+            for chunk in self._address_chunks(addresses):
+                for log in self._get_logs(network, omnihub, [TRANSFER_TOPIC, ZERO_TOPIC, chunk], lo, hi):
+                    owner = addresses.get(_address_from_topic(log['topics'][2].hex()).lower())
+                    if owner:
+                        rows.append((network, 'omnihub', owner, self.bot._normalize_hash(log['transactionHash']),
+                                     log['blockNumber'], 1, None))
+            self._save_rows(rows)
+            self._save_checkpoint(network, source, hi)
+            count += len(rows)
+        return count
+
+    def _sync_portal_logs(self, addresses, head, from_block=None):
+        """Log TransactionDeposited(from = akun kita) di OptimismPortal Sepolia = bridge sukses."""
+        network, source = 'sepolia', 'portal_logs'
+        portal = self.bot.get_giwa_bridge_contracts()['optimism_portal']
+        count = 0
+        for lo, hi in self._ranges(network, source, head, self.log_range, from_block):
+            rows = []
+            for chunk in self._address_chunks(addresses):
+                for log in self._get_logs(network, portal, [TRANSACTION_DEPOSITED_TOPIC, chunk], lo, hi):
+                    sender = addresses.get(_address_from_topic(log['topics'][1].hex()).lower())
+                    if sender:
+                        rows.append((network, 'bridge', sender, self.bot._normalize_hash(log['transactionHash']),
+                                     log['blockNumber'], 1, None))
+            self._save_rows(rows)
+            self._save_checkpoint(network, source, hi)
+            count += len(rows)
+        return count
+
+    # -----------
+    # Queries
+    # -----------
+
+    def done_addresses(self, network, kind):
+        """Set address (lowercase) yang sudah punya `kind` sukses di `network`."""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT DISTINCT lower(address) FROM activity WHERE network = ? AND kind = ? AND status = 1",
+                (network, kind),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def pending_accounts(self, accounts, network, kind):
+        """Akun yang belum punya `kind` sukses di index."""
+        done = self.done_addresses(network, kind)
+        return [acc for acc in accounts if acc['address'].lower() not in done]
+
+    def contracts(self, address, kind, network='giwa'):
+        """Alamat kontrak hasil deploy `kind` oleh `address` (status sukses)."""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT contract FROM activity WHERE network = ? AND kind = ? AND lower(address) = ? "
+                "AND status = 1 AND contract IS NOT NULL ORDER BY block",
+                (network, kind, address.lower()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def summary(self):
+        """Jumlah akun sukses per (network, kind) + checkpoint tiap sumber."""
+        with self._lock:
+            counts = self.db.execute(
+                "SELECT network, kind, COUNT(DISTINCT address) FROM activity WHERE status = 1 "
+                "GROUP BY network, kind ORDER BY network, kind"
+            ).fetchall()
+            checkpoints = self.db.execute(
+                "SELECT network, source, last_block FROM checkpoints ORDER BY network, source"
+            ).fetchall()
+        return {
+            'accounts': {f"{net}:{kind}": n for net, kind, n in counts},
+            'checkpoints': {f"{net}:{source}": block for net, source, block in checkpoints},
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local SQLite index of deployments, mints and deposits")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sync_p = sub.add_parser('sync', help='Scan blok/log baru ke index')
+    sync_p.add_argument('--config', default='config.json')
+    sync_p.add_argument('--network', choices=('giwa', 'sepolia'), action='append')
+    sync_p.add_argument('--from-block', action='append', default=[], help='network=blok, paksa rescan')
+
+    status_p = sub.add_parser('status', help='Ringkasan isi index')
+    status_p.add_argument('--config', default='config.json')
+
+    args = parser.parse_args(argv)
+    config = ConfigManager.load_config(args.config)
+    if not config:
+        sys.exit(1)
+
+    bot = MultiAccountFromPK(config['rpc_url'], config.get('giwa_rpc_url'))
+    index = EventIndex.from_config(bot, config)
+
+    if args.command == 'sync':
+        accounts = account_addresses(bot, config)  # cukup alamat, tanpa dekripsi keystore
+        from_blocks = {}
+        for item in args.from_block:
+            network, _, block = item.partition('=')
+            from_blocks[network] = int(block)
+        index.sync(accounts, tuple(args.network or ('giwa', 'sepolia')), from_blocks)
+
+    summary = index.summary()
+    print("\n📊 Indexed accounts:")
+    for key, n in summary['accounts'].items():
+        print(f"   {key:<16} {n}")
+    print("📍 Checkpoints:")
+    for key, block in summary['checkpoints'].items():
+        print(f"   {key:<20} {block}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Loader keystore V3 (JSON terenkripsi) sebagai pengganti akun.txt plaintext.
+
+Dekripsi scrypt mahal (ratusan ms per key), jadi semua file didekripsi paralel
+di process pool. Key yang sudah terbuka disimpan di KeyVault (in-memory) selama
+sesi / umur daemon. `KeyVault.accounts()` bisa langsung dipakai batch: akun
+yang sudah unlock diproses duluan sementara sisanya masih didekripsi.
+
+Config:
+    "keystore_dir": "keystores"     # kalau di-set, dipakai menggantikan akun_file
+    password dari env KEYSTORE_PASSWORD atau prompt
+
+Pemakaian:
+    python keystore.py import --akun akun.txt --out keystores   # konversi akun.txt → keystore
+"""
+
+import argparse
+import getpass
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from eth_account import Account
+from web3 import Web3
+
+PASSWORD_ENV = 'KEYSTORE_PASSWORD'
+
+
+def _decrypt(path, password):
+    """Worker process: dekripsi satu file keystore. Return (path, private_key hex)."""
+    with open(path, 'r') as f:
+        keyfile = json.load(f)
+    return path, '0x' + bytes(Account.decrypt(keyfile, password)).hex()
+
+
+def keystore_files(directory):
+    """File keystore di `directory`, urut nama (urutan = line_number)."""
+    return sorted(p for p in glob.glob(os.path.join(directory, '*')) if os.path.isfile(p))
+
+
+class UnlockedAccounts:
+    """
+    View akun dari KeyVault yang bisa di-iterate berkali-kali.
+    Iterasi langsung mengembalikan akun yang sudah unlock, lalu menunggu sisanya
+    (urutan selesai dekripsi). `len()` = jumlah total keystore.
+    """
+
+    def __init__(self, vault):
+        self.vault = vault
+
+    def __len__(self):
+        return self.vault.total
+
+    def __iter__(self):
+        i = 0
+        while True:
+            with self.vault._cond:
+                while i >= len(self.vault._order) and not self.vault.done:
+                    self.vault._cond.wait()
+                if i >= len(self.vault._order):
+                    return
+                account = self.vault._order[i]
+            i += 1
+            yield account
+
+
+class KeyVault:
+    """
+    Vault in-memory untuk key yang sudah didekripsi.
+
+    Args:
+        directory: Folder berisi file keystore V3
+        password: Password keystore (sama untuk semua file)
+        processes: Jumlah process dekripsi (default: jumlah CPU)
+        only_lines: Set line_number yang didekripsi (mis. shard), default semua
+    """
+
+    def __init__(self, directory, password, processes=None, only_lines=None):
+        self.directory = directory
+        files = keystore_files(directory)
+        self._line_of = {path: i for i, path in enumerate(files, 1)}
+        self.files = [p for p in files if only_lines is None or self._line_of[p] in only_lines]
+        self.total = len(self.files)
+        self.errors = {}
+        self._cond = threading.Condition()
+        self._order = []  # akun sesuai urutan selesai unlock
+        self._by_address = {}
+        self._pending = self.total
+        self._started = time.time()
+
+        if not self.files:
+            return
+        executor = ProcessPoolExecutor(max_workers=processes or os.cpu_count() or 1)
+        for path in self.files:
+            executor.submit(_decrypt, path, password).add_done_callback(self._on_decrypted(path))
+        # Jangan tunggu: batch boleh mulai dengan akun yang sudah unlock
+        executor.shutdown(wait=False)
+
+    def _on_decrypted(self, path):
+        def callback(future):
+            account = None
+            try:
+                _, private_key = future.result()
+                account = {
+                    'private_key': private_key,
+                    'address': Account.from_key(private_key).address,
+                    'line_number': self._line_of[path],
+                }
+            except Exception as e:
+                self.errors[path] = str(e)
+                print(f"❌ Keystore {os.path.basename(path)}: {e}")
+            with self._cond:
+                if account:
+                    self._order.append(account)
+                    self._by_address[account['address']] = account
+                self._pending -= 1
+                if self._pending == 0:
+                    print(f"🔓 {len(self._order)}/{self.total} keystores unlocked in "
+                          f"{time.time() - self._started:.1f}s")
+                self._cond.notify_all()
+        return callback
+
+    @property
+    def done(self):
+        return self._pending == 0
+
+    def wait(self, timeout=None):
+        """Tunggu sampai semua keystore selesai didekripsi."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.done, timeout)
+
+    def get(self, address):
+        """Akun untuk `address` (None kalau belum / gagal unlock)."""
+        with self._cond:
+            return self._by_address.get(Web3.to_checksum_address(address))
+
+    def accounts(self):
+        """View akun (streaming) untuk batch method & handler."""
+        return UnlockedAccounts(self)
+
+
+def account_lines(config):
+    """line_number semua akun (keystore_dir atau akun_file) tanpa dekripsi / derivasi key."""
+    directory = config.get('keystore_dir')
+    if directory:
+        return list(range(1, len(keystore_files(directory)) + 1))
+    with open(config['akun_file'], 'r') as f:
+        return [line_num for line_num, line in enumerate(f, 1) if line.strip()]
+
+
+def account_addresses(bot, config):
+    """
+    Akun tanpa private key ({address, line_number}) untuk pemakaian read-only (index).
+    Keystore V3 sudah menyimpan `address`, jadi tidak perlu password / dekripsi.
+    """
+    directory = config.get('keystore_dir')
+    if not directory:
+        return [{'address': acc['address'], 'line_number': acc['line_number']}
+                for acc in bot.load_private_keys(config['akun_file'])]
+    accounts = []
+    for line_num, path in enumerate(keystore_files(directory), 1):
+        with open(path, 'r') as f:
+            address = json.load(f)['address']
+        accounts.append({'address': Web3.to_checksum_address(address), 'line_number': line_num})
+    return accounts
+
+
+def load_accounts(bot, config, password=None, only_lines=None):
+    """
+    Akun dari `keystore_dir` (kalau di-set di config) atau dari `akun_file`.
+    Keystore: return view streaming dari KeyVault; akun.txt: list seperti biasa.
+    `only_lines` membatasi ke line_number tertentu (shard) tanpa menyentuh key lain.
+    """
+    directory = config.get('keystore_dir')
+    if not directory:
+        return bot.load_private_keys(config['akun_file'], only_lines=only_lines)
+
+    password = password or os.environ.get(PASSWORD_ENV) or getpass.getpass("🔐 Keystore password: ")
+    vault = KeyVault(directory, password, config.get('keystore_processes'), only_lines)
+    print(f"🔐 Unlocking {vault.total} keystores from {directory} in background...")
+    return vault.accounts()
+
+
+def import_akun(akun_file, out_dir, password):
+    """Konversi akun.txt (private key plaintext) ke file keystore V3 di `out_dir`."""
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    with open(akun_file, 'r') as f:
+        for line_num, line in enumerate(f, 1):
+            pk = line.strip()
+            if not pk:
+                continue
+            keyfile = Account.encrypt(pk if pk.startswith('0x') else '0x' + pk, password)
+            path = os.path.join(out_dir, f"{line_num:05d}-{keyfile['address']}.json")
+            with open(path, 'w') as out:
+                json.dump(keyfile, out)
+            count += 1
+    print(f"✅ {count} keystores written to {out_dir}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="V3 keystore tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    import_p = sub.add_parser('import', help='Konversi akun.txt ke keystore V3')
+    import_p.add_argument('--akun', default='akun.txt')
+    import_p.add_argument('--out', default='keystores')
+
+    args = parser.parse_args(argv)
+    if args.command == 'import':
+        password = os.environ.get(PASSWORD_ENV) or getpass.getpass("🔐 New keystore password: ")
+        if not password:
+            sys.exit("❌ Password kosong")
+        import_akun(args.akun, args.out, password)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,16 @@ CUANDROP GIWA TESTNET AUTOBOT
 Runner script - semua logic ada di utils.py
 """
 
-from utils import MultiAccountFromPK, ConfigManager
+from utils import MultiAccountFromPK, ConfigManager, RetryPolicy
+from workflow import WorkflowEngine, load_workflow
+from indexer import EventIndex
+from keystore import load_accounts
+from gas_ledger import GasLedger
 from web3 import Web3
 import sys
 import time
+import queue
+import threading
 
 def print_banner():
     """Print banner bot yang sederhana"""
@@ -33,6 +39,9 @@ def show_menu():
 ║ 5. Bridge Sepolia to GIWA             ║
 ║ 6. Try All In (1→2→3 per akun)        ║
 ║ 7. Check Bridge Balances              ║
+║ 8. Run Workflow (workflow.json)       ║
+║ 9. Disperse / Sweep Funds             ║
+║ 10. Fix Nonce Gaps                    ║
 ║ 0. Exit                               ║
 ╚═══════════════════════════════════════╝
     """
@@ -63,6 +72,41 @@ def print_summary(results, title="Transaction Summary"):
     print(f"📝 Total:   {len(results)}")
     return {'success': success_count, 'errors': error_count, 'total': len(results)}
 
+def skip_indexed(bot, config, accounts, network, kind):
+    """
+    Kalau `skip_indexed` aktif: sync index lalu buang akun yang sudah punya `kind`
+    sukses di `network` (satu query SQLite, bukan cek RPC per akun).
+    """
+    if not config.get('skip_indexed', False):
+        return accounts
+    try:
+        index = EventIndex.from_config(bot, config)
+        index.sync(accounts, (network,))
+        pending = index.pending_accounts(accounts, network, kind)
+    except Exception as e:
+        print(f"⚠️ Index tidak bisa dipakai ({e}) → semua akun diproses")
+        return accounts
+    if len(pending) < len(accounts):
+        print(f"⏭️  Skip {len(accounts) - len(pending)} akun yang sudah {kind} (index)")
+    return pending
+
+def gas_plan(config, network, operation, default):
+    """(ledger, gas_limit, expected_gas): gas_limit & gasUsed terukur dari gas ledger (kalau ada)."""
+    ledger = GasLedger.from_config(config)
+    if ledger is None:
+        return None, default, None
+    return ledger, ledger.gas_limit(network, operation, default), ledger.expected_gas(network, operation)
+
+def record_gas(ledger, bot, network, operation, results, gas_limit=None):
+    """Catat biaya gas aktual batch (receipt batch) ke gas ledger."""
+    if ledger is None:
+        return None
+    try:
+        return ledger.record(bot, network, operation, results, gas_limit)
+    except Exception as e:
+        print(f"⚠️ Gas ledger tidak tercatat: {e}")
+        return None
+
 def bridge_sepolia_to_giwa_handler(bot, config, accounts):
     """Fitur bridge Sepolia ke GIWA"""
     print("\n🌉 BRIDGE SEPOLIA TO GIWA")
@@ -79,39 +123,113 @@ def bridge_sepolia_to_giwa_handler(bot, config, accounts):
         print("❌ Invalid amount! Using default 0.001 ETH")
         amount = "0.001"
     
+    accounts = skip_indexed(bot, config, accounts, 'sepolia', 'bridge')
+    if not accounts:
+        print("✅ Semua akun sudah pernah bridge — tidak ada transaksi dikirim.")
+        return
+
     print(f"\n🔄 Bridging {amount} ETH per account...")
     print("⏳ Bridge transactions take 1-3 minutes to appear on GIWA")
     
     # Estimate cost
-    amount_wei = bot.w3.to_wei(amount, 'ether')
-    gas_limit = config.get('bridge_gas_limit', 150000)
+    amount_wei = Web3.to_wei(amount, 'ether')
+    ledger, gas_limit, expected_gas = gas_plan(config, 'sepolia', 'bridge', config.get('bridge_gas_limit', 150000))
     total_value = len(accounts) * amount_wei
-    total_value_eth = bot.w3.from_wei(total_value, 'ether')
+    total_value_eth = Web3.from_wei(total_value, 'ether')
     
     print(f"\n⛽ Bridge Estimation:")
     print(f"  Amount per account: {amount} ETH")
     print(f"  Total ETH needed: {total_value_eth} ETH")
     print(f"  Gas limit: {gas_limit:,}")
+    if expected_gas:
+        print(f"  Measured gas/TX: {expected_gas:,}")
     
     # Execute bridge
     results = bot.bridge_sepolia_to_giwa(
         accounts,
         amount_eth=amount,
         gas_limit=gas_limit,
-        max_workers=config.get('max_workers', 5)
+        max_workers=config.get('max_workers', 5),
+        network='sepolia',
+        simulate=config.get('simulate_before_send', False)
     )
     
     summary = print_summary(results, "Bridge Sepolia→GIWA")
+    record_gas(ledger, bot, 'sepolia', 'bridge', results, gas_limit)
     
     if config.get('save_results', True):
         bot.save_results(results, 'bridge_sepolia_giwa_results.json')
     
     if summary['errors'] == 0:
         print("🎉 All bridge transactions sent successfully!")
-        print("⏳ Wait 1-3 minutes then check GIWA balances")
     else:
         print(f"⚠️ Bridge completed with {summary['errors']} errors")
 
+    if summary['success'] == 0:
+        return
+
+    track = input("\n🔭 Track deposits until they land on GIWA? (Y/n): ").strip().lower()
+    if track == 'n':
+        print("⏳ Wait 1-3 minutes then check GIWA balances")
+        return
+
+    run_all_in = input("🚀 Run Try All In on GIWA per account as soon as funds arrive? (y/N): ").strip().lower() == 'y'
+    track_deposits_handler(bot, config, accounts, results, run_all_in=run_all_in)
+
+def track_deposits_handler(bot, config, accounts, bridge_results, run_all_in=False):
+    """Lacak deposit L1→L2 & (opsional) jalankan aksi GIWA begitu dana tiba"""
+    on_arrival = None
+    arrival_queue = queue.Queue()
+    worker = None
+    all_in_results = []
+
+    if run_all_in:
+        # Aksi GIWA jalan di thread sendiri dengan klien GIWA, paralel dengan polling Sepolia
+        by_address = {acc['address']: acc for acc in accounts}
+        giwa_config = {**config, 'save_results': False}
+
+        def all_in_worker():
+            while True:
+                acc = arrival_queue.get()
+                if acc is None:
+                    break
+                all_in_results.extend(try_all_in(bot, giwa_config, [acc], network='giwa'))
+
+        worker = threading.Thread(target=all_in_worker, daemon=True)
+        worker.start()
+
+        def on_arrival(entry):
+            acc = by_address.get(entry['address'])
+            if acc:
+                arrival_queue.put(acc)
+
+    deposits = bot.track_bridge_deposits(
+        bridge_results,
+        timeout=config.get('deposit_track_timeout', 900),
+        on_arrival=on_arrival,
+    )
+
+    if worker:
+        arrival_queue.put(None)
+        worker.join()
+
+    arrived = [d for d in deposits if d['status'] == 'arrived']
+    print(f"\n📊 Deposit Arrival Summary:")
+    print(f"✅ Arrived: {len(arrived)} / {len(deposits)}")
+    for d in deposits:
+        if d['status'] == 'arrived':
+            print(f"   {d['address']} — {d['latency']}s")
+        else:
+            print(f"   {d['address']} — {d['status']}")
+    if arrived:
+        latencies = sorted(d['latency'] for d in arrived)
+        print(f"⏱️  Latency min/median/max: {latencies[0]}s / {latencies[len(latencies) // 2]}s / {latencies[-1]}s")
+
+    if config.get('save_results', True):
+        bot.save_results(deposits, 'bridge_deposit_tracking.json')
+        if all_in_results:
+            bot.save_results(all_in_results, 'try_all_in_results.json')
+
 def check_bridge_balances_handler(bot, config, accounts):
     """Check balances di Sepolia dan GIWA"""
     print("\n💰 CHECKING BRIDGE BALANCES")
@@ -123,15 +241,23 @@ def deploy_owlto_contract(bot, config, accounts):
     """Fitur #1 — tanpa cek balance/konfirmasi"""
     print("\n🦉 OWLTO SMART CONTRACT DEPLOYMENT")
     print("="*50)
-    # opsional estimasi
-    bot.estimate_total_gas_cost(len(accounts), config['gas_limit'])
+    accounts = skip_indexed(bot, config, accounts, 'giwa', 'owlto')
+    if not accounts:
+        print("✅ Semua akun sudah deploy Owlto — tidak ada transaksi dikirim.")
+        return
+    # opsional estimasi (gas ledger: gas_limit & biaya dari gasUsed terukur)
+    ledger, gas_limit, expected_gas = gas_plan(config, 'giwa', 'owlto', config.get('gas_limit', 2_000_000))
+    bot.estimate_total_gas_cost(len(accounts), gas_limit, network='giwa', expected_gas=expected_gas)
     # eksekusi
     results = bot.deploy_owlto_smart_contract(
         accounts,
-        gas_limit=config.get('gas_limit', 2_000_000),
-        max_workers=config.get('max_workers', 5)
+        gas_limit=gas_limit,
+        max_workers=config.get('max_workers', 5),
+        network='giwa',
+        simulate=config.get('simulate_before_send', False)
     )
     summary = print_summary(results, "Owlto Deployment")
+    record_gas(ledger, bot, 'giwa', 'owlto', results, gas_limit)
     if config.get('save_results', True):
         bot.save_results(results, 'owlto_deployment_results.json')
     if summary['errors'] == 0:
@@ -143,18 +269,26 @@ def deploy_erc20_contract(bot, config, accounts):
     """Fitur #2 — tanpa cek balance/konfirmasi (default tidak tunggu receipt)"""
     print("\n🪙 OWLTO ERC20 TOKEN DEPLOYMENT")
     print("="*50)
+    accounts = skip_indexed(bot, config, accounts, 'giwa', 'erc20')
+    if not accounts:
+        print("✅ Semua akun sudah deploy ERC20 — tidak ada transaksi dikirim.")
+        return
     name, symbol = get_token_details()
     print(f"\n📋 Token Details:\n   Name: {name}\n   Symbol: {symbol}\n   Supply: 100 tokens (18 decimals)")
-    bot.estimate_total_gas_cost(len(accounts), config['gas_limit'])
+    ledger, gas_limit, expected_gas = gas_plan(config, 'giwa', 'erc20', config.get('gas_limit', 2_000_000))
+    bot.estimate_total_gas_cost(len(accounts), gas_limit, network='giwa', expected_gas=expected_gas)
     results = bot.deploy_owlto_erc20_contract(
         accounts,
         name=name,
         symbol=symbol,
-        gas_limit=config.get('gas_limit', 2_000_000),
+        gas_limit=gas_limit,
         max_workers=config.get('max_workers', 5),
+        network='giwa',
+        simulate=config.get('simulate_before_send', False),
         # biarkan default wait_for_receipt=False untuk “sukses di terminal”
     )
     summary = print_summary(results, f"{symbol} ERC20 Deployment")
+    record_gas(ledger, bot, 'giwa', 'erc20', results, gas_limit)
     if config.get('save_results', True):
         bot.save_results(results, f'{symbol}_erc20_deployment_results.json')
     if summary['errors'] == 0:
@@ -166,13 +300,21 @@ def deploy_gmonchain(bot, config, accounts):
     """Fitur #3 — batch GMONChain call (tanpa cek balance/konfirmasi)"""
     print("\n🧩 GMONCHAIN DEPLOYMENT")
     print("="*50)
+    accounts = skip_indexed(bot, config, accounts, 'giwa', 'gmon')
+    if not accounts:
+        print("✅ Semua akun sudah panggil GMONChain — tidak ada transaksi dikirim.")
+        return
     # gunakan default gas di utils, tapi izinkan override dari config
+    ledger, gas_limit, _ = gas_plan(config, 'giwa', 'gmon', config.get('gmon_create_gas', 350_000))
     results = bot.deploy_gmonchain(
         accounts,
-        gas_limit=config.get('gmon_create_gas', 350_000),
-        max_workers=config.get('max_workers', 5)
+        gas_limit=gas_limit,
+        max_workers=config.get('max_workers', 5),
+        network='giwa',
+        simulate=config.get('simulate_before_send', False)
     )
     summary = print_summary(results, "GMONChain Calls")
+    record_gas(ledger, bot, 'giwa', 'gmon', results, gas_limit)
     if config.get('save_results', True):
         bot.save_results(results, 'gmonchain_results.json')
     if summary['errors'] == 0:
@@ -183,27 +325,33 @@ def deploy_gmonchain(bot, config, accounts):
 def mint_omnihub_nft_handler(bot, config, accounts):
     print("\n🖼️  MINT OMNIHUB NFT (skip jika sudah punya)")
     print("=" * 50)
+    accounts = skip_indexed(bot, config, accounts, 'giwa', 'omnihub')
+    ledger, gas_limit, _ = gas_plan(config, 'giwa', 'omnihub', config.get("gas_limit", 2_000_000))
     result = bot.mint_omnihub_nft(
         accounts,
-        gas_limit=config.get("gas_limit", 2_000_000),
+        gas_limit=gas_limit,
         max_workers=config.get("max_workers", 5),
+        network="giwa",
+        simulate=config.get("simulate_before_send", False),
     )
     print("\n📊 Summary:")
     print(f"   Diproses : {result['processed']}")
     print(f"   Diskip   : {result['skipped']}")
     print(f"   TX sent  : {sum(1 for r in result['results'] if r.get('tx_hash'))}")
     print(f"   ❌ Errors : {sum(1 for r in result['results'] if r.get('error'))}")
+    record_gas(ledger, bot, 'giwa', 'omnihub', result['results'], gas_limit)
 
 
 
 # --- Tambahkan helper ini di bawah import dan di atas fungsi-fungsi deploy ---
-def send_tx_with_nonce(bot, private_key, from_addr, nonce, *,
+def send_tx_with_nonce(bot, private_key, from_addr, nonce=None, *,
                       to=None, data="0x", value_wei=0, gas_limit=300_000,
-                      wait_receipt=False, timeout=120):
+                      wait_receipt=False, timeout=120, network=None):
     """
-    Kirim 1 transaksi dengan nonce manual - kompatibel semua versi web3.py.
+    Kirim 1 transaksi lewat RetryPolicy bot (`_sign_and_send`) - kompatibel semua versi web3.py.
+    `nonce` None → dialokasikan NonceManager paling akhir; nonce manual tetap bisa dipaksa.
     """
-    w3 = bot.w3
+    client = bot.client(network)
     
     # Normalisasi data
     d = data or "0x"
@@ -212,20 +360,25 @@ def send_tx_with_nonce(bot, private_key, from_addr, nonce, *,
     
     tx = {
         "from": from_addr,
-        "nonce": int(nonce),
-        "gasPrice": w3.eth.gas_price,
+        "gasPrice": bot.retry_policy.call(client.fees.gas_price),
         "gas": int(gas_limit),
         "to": None if to is None else Web3.to_checksum_address(to),
         "value": int(value_wei),
         "data": d,
-        "chainId": w3.eth.chain_id,
+        "chainId": client.chain_id,
     }
+    if nonce is None:
+        bot._with_nonce(tx, client)
+    else:
+        tx["nonce"] = int(nonce)
     
-    signed = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = bot.send_raw_transaction_universal(signed)
+    tx_hash = bot._sign_and_send(tx, private_key, client)
+    if nonce is not None:
+        # Nonce manual melewati NonceManager → buang state lokalnya supaya batch berikutnya sinkron
+        client.nonces.resync(from_addr)
     
     if wait_receipt:
-        rcpt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        rcpt = bot.wait_for_receipt(client.name, tx_hash, timeout=timeout)
         if rcpt.status != 1:
             return {
                 "status": "failed",
@@ -240,16 +393,23 @@ def send_tx_with_nonce(bot, private_key, from_addr, nonce, *,
             "contract_address": rcpt.contractAddress,
         }
     
-    return {"status": "sent", "tx_hash": tx_hash.hex()}
+    result = {"status": "sent", "tx_hash": tx_hash.hex()}
+    if to is None:
+        result["contract_address"] = bot.compute_create_address(from_addr, tx["nonce"])
+    return result
 
 
-def try_all_in(bot, config, accounts):
+def try_all_in(bot, config, accounts, network='giwa'):
     """
     Fitur gabungan 1→2→3 PER AKUN dengan NONCE MANUAL:
-      1) Deploy Owlto SC — WAIT receipt
+      1) Deploy Owlto SC — NON-WAIT (alamat kontrak dihitung lokal)
       2) Deploy ERC20 Owlto — NON-WAIT
       3) GMONChain call — NON-WAIT
+    Receipt Owlto SC semua akun dikonfirmasi sekaligus (batch) di akhir.
     """
+    if config.get('all_in_bundle', False):
+        return try_all_in_bundled(bot, config, accounts, network)
+
     print("\n🚀 TRY ALL IN (1→2→3 per akun)")
     print("="*50)
 
@@ -257,13 +417,14 @@ def try_all_in(bot, config, accounts):
     name   = config.get('erc20_name', 'cuandrop')
     symbol = config.get('erc20_symbol', 'cndrp')
 
-    # gas defaults
-    gas_sc    = config.get('gas_limit', 2_000_000)
-    gas_erc20 = config.get('gas_limit', 2_000_000)
-    gas_gmon  = config.get('gmon_create_gas', 350_000)
+    # gas defaults (gas ledger menurunkan ke gasUsed terukur × headroom kalau sampel cukup)
+    ledger, gas_sc, _ = gas_plan(config, network, 'owlto', config.get('gas_limit', 2_000_000))
+    _, gas_erc20, _   = gas_plan(config, network, 'erc20', config.get('gas_limit', 2_000_000))
+    _, gas_gmon, _    = gas_plan(config, network, 'gmon', config.get('gmon_create_gas', 350_000))
 
     # gmon params dari utils (alamat factory, selector, dan value)
     factory_addr, gmon_selector, gmon_value = bot.get_gmonchain_call_params()
+    bot.await_fee_window(network)
 
     all_results = []
     for i, acc in enumerate(accounts, 1):
@@ -271,23 +432,15 @@ def try_all_in(bot, config, accounts):
         pk   = acc['private_key']
         print(f"\n─── 🔹 Account {i}/{len(accounts)}: {addr} ───")
 
-        # Ambil nonce awal berbasis 'pending' agar mencakup TX yang belum mined
-        try:
-            nonce = bot.w3.eth.get_transaction_count(addr, 'pending')
-        except Exception:
-            # fallback ke latest jika node tidak dukung 'pending'
-            nonce = bot.w3.eth.get_transaction_count(addr)
-
-        # (1) Deploy Owlto SC — WAIT
+        # (1) Deploy Owlto SC — NON-WAIT, receipt dicek batch di akhir
         try:
             hex_sc = bot.get_owlto_hex_data()
             r1 = send_tx_with_nonce(
-                bot, pk, addr, nonce,
+                bot, pk, addr,
                 to=None, data=hex_sc, value_wei=0, gas_limit=gas_sc,
-                wait_receipt=True
+                wait_receipt=False, network=network
             )
-            print(f"  [1/3] ✅ Owlto SC → tx: {r1['tx_hash'][:10]}…")
-            nonce += 1
+            print(f"  [1/3] ✅ Owlto SC → {r1['contract_address']} tx: {r1['tx_hash'][:10]}…")
         except Exception as e:
             r1 = {"status": "error", "error": str(e)}
             print(f"  [1/3] ❌ Owlto SC error: {e}")
@@ -296,12 +449,11 @@ def try_all_in(bot, config, accounts):
         try:
             hex_erc20 = bot.get_owlto_erc20_hex_data(name, symbol)
             r2 = send_tx_with_nonce(
-                bot, pk, addr, nonce,
+                bot, pk, addr,
                 to=None, data=hex_erc20, value_wei=0, gas_limit=gas_erc20,
-                wait_receipt=False
+                wait_receipt=False, network=network
             )
             print(f"  [2/3] ✅ ERC20 sent → tx: {r2['tx_hash'][:10]}…")
-            nonce += 1
         except Exception as e:
             r2 = {"status": "error", "error": str(e)}
             print(f"  [2/3] ❌ ERC20 error: {e}")
@@ -309,12 +461,11 @@ def try_all_in(bot, config, accounts):
         # (3) GMONChain call — NON-WAIT
         try:
             r3 = send_tx_with_nonce(
-                bot, pk, addr, nonce,
+                bot, pk, addr,
                 to=factory_addr, data=gmon_selector, value_wei=gmon_value,
-                gas_limit=gas_gmon, wait_receipt=False
+                gas_limit=gas_gmon, wait_receipt=False, network=network
             )
             print(f"  [3/3] ✅ GMONChain sent → tx: {r3['tx_hash'][:10]}…")
-            nonce += 1
         except Exception as e:
             r3 = {"status": "error", "error": str(e)}
             print(f"  [3/3] ❌ GMONChain error: {e}")
@@ -331,13 +482,205 @@ def try_all_in(bot, config, accounts):
         # jeda kecil biar RPC gak spike
         time.sleep(0.3)
 
+    # Konfirmasi receipt Owlto SC semua akun dalam satu batch polling
+    owlto_hashes = [r["owlto_sc"]["tx_hash"] for r in all_results if r["owlto_sc"].get("status") == "sent"]
+    if owlto_hashes:
+        print(f"\n⏳ Confirming {len(owlto_hashes)} Owlto SC deployments...")
+        receipts = bot.wait_for_receipts(network, owlto_hashes, timeout=120)
+        for r in all_results:
+            r1 = r["owlto_sc"]
+            if r1.get("status") != "sent":
+                continue
+            rcpt = receipts.get(bot._normalize_hash(r1["tx_hash"]))
+            if rcpt is None:
+                continue  # tetap 'sent' (belum mined dalam timeout)
+            r1["gas_used"] = int(rcpt.get("gasUsed", "0x0"), 16)
+            r1["status"] = "success" if int(rcpt.get("status", "0x0"), 16) == 1 else "failed"
+            if r1["status"] == "failed":
+                r["status"] = "partial"
+                print(f"  ❌ Owlto SC failed: {r['address']} (gas used {r1['gas_used']})")
+
     ok = sum(1 for r in all_results if r["status"] == "success")
     er = len(all_results) - ok
     print(f"\n📊 All-In Summary → Success: {ok} / Errors: {er} / Total: {len(all_results)}")
+    record_gas(ledger, bot, network, 'all_in', all_results, {'owlto': gas_sc, 'erc20': gas_erc20, 'gmon': gas_gmon})
 
     if config.get('save_results', True):
         bot.save_results(all_results, 'try_all_in_results.json')
 
+    return all_results
+
+def run_workflow_handler(bot, config, accounts):
+    """Jalankan workflow DAG dari file (default workflow.json)"""
+    print("\n🧭 RUN WORKFLOW")
+    print("=" * 50)
+
+    filename = config.get('workflow_file', 'workflow.json')
+    try:
+        workflow = load_workflow(filename)
+    except FileNotFoundError:
+        print(f"❌ Workflow file {filename} tidak ditemukan!")
+        return
+    except ValueError as e:
+        print(f"❌ Workflow tidak valid: {e}")
+        return
+
+    for step in workflow['steps']:
+        needs = ", ".join(
+            d if isinstance(d, str) else " ".join(f"{k}={v}" for k, v in d.items())
+            for d in step.get('needs', [])
+        ) or "-"
+        print(f"  • {step['id']:<10} {step['action']:<8} @ {step.get('network', 'giwa'):<8} needs: {needs}")
+
+    engine = WorkflowEngine(bot, workflow, config)
+    results = engine.run(accounts)
+
+    ok = sum(1 for r in results if r['status'] == 'success')
+    print(f"\n📊 Workflow Summary → Success: {ok} / Partial: {len(results) - ok} / Total: {len(results)}")
+
+    if config.get('save_results', True):
+        bot.save_results(results, 'workflow_results.json')
+
+def disperse_sweep_handler(bot, config, accounts):
+    """Top-up banyak akun via kontrak disperse, atau sapu sisa balance ke treasury"""
+    print("\n💸 DISPERSE / SWEEP FUNDS")
+    print("=" * 50)
+
+    network = input("Network [sepolia/giwa] (default: sepolia): ").strip().lower() or 'sepolia'
+    if network not in ('sepolia', 'giwa'):
+        print("❌ Invalid network!")
+        return
+    mode = input("Mode [d]isperse / [s]weep (default: d): ").strip().lower() or 'd'
+
+    # Treasury = akun di akun.txt (line `treasury_line`), kecuali treasury_address di-set untuk sweep
+    treasury_line = config.get('treasury_line', 1)
+    funder = next((acc for acc in accounts if acc['line_number'] == treasury_line), None)
+    if funder is None:
+        print(f"❌ Treasury line {treasury_line} tidak ada di {config['akun_file']}")
+        return
+
+    balances = bot.check_bridge_balances(accounts)
+    others = [b for b in balances if b['address'] != funder['address']]
+
+    if mode == 'd':
+        min_eth = input(f"Top-up accounts below ETH (default: {config.get('disperse_min_eth', '0.002')}): ").strip() \
+            or config.get('disperse_min_eth', '0.002')
+        target_eth = input(f"Top-up to ETH (default: {config.get('disperse_target_eth', '0.005')}): ").strip() \
+            or config.get('disperse_target_eth', '0.005')
+        transfers = bot.plan_disperse(others, network, min_eth, target_eth)
+        total = sum(amount for _, amount in transfers)
+        print(f"\n📋 {len(transfers)} accounts need funds — total {Web3.from_wei(total, 'ether')} ETH "
+              f"from {funder['address']}")
+        results = bot.disperse_funds(
+            funder, transfers, network=network, chunk_size=config.get('disperse_chunk_size', 100)
+        )
+        summary = print_summary(results, "Disperse")
+        if config.get('save_results', True):
+            bot.save_results(results, f'disperse_{network}_results.json')
+    elif mode == 's':
+        threshold = input(f"Sweep accounts above ETH (default: {config.get('sweep_threshold_eth', '0.01')}): ").strip() \
+            or config.get('sweep_threshold_eth', '0.01')
+        keep = input(f"Keep ETH per account (default: {config.get('sweep_keep_eth', '0.001')}): ").strip() \
+            or config.get('sweep_keep_eth', '0.001')
+        treasury = config.get('treasury_address') or funder['address']
+        transfers = bot.plan_sweep(others, network, threshold, keep)
+        total = sum(amount for _, amount in transfers)
+        print(f"\n📋 {len(transfers)} accounts to sweep — total {Web3.from_wei(total, 'ether')} ETH → {treasury}")
+        results = bot.sweep_funds(
+            accounts, transfers, treasury, network=network, max_workers=config.get('max_workers', 5),
+            simulate=config.get('simulate_before_send', False)
+        )
+        summary = print_summary(results, "Sweep")
+        if config.get('save_results', True):
+            bot.save_results(results, f'sweep_{network}_results.json')
+    else:
+        print("❌ Invalid mode!")
+        return
+
+    if summary['errors'] == 0:
+        print("🎉 Done without errors!")
+    else:
+        print(f"⚠️  Done with {summary['errors']} errors")
+
+def try_all_in_bundled(bot, config, accounts, network='giwa'):
+    """
+    Try All In versi bundler (config `all_in_bundle`): Owlto + ERC20 + GMON per akun
+    dalam satu TX atomic ke kontrak bundler (deploy sekali per chain oleh akun pertama).
+    """
+    print("\n📦 TRY ALL IN (bundled, 1 TX per akun)")
+    print("="*50)
+
+    accounts = list(accounts)
+    if not accounts:
+        return []
+    # Satu fee window untuk deploy bundler + batch (batch di dalamnya tidak menunggu lagi)
+    with bot.fee_window(network):
+        try:
+            bundler = bot.ensure_bundler_contract(accounts[0], network)
+        except Exception as e:
+            print(f"❌ Bundler contract tidak tersedia: {e}")
+            return []
+
+        # Tanpa bundle_gas_limit: gasUsed terukur (gas ledger), kalau belum ada → estimate_gas
+        ledger, gas_limit, _ = gas_plan(config, network, 'all_in_bundle', config.get('bundle_gas_limit') or 4_000_000)
+        if not config.get('bundle_gas_limit') and (ledger is None or not ledger.stats(network, 'all_in_bundle')):
+            gas_limit = None
+        results = bot.bundle_all_in(
+            accounts, bundler,
+            name=config.get('erc20_name', 'cuandrop'),
+            symbol=config.get('erc20_symbol', 'cndrp'),
+            gas_limit=gas_limit,
+            max_workers=config.get('max_workers', 5),
+            network=network,
+        )
+    for r in results:
+        if r['status'] == 'success':
+            print(f"✅ {r['address']} → Owlto {r['owlto_sc']['contract_address']} / "
+                  f"ERC20 {r['erc20']['contract_address']}")
+        elif r['status'] != 'sent':
+            print(f"❌ {r.get('address', '?')}: {r.get('error')}")
+
+    ok = sum(1 for r in results if r["status"] == "success")
+    print(f"\n📊 All-In Summary → Success: {ok} / Errors: {len(results) - ok} / Total: {len(results)}")
+    record_gas(ledger, bot, network, 'all_in_bundle', results, gas_limit)
+
+    if config.get('save_results', True):
+        bot.save_results(results, 'try_all_in_results.json')
+    return results
+
+def nonce_gap_handler(bot, config, accounts):
+    """Deteksi nonce gap / TX nyangkut semua akun, lalu perbaiki dengan self-transfer"""
+    print("\n🩹 NONCE GAP REPAIR")
+    print("=" * 50)
+
+    network = input("Network [sepolia/giwa] (default: giwa): ").strip().lower() or 'giwa'
+    if network not in ('sepolia', 'giwa'):
+        print("❌ Invalid network!")
+        return
+
+    gaps = bot.scan_nonce_gaps(accounts, network)
+    if not gaps:
+        print(f"✅ Tidak ada nonce gap di {network} ({len(accounts)} akun)")
+        return
+
+    for g in gaps:
+        print(f"🔹 Line {g['line_number']}: {g['address']} latest={g['latest']} pending={g['pending']} "
+              f"stuck={len(g['stuck'])} holes={len(g['holes'])}")
+    stuck = sum(len(g['stuck']) for g in gaps)
+    holes = sum(len(g['holes']) for g in gaps)
+    print(f"\n📋 {len(gaps)} akun bermasalah — {stuck} TX nyangkut, {holes} nonce bolong")
+
+    if input("Replace/fill with 0 ETH self-transfers? (y/N): ").strip().lower() != 'y':
+        return
+
+    results = bot.repair_nonce_gaps(accounts, gaps, network, max_workers=config.get('max_workers', 5))
+    summary = print_summary([f for r in results for f in r.get('filled', [])] +
+                            [r for r in results if 'error' in r], "Nonce Repair")
+    if config.get('save_results', True):
+        bot.save_results(results, f'nonce_repair_{network}_results.json')
+    if summary['errors'] == 0:
+        print("🎉 Semua gap diperbaiki!")
+
 def main():
     """Main runner function"""
     try:
@@ -351,15 +694,19 @@ def main():
 
         # Init bot with both RPCs
         print("🤖 Initializing multi-account bot...")
-        bot = MultiAccountFromPK(config['rpc_url'], config.get('giwa_rpc_url'))
+        bot = MultiAccountFromPK(
+            config['rpc_url'], config.get('giwa_rpc_url'), RetryPolicy.from_config(config.get('retry')),
+            config.get('concurrency'), config.get('fee_schedule'), config.get('websocket')
+        )
 
         # Cek initial network connection (Sepolia)
-        if not bot.get_network_info():
+        if not bot.get_network_info('sepolia'):
             print("❌ Failed to connect to initial network (Sepolia)!")
             return
 
         # Load akun
-        accounts = bot.load_private_keys(config['akun_file'])
+        # akun.txt, atau keystore V3 yang di-unlock paralel di background
+        accounts = load_accounts(bot, config)
         if not accounts:
             print("❌ No valid accounts found!")
             return
@@ -371,7 +718,8 @@ def main():
             show_menu()
             choice = get_user_choice()
 
-            # Network switching logic
+            # Network check: setiap aksi memakai klien network-nya sendiri,
+            # set_network hanya memverifikasi koneksi & mengganti default
             is_giwa_action = choice in ['1', '2', '3', '4', '6']
             is_sepolia_action = choice == '5'
             network_ok = True
@@ -400,15 +748,22 @@ def main():
             elif choice == '5':
                 bridge_sepolia_to_giwa_handler(bot, config, accounts)
             elif choice == '6':
-                try_all_in(bot, config, accounts)
+                try_all_in(bot, config, accounts, network='giwa')
             elif choice == '7':
                 # This function handles both networks internally
                 check_bridge_balances_handler(bot, config, accounts)
+            elif choice == '8':
+                # Workflow engine punya klien per network sendiri
+                run_workflow_handler(bot, config, accounts)
+            elif choice == '9':
+                disperse_sweep_handler(bot, config, accounts)
+            elif choice == '10':
+                nonce_gap_handler(bot, config, accounts)
             elif choice == '0':
                 print("👋 Goodbye!")
                 break
             else:
-                print("❌ Invalid choice! Please select 0–7")
+                print("❌ Invalid choice! Please select 0–10")
 
             if choice != '0':
                 input("\nPress Enter to continue...")
@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+"""
+Mock JSON-RPC server dengan fault injection, pengganti RPC asli untuk uji beban
+& ketahanan tanpa jaringan.
+
+Method yang dilayani: eth_chainId, eth_gasPrice, eth_maxPriorityFeePerGas,
+eth_blockNumber, eth_getBlockByNumber, eth_getTransactionCount (latest/pending),
+eth_sendRawTransaction, eth_getTransactionReceipt, eth_getTransactionByHash,
+eth_getBalance, eth_getCode, eth_call, eth_estimateGas, eth_getLogs, net_version
++ mock_stats. Batch request didukung.
+
+Eksekusi kontrak disederhanakan, cukup untuk alur bot:
+  - contract creation menyimpan runtime code yang di-return init code (pola solc
+    PUSH len, DUP1, PUSH off, PUSH1 0, CODECOPY, PUSH1 0, RETURN), jadi verify.py bisa dipakai
+  - depositTransaction(...) → log TransactionDeposited; dengan `deposit_target`
+    (MockChain L2) deposit TX-nya ikut mined di L2 dengan hash sesuai spec OP Stack
+  - call ke kontrak bundler (runtime berisi topic Bundled) → CREATE Owlto + ERC20 + log Bundled
+  - call dengan selector mint (`mint_selectors`) → log Transfer(0x0 → pengirim)
+
+Model mempool per pengirim seperti node asli: nonce lebih kecil dari chain →
+"nonce too low", nonce sama di mempool butuh gas price +10% ("replacement
+transaction underpriced"), nonce loncat masuk antrean sampai gap terisi.
+TX yang di-drop mendapat hash tapi tidak pernah mined (nonce gap nyata).
+
+Fault (semua opsional, deterministik dengan --seed):
+    --latency lognormal:0.05,0.5   distribusi latency per HTTP request
+                                   (fixed:s | uniform:a,b | normal:mu,sigma | lognormal:median,sigma | exp:mean)
+    --rate-limit 500               request/detik (token bucket), lebih → HTTP 429
+    --p429 0.01 --p5xx 0.01        peluang HTTP 429 / 503 acak
+    --drop 0.01                    peluang TX diterima tapi di-drop
+    --nonce-error 0.01             peluang TX ditolak "nonce too low"
+    --block-time 1                 interval blok (0 = mined langsung)
+    --fee-volatility 0.1           random walk gas price per blok
+
+Sign/recover ECDSA pure-python ±10 ms per TX; install `coincurve` (dipakai
+otomatis oleh eth_keys) untuk ribuan TX/detik.
+
+Pemakaian:
+    python mockrpc.py --port 8545 --chain-id 11155111 &
+    python mockrpc.py --port 8546 --chain-id 91342 --latency lognormal:0.05,0.6 --p429 0.02 --drop 0.01 &
+    # config.json: rpc_url=http://127.0.0.1:8545, giwa_rpc_url=http://127.0.0.1:8546
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import rlp
+from eth_account import Account
+from eth_utils import keccak
+from web3 import Web3
+
+DEFAULT_BALANCE = 100 * 10 ** 18
+
+TRANSFER_TOPIC = '0x' + keccak(b'Transfer(address,address,uint256)').hex()
+TRANSACTION_DEPOSITED_TOPIC = '0x' + keccak(b'TransactionDeposited(address,address,uint256,bytes)').hex()
+BUNDLED_TOPIC = '0x' + keccak(b'Bundled(address,address,address)').hex()
+DEPOSIT_SELECTOR = bytes.fromhex('e9e05c42')  # depositTransaction(address,uint256,uint64,bool,bytes)
+# Omnihub mint & mint(uint256)
+MINT_SELECTORS = (bytes.fromhex('a25ffea8'), bytes.fromhex('a0712d68'))
+
+
+class RpcError(Exception):
+    def __init__(self, message, code=-32000):
+        super().__init__(message)
+        self.code = code
+
+
+class HttpFault(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_latency(spec):
+    """'lognormal:0.05,0.5' → fungsi sampler (detik). None/'' → tanpa latency."""
+    if not spec:
+        return None
+    kind, _, args = spec.partition(':')
+    params = [float(x) for x in args.split(',') if x]
+    samplers = {
+        'fixed': lambda rng: params[0],
+        'uniform': lambda rng: rng.uniform(params[0], params[1]),
+        'normal': lambda rng: max(0.0, rng.gauss(params[0], params[1])),
+        'lognormal': lambda rng: params[0] * rng.lognormvariate(0, params[1]),
+        'exp': lambda rng: rng.expovariate(1 / params[0]),
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown latency distribution: {kind}")
+    return samplers[kind]
+
+
+def decode_raw_transaction(raw):
+    """Field penting dari raw TX legacy / EIP-2930 / EIP-1559."""
+    if raw[0] >= 0xc0:
+        nonce, gas_price, gas, to, value, data = rlp.decode(raw)[:6]
+        max_fee = gas_price
+    elif raw[0] == 1:
+        _, nonce, gas_price, gas, to, value, data = rlp.decode(raw[1:])[:7]
+        max_fee = gas_price
+    elif raw[0] == 2:
+        _, nonce, _, max_fee, gas, to, value, data = rlp.decode(raw[1:])[:8]
+    else:
+        raise RpcError(f"unsupported transaction type {raw[0]}")
+    as_int = lambda b: int.from_bytes(b, 'big')
+    return {
+        'nonce': as_int(nonce),
+        'gas_price': as_int(max_fee),
+        'gas': as_int(gas),
+        'to': Web3.to_checksum_address(to) if to else None,
+        'value': as_int(value),
+        'data': bytes(data),
+    }
+
+
+def runtime_from_init_code(init):
+    """
+    Runtime code yang di-return init code (pola solc / hand-assembled:
+    PUSH len, DUP1, PUSH off, PUSH1 0, CODECOPY, PUSH1 0, RETURN). Tidak ketemu → init code apa adanya.
+    """
+    ops = []
+    i = 0
+    while i < len(init):
+        op = init[i]
+        size = op - 0x5f if 0x60 <= op <= 0x7f else 0
+        ops.append((op, int.from_bytes(init[i + 1:i + 1 + size], 'big') if size else None))
+        i += 1 + size
+        if len(ops) >= 7:
+            (p1, length), (dup, _), (p2, offset), (p3, zero1), (copy, _), (p4, zero2), (ret, _) = ops[-7:]
+            is_push = lambda op: 0x60 <= op <= 0x7f
+            if (is_push(p1) and dup == 0x80 and is_push(p2) and is_push(p3) and zero1 == 0 and copy == 0x39
+                    and is_push(p4) and zero2 == 0 and ret == 0xf3 and offset + length <= len(init)):
+                return init[offset:offset + length]
+    return init
+
+
+def create_address(sender, nonce):
+    return Web3.to_checksum_address(keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:])
+
+
+def _word(address):
+    return '0x' + address[2:].lower().rjust(64, '0')
+
+
+def deposit_tx_hash(block_hash, log_index, from_addr, to_addr, mint, value, gas_limit, is_creation, payload):
+    """Hash deposit TX L2 (type 0x7E) dari log TransactionDeposited, sesuai spec OP Stack."""
+    source_hash = keccak(b'\x00' * 32 + keccak(bytes.fromhex(block_hash[2:]) + log_index.to_bytes(32, 'big')))
+    encoded = rlp.encode([
+        source_hash, bytes.fromhex(from_addr[2:]), b'' if is_creation else bytes.fromhex(to_addr[2:]),
+        mint, value, gas_limit, 0, payload,
+    ])
+    return '0x' + keccak(b'\x7e' + encoded).hex()
+
+
+class MockChain:
+    """State chain in-memory + mempool per pengirim + fault injection."""
+
+    def __init__(self, chain_id=91342, gas_price=10 ** 9, block_time=0.0, seed=None, latency=None,
+                 rate_limit=None, p429=0.0, p5xx=0.0, drop=0.0, nonce_error=0.0, fee_volatility=0.0,
+                 default_balance=DEFAULT_BALANCE, call_result="0x" + "00" * 32, deposit_target=None,
+                 mint_selectors=MINT_SELECTORS):
+        self.chain_id = chain_id
+        self.gas_price = gas_price
+        self.block_time = block_time
+        self.rng = random.Random(seed)
+        self.latency = parse_latency(latency) if isinstance(latency, str) else latency
+        self.rate_limit = rate_limit
+        self.p429, self.p5xx, self.drop, self.nonce_error = p429, p5xx, drop, nonce_error
+        self.fee_volatility = fee_volatility
+        self.default_balance = default_balance
+        self.call_result = call_result
+        self.deposit_target = deposit_target  # MockChain L2 tujuan deposit (opsional)
+        self.mint_selectors = tuple(mint_selectors)
+
+        self.lock = threading.Lock()
+        self.block = 0
+        self.blocks = {0: {'hash': '0x' + keccak(b'genesis').hex(), 'timestamp': int(time.time()), 'txs': []}}
+        self.nonces = {}       # address -> nonce mined
+        self.mempool = {}      # address -> {nonce: tx}
+        self.balances = {}
+        self.codes = {}
+        self.txs = {}          # hash -> tx
+        self.receipts = {}     # hash -> receipt
+        self.deposits = []     # deposit TX dari L1 yang menunggu blok berikutnya
+        self.token_ids = {}    # kontrak -> token id mint terakhir
+        self.stats = {'requests': 0, 'calls': 0, 'sent': 0, 'mined': 0, 'dropped': 0, 'http_429': 0,
+                      'http_5xx': 0, 'nonce_errors': 0, 'replaced': 0, 'logs': 0, 'deposits': 0}
+
+        self._tokens = float(rate_limit or 0)
+        self._refilled_at = time.time()
+
+        if block_time:
+            threading.Thread(target=self._block_loop, daemon=True).start()
+
+    # -----------
+    # Faults
+    # -----------
+
+    def before_request(self, call_count):
+        """Latency + rate limit + HTTP fault untuk satu HTTP request."""
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['calls'] += call_count
+            if self.rate_limit:
+                now = time.time()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+                self._refilled_at = now
+                if self._tokens < call_count:
+                    self.stats['http_429'] += 1
+                    raise HttpFault(429, "Too Many Requests")
+                self._tokens -= call_count
+            roll = self.rng.random()
+            delay = self.latency(self.rng) if self.latency else 0
+        if delay:
+            time.sleep(delay)
+        if roll < self.p429:
+            with self.lock:
+                self.stats['http_429'] += 1
+            raise HttpFault(429, "Too Many Requests")
+        if roll < self.p429 + self.p5xx:
+            with self.lock:
+                self.stats['http_5xx'] += 1
+            raise HttpFault(503, "Service Unavailable")
+
+    # -----------
+    # Chain
+    # -----------
+
+    def _balance(self, address):
+        return self.balances.get(address, self.default_balance)
+
+    def _pending_nonce(self, address):
+        nonce = self.nonces.get(address, 0)
+        queued = self.mempool.get(address, {})
+        while nonce in queued:
+            nonce += 1
+        return nonce
+
+    def _block_loop(self):
+        while True:
+            time.sleep(self.block_time)
+            with self.lock:
+                self._mine()
+
+    def _mine(self):
+        """Masukkan semua TX yang nonce-nya berurutan ke satu blok baru."""
+        self.block += 1
+        if self.fee_volatility:
+            self.gas_price = max(1, int(self.gas_price * (1 + self.rng.uniform(-1, 1) * self.fee_volatility)))
+        block_hash = '0x' + keccak(self.block.to_bytes(8, 'big') + self.chain_id.to_bytes(8, 'big')).hex()
+        included, logs = [], []
+        for tx in self.deposits:
+            included.append(self._execute_deposit(tx, block_hash, len(included)))
+        self.deposits = []
+        for sender, queued in self.mempool.items():
+            nonce = self.nonces.get(sender, 0)
+            while nonce in queued:
+                tx = queued.pop(nonce)
+                included.append(self._execute(tx, block_hash, len(included), logs))
+                nonce += 1
+            self.nonces[sender] = nonce
+        self.blocks[self.block] = {'hash': block_hash, 'timestamp': int(time.time()), 'txs': included, 'logs': logs}
+        self.stats['mined'] += len(included)
+        self.stats['logs'] += len(logs)
+
+    def _create(self, creator, nonce, init):
+        contract = create_address(creator, nonce)
+        self.codes[contract] = '0x' + runtime_from_init_code(init).hex()
+        self.nonces[contract] = 1  # EIP-161: nonce kontrak mulai dari 1
+        return contract
+
+    def _execute(self, tx, block_hash, index, block_logs):
+        gas_used = min(tx['gas'], 21_000 + 16 * len(tx['data']) + (32_000 if tx['to'] is None else 0))
+        price = min(tx['gas_price'], max(self.gas_price, 1))
+        sender = tx['from']
+        self.balances[sender] = self._balance(sender) - tx['value'] - gas_used * price
+        tx['blockNumber'] = self.block
+        tx['blockHash'] = block_hash
+        tx['index'] = index
+        contract, logs = None, []
+
+        def log(address, topics, data=b''):
+            entry = {
+                'address': address.lower(), 'topics': topics, 'data': '0x' + data.hex(),
+                'blockNumber': hex(self.block), 'blockHash': block_hash, 'transactionHash': tx['hash'],
+                'transactionIndex': hex(index), 'logIndex': hex(len(block_logs)), 'removed': False,
+            }
+            block_logs.append(entry)
+            logs.append(entry)
+            return len(block_logs) - 1
+
+        data, to = tx['data'], tx['to']
+        if to is None:
+            contract = self._create(sender, tx['nonce'], data)
+        elif data[:4] == DEPOSIT_SELECTOR and len(data) >= 4 + 6 * 32:
+            self.balances[to] = self._balance(to) + tx['value']
+            self._deposit(tx, data, block_hash, log)
+        elif BUNDLED_TOPIC[2:] in self.codes.get(to, ''):
+            self._bundle(tx, data, log)
+        else:
+            self.balances[to] = self._balance(to) + tx['value']
+            if data[:4] in self.mint_selectors:
+                token_id = self.token_ids.get(to, 0) + 1
+                self.token_ids[to] = token_id
+                log(to, [TRANSFER_TOPIC, _word('0x' + '00' * 20), _word(sender), '0x%064x' % token_id])
+
+        self.receipts[tx['hash']] = {
+            'transactionHash': tx['hash'],
+            'transactionIndex': hex(index),
+            'blockHash': block_hash,
+            'blockNumber': hex(self.block),
+            'from': sender.lower(),
+            'to': to.lower() if to else None,
+            'contractAddress': contract,
+            'cumulativeGasUsed': hex(gas_used),
+            'gasUsed': hex(gas_used),
+            'effectiveGasPrice': hex(price),
+            'status': '0x1',
+            'logs': logs,
+            'logsBloom': '0x' + '00' * 256,
+            'type': '0x0',
+        }
+        return tx['hash']
+
+    def _deposit(self, tx, data, block_hash, log):
+        """OptimismPortal.depositTransaction: log TransactionDeposited (+ relay ke `deposit_target`)."""
+        word = lambda i: data[4 + 32 * i:4 + 32 * (i + 1)]
+        recipient = Web3.to_checksum_address(word(0)[12:])
+        value = int.from_bytes(word(1), 'big')
+        gas_limit = int.from_bytes(word(2), 'big')
+        is_creation = int.from_bytes(word(3), 'big') != 0
+        offset = 4 + int.from_bytes(word(4), 'big')
+        length = int.from_bytes(data[offset:offset + 32], 'big')
+        payload = data[offset + 32:offset + 32 + length]
+
+        opaque = (tx['value'].to_bytes(32, 'big') + value.to_bytes(32, 'big') + gas_limit.to_bytes(8, 'big')
+                  + bytes([is_creation]) + payload)
+        padded = opaque + b'\x00' * (-len(opaque) % 32)
+        log_index = log(tx['to'], [TRANSACTION_DEPOSITED_TOPIC, _word(tx['from']), _word(recipient), '0x' + '00' * 32],
+                        (32).to_bytes(32, 'big') + len(opaque).to_bytes(32, 'big') + padded)
+        self.stats['deposits'] += 1
+        if self.deposit_target is not None:
+            l2_hash = deposit_tx_hash(block_hash, log_index, tx['from'], recipient, tx['value'], value,
+                                      gas_limit, is_creation, payload)
+            self.deposit_target.relay_deposit({
+                'hash': l2_hash, 'from': tx['from'], 'to': recipient, 'mint': tx['value'], 'value': value,
+                'gas': gas_limit, 'data': payload,
+            })
+
+    def _bundle(self, tx, data, log):
+        """Kontrak bundler all-in: CREATE Owlto, CREATE ERC20, CALL target, log Bundled."""
+        bundler = tx['to']
+        len1, len2, target, len3 = (int.from_bytes(data[32 * i:32 * (i + 1)], 'big') for i in range(4))
+        owlto_init = data[128:128 + len1]
+        erc20_init = data[128 + len1:128 + len1 + len2]
+        nonce = self.nonces.get(bundler, 1)
+        owlto = self._create(bundler, nonce, owlto_init)
+        erc20 = self._create(bundler, nonce + 1, erc20_init)
+        self.nonces[bundler] = nonce + 2
+        target = Web3.to_checksum_address(target.to_bytes(20, 'big'))
+        self.balances[target] = self._balance(target) + tx['value']
+        log(bundler, [BUNDLED_TOPIC, _word(tx['from'])],
+            bytes.fromhex(_word(owlto)[2:] + _word(erc20)[2:]))
+
+    def relay_deposit(self, deposit):
+        """Deposit TX dari L1 (lihat `_deposit`), mined di blok L2 berikutnya."""
+        with self.lock:
+            self.deposits.append(deposit)
+            if not self.block_time:
+                self._mine()
+
+    def _execute_deposit(self, deposit, block_hash, index):
+        self.balances[deposit['to']] = self._balance(deposit['to']) + deposit['mint']
+        tx = {
+            **deposit, 'nonce': 0, 'gas_price': 0, 'value': deposit['value'],
+            'blockNumber': self.block, 'blockHash': block_hash, 'index': index,
+        }
+        self.txs[tx['hash']] = tx
+        self.receipts[tx['hash']] = {
+            'transactionHash': tx['hash'], 'transactionIndex': hex(index), 'blockHash': block_hash,
+            'blockNumber': hex(self.block), 'from': tx['from'].lower(), 'to': tx['to'].lower(),
+            'contractAddress': None, 'cumulativeGasUsed': hex(0), 'gasUsed': hex(0), 'effectiveGasPrice': hex(0),
+            'status': '0x1', 'logs': [], 'logsBloom': '0x' + '00' * 256, 'type': '0x7e',
+        }
+        return tx['hash']
+
+    def send_raw_transaction(self, raw_hex):
+        raw = bytes.fromhex(raw_hex[2:] if raw_hex.startswith('0x') else raw_hex)
+        fields = decode_raw_transaction(raw)
+        # Recover di luar lock: operasi paling mahal per TX
+        sender = Account.recover_transaction(raw)
+        tx_hash = '0x' + keccak(raw).hex()
+        fields.update({'from': sender, 'hash': tx_hash})
+
+        with self.lock:
+            if self.rng.random() < self.nonce_error:
+                self.stats['nonce_errors'] += 1
+                raise RpcError("nonce too low")
+            if fields['nonce'] < self.nonces.get(sender, 0):
+                raise RpcError("nonce too low")
+            if tx_hash in self.txs:
+                raise RpcError("already known")
+            if fields['gas_price'] < self.gas_price // 2:
+                raise RpcError("transaction underpriced")
+            if self._balance(sender) < fields['value'] + fields['gas'] * fields['gas_price']:
+                raise RpcError("insufficient funds for gas * price + value")
+            queued = self.mempool.setdefault(sender, {})
+            existing = queued.get(fields['nonce'])
+            if existing:
+                if fields['gas_price'] < existing['gas_price'] * 11 // 10:
+                    raise RpcError("replacement transaction underpriced")
+                self.stats['replaced'] += 1
+            self.txs[tx_hash] = fields
+            self.stats['sent'] += 1
+            if self.rng.random() < self.drop:
+                # Diterima node tapi tidak pernah sampai ke blok
+                self.stats['dropped'] += 1
+                return tx_hash
+            queued[fields['nonce']] = fields
+            if not self.block_time:
+                self._mine()
+        return tx_hash
+
+    # -----------
+    # JSON-RPC
+    # -----------
+
+    def _block_number(self, tag):
+        if tag in (None, 'latest', 'pending', 'safe', 'finalized'):
+            return self.block
+        if tag == 'earliest':
+            return 0
+        return int(tag, 16)
+
+    def _tx_object(self, tx):
+        """Object TX JSON-RPC (blockNumber dst. None selama belum mined)."""
+        mined = 'blockNumber' in tx
+        return {
+            'hash': tx['hash'], 'from': tx['from'], 'to': tx['to'], 'nonce': hex(tx['nonce']),
+            'value': hex(tx['value']), 'gas': hex(tx['gas']), 'gasPrice': hex(tx['gas_price']),
+            'input': '0x' + tx['data'].hex(), 'chainId': hex(self.chain_id),
+            'blockNumber': hex(tx['blockNumber']) if mined else None,
+            'blockHash': tx['blockHash'] if mined else None,
+            'transactionIndex': hex(tx['index']) if mined else None,
+        }
+
+    def _block(self, number, full):
+        block = self.blocks.get(number)
+        if block is None:
+            return None
+        txs = [self._tx_object(self.txs[h]) if full else h for h in block['txs']]
+        return {
+            'number': hex(number), 'hash': block['hash'], 'timestamp': hex(block['timestamp']),
+            'baseFeePerGas': hex(self.gas_price), 'gasLimit': hex(30_000_000), 'transactions': txs,
+        }
+
+    def handle(self, method, params):
+        if method == 'eth_sendRawTransaction':
+            return self.send_raw_transaction(params[0])
+        with self.lock:
+            if method == 'eth_chainId':
+                return hex(self.chain_id)
+            if method == 'net_version':
+                return str(self.chain_id)
+            if method == 'eth_gasPrice':
+                return hex(self.gas_price)
+            if method == 'eth_maxPriorityFeePerGas':
+                return hex(max(1, self.gas_price // 10))
+            if method == 'eth_blockNumber':
+                return hex(self.block)
+            if method == 'eth_getBlockByNumber':
+                return self._block(self._block_number(params[0]), bool(params[1]) if len(params) > 1 else False)
+            if method == 'eth_getTransactionCount':
+                address = Web3.to_checksum_address(params[0])
+                if len(params) > 1 and params[1] == 'pending':
+                    return hex(self._pending_nonce(address))
+                return hex(self.nonces.get(address, 0))
+            if method == 'eth_getTransactionReceipt':
+                return self.receipts.get(params[0].lower())
+            if method == 'eth_getBalance':
+                return hex(self._balance(Web3.to_checksum_address(params[0])))
+            if method == 'eth_getCode':
+                return self.codes.get(Web3.to_checksum_address(params[0]), '0x')
+            if method == 'eth_call':
+                return self.call_result
+            if method == 'eth_estimateGas':
+                data = params[0].get('data') or params[0].get('input') or '0x'
+                return hex(21_000 + 16 * (len(data) - 2) // 2)
+            if method == 'eth_getTransactionByHash':
+                tx = self.txs.get(params[0].lower())
+                return self._tx_object(tx) if tx else None
+            if method == 'eth_getLogs':
+                return self._get_logs(params[0] if params else {})
+            if method == 'mock_stats':
+                return {**self.stats, 'block': self.block, 'gas_price': self.gas_price,
+                        'mempool': sum(len(q) for q in self.mempool.values())}
+        raise RpcError(f"the method {method} does not exist/is not available", -32601)
+
+
+    def _get_logs(self, flt):
+        """eth_getLogs: filter address (satu / list), topics (None / satu / list per posisi), range blok."""
+        if flt.get('blockHash'):
+            numbers = [n for n, b in self.blocks.items() if b['hash'] == flt['blockHash'].lower()]
+        else:
+            lo = self._block_number(flt.get('fromBlock', 'latest'))
+            hi = self._block_number(flt.get('toBlock', 'latest'))
+            numbers = range(lo, min(hi, self.block) + 1)
+        addresses = flt.get('address')
+        if addresses is not None:
+            addresses = {a.lower() for a in ([addresses] if isinstance(addresses, str) else addresses)}
+        wanted = []
+        for topic in flt.get('topics') or []:
+            if topic is None:
+                wanted.append(None)
+            else:
+                wanted.append({t.lower() for t in ([topic] if isinstance(topic, str) else topic)})
+
+        out = []
+        for n in numbers:
+            for entry in self.blocks.get(n, {}).get('logs', []):
+                if addresses is not None and entry['address'] not in addresses:
+                    continue
+                if len(wanted) > len(entry['topics']):
+                    continue
+                if all(w is None or t in w for w, t in zip(wanted, entry['topics'])):
+                    out.append(entry)
+        return out
+
+
+def make_handler(chain):
+    class MockRpcHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _one(self, req):
+            try:
+                return {'jsonrpc': '2.0', 'id': req.get('id'), 'result': chain.handle(req['method'], req.get('params', []))}
+            except RpcError as e:
+                return {'jsonrpc': '2.0', 'id': req.get('id'), 'error': {'code': e.code, 'message': str(e)}}
+            except Exception as e:
+                return {'jsonrpc': '2.0', 'id': req.get('id'), 'error': {'code': -32602, 'message': str(e)}}
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            try:
+                chain.before_request(len(body) if isinstance(body, list) else 1)
+            except HttpFault as e:
+                return self._reply(e.status, {'jsonrpc': '2.0', 'id': None,
+                                              'error': {'code': -32005, 'message': str(e)}})
+            out = [self._one(r) for r in body] if isinstance(body, list) else self._one(body)
+            self._reply(200, out)
+
+    return MockRpcHandler
+
+
+def serve(chain, host='127.0.0.1', port=8545, background=False):
+    """Jalankan server untuk `chain`. `background=True` → return server (thread daemon)."""
+    server = ThreadingHTTPServer((host, port), make_handler(chain))
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+    print(f"🧪 Mock RPC chain {chain.chain_id} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {json.dumps(chain.stats)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fault-injecting mock JSON-RPC server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8545)
+    parser.add_argument('--chain-id', type=int, default=91342)
+    parser.add_argument('--gas-price', type=int, default=10 ** 9, help='wei')
+    parser.add_argument('--block-time', type=float, default=0.0)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--latency', default='')
+    parser.add_argument('--rate-limit', type=float)
+    parser.add_argument('--p429', type=float, default=0.0)
+    parser.add_argument('--p5xx', type=float, default=0.0)
+    parser.add_argument('--drop', type=float, default=0.0)
+    parser.add_argument('--nonce-error', type=float, default=0.0)
+    parser.add_argument('--fee-volatility', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    chain = MockChain(
+        chain_id=args.chain_id, gas_price=args.gas_price, block_time=args.block_time, seed=args.seed,
+        latency=args.latency, rate_limit=args.rate_limit, p429=args.p429, p5xx=args.p5xx, drop=args.drop,
+        nonce_error=args.nonce_error, fee_volatility=args.fee_volatility,
+    )
+    serve(chain, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
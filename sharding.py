@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Horizontal sharding akun.txt (atau keystore_dir) ke beberapa worker process / mesin.
+
+Coordinator membagi akun ke N shard (per range baris atau hash address),
+menjalankan satu worker per shard dengan RPC endpoint sendiri, lalu
+menggabungkan hasil & ringkasan. Worker memuat shard-nya sendiri dari
+akun.txt lokal, jadi private key tidak pernah dikirim lewat socket
+(setiap host wajib punya akun.txt yang sama).
+
+Worker remote hanya menerima job dengan token rahasia bersama (--token /
+env SHARD_TOKEN) dan memakai config.json lokalnya sendiri: RPC dari job harus
+ada di config itu (rpc_url / giwa_rpc_url / rpc_pool), config & workflow dari
+client diabaikan. Bind ke interface privat, jangan ke internet.
+
+Pemakaian:
+    # Semua shard sebagai process lokal
+    python sharding.py run --action erc20 --shards 8 --by hash
+
+    # Worker di host lain (jaringan privat)
+    SHARD_TOKEN=... python sharding.py serve --host 10.0.0.2 --port 9400
+    SHARD_TOKEN=... python sharding.py run --action owlto --shards 4 --hosts 10.0.0.2:9400,10.0.0.3:9400
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import math
+import os
+import socket
+import socketserver
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from keystore import PASSWORD_ENV, account_lines, load_accounts
+from utils import MultiAccountFromPK, ConfigManager, RetryPolicy
+
+ACTIONS = ('owlto', 'erc20', 'gmon', 'omnihub', 'bridge', 'workflow')
+DEFAULT_PORT = 9400
+TOKEN_ENV = 'SHARD_TOKEN'
+REMOTE_PARAMS = ('name', 'symbol', 'amount')  # param job yang boleh datang dari client remote
+
+
+# =========================
+# Shard assignment
+# =========================
+
+def shard_of_line(line_number, shard_count):
+    """Shard untuk sebuah nomor baris (hash stabil, sama di semua host, tanpa derivasi key)."""
+    digest = hashlib.sha256(str(line_number).encode()).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+
+def shard_lines(lines, shard_index, shard_count, by='range'):
+    """
+    Nomor baris milik satu shard.
+    - range: blok baris berurutan
+    - hash : sha256(nomor baris) mod shard_count (tersebar acak, ukuran shard rata)
+    """
+    if by == 'range':
+        size = math.ceil(len(lines) / shard_count) if lines else 0
+        return set(lines[shard_index * size:(shard_index + 1) * size])
+    if by == 'hash':
+        return {line for line in lines if shard_of_line(line, shard_count) == shard_index}
+    raise ValueError(f"Unknown shard mode: {by}")
+
+
+def load_shard(bot, config, shard_index, shard_count, by='range'):
+    """
+    Muat akun milik satu shard dari akun.txt atau keystore_dir (sama seperti main/daemon).
+    Hanya key shard ini yang diturunkan / didekripsi. Keystore di worker: password dari env.
+    """
+    own = shard_lines(account_lines(config), shard_index, shard_count, by)
+    if config.get('keystore_dir') and not os.environ.get(PASSWORD_ENV):
+        raise RuntimeError(f"Shard dengan keystore_dir butuh env {PASSWORD_ENV}")
+    return load_accounts(bot, config, only_lines=own)
+
+
+def allowed_rpcs(config):
+    """Semua RPC endpoint yang dikenal config lokal (job remote hanya boleh memakai ini)."""
+    pool = config.get('rpc_pool', {})
+    urls = [config.get('rpc_url'), config.get('giwa_rpc_url'), *pool.get('sepolia', []), *pool.get('giwa', [])]
+    return {url for url in urls if url}
+
+
+def assign_rpc(config, shard_index):
+    """RPC endpoint per shard, round-robin dari `rpc_pool` (fallback ke rpc_url biasa)."""
+    pool = config.get('rpc_pool', {})
+    sepolia = pool.get('sepolia') or [config['rpc_url']]
+    giwa = pool.get('giwa') or [config.get('giwa_rpc_url')]
+    return sepolia[shard_index % len(sepolia)], giwa[shard_index % len(giwa)]
+
+
+# =========================
+# Worker
+# =========================
+
+def run_action(bot, config, accounts, action, params):
+    """Jalankan satu aksi batch untuk akun shard ini. Return list hasil."""
+    gas_limit = config.get('gas_limit', 2_000_000)
+    max_workers = config.get('max_workers', 5)
+    simulate = config.get('simulate_before_send', False)
+
+    if action == 'owlto':
+        return bot.deploy_owlto_smart_contract(
+            accounts, gas_limit=gas_limit, max_workers=max_workers, network='giwa', simulate=simulate
+        )
+    if action == 'erc20':
+        return bot.deploy_owlto_erc20_contract(
+            accounts,
+            name=params.get('name', config.get('erc20_name', 'cuandrop')),
+            symbol=params.get('symbol', config.get('erc20_symbol', 'cndrp')),
+            gas_limit=gas_limit,
+            max_workers=max_workers,
+            network='giwa',
+            simulate=simulate,
+        )
+    if action == 'gmon':
+        return bot.deploy_gmonchain(
+            accounts, gas_limit=config.get('gmon_create_gas', 350_000), max_workers=max_workers, network='giwa',
+            simulate=simulate
+        )
+    if action == 'omnihub':
+        return bot.mint_omnihub_nft(
+            accounts, gas_limit=gas_limit, max_workers=max_workers, network='giwa', simulate=simulate
+        )['results']
+    if action == 'bridge':
+        return bot.bridge_sepolia_to_giwa(
+            accounts,
+            amount_eth=params.get('amount', config.get('bridge_amount', '0.001')),
+            gas_limit=config.get('bridge_gas_limit', 150000),
+            max_workers=max_workers,
+            network='sepolia',
+            simulate=simulate,
+        )
+    if action == 'workflow':
+        from workflow import WorkflowEngine, load_workflow
+        workflow = load_workflow(params.get('workflow_file', config.get('workflow_file', 'workflow.json')))
+        return WorkflowEngine(bot, workflow, config).run(accounts)
+    raise ValueError(f"Unknown action: {action}")
+
+
+def summarize(results):
+    """Ringkasan hasil (hitungan sama dengan print_summary di main.py)."""
+    success = len([r for r in results if r.get('status') in ('success', 'sent') or 'tx_hash' in r])
+    errors = len([r for r in results if 'error' in r])
+    return {'success': success, 'errors': errors, 'total': len(results)}
+
+
+def run_shard(job):
+    """
+    Entry point worker (process lokal maupun server remote).
+
+    job: {action, params, shard_index, shard_count, by, rpc_url, giwa_rpc_url}
+    """
+    config = ConfigManager.load_config(job.get('config_file', 'config.json'))
+    if not config:
+        raise RuntimeError("config.json tidak bisa dimuat di worker")
+
+    bot = MultiAccountFromPK(
+        job['rpc_url'], job['giwa_rpc_url'], RetryPolicy.from_config(config.get('retry')), config.get('concurrency'),
+        config.get('fee_schedule'), config.get('websocket')
+    )
+    accounts = load_shard(bot, config, job['shard_index'], job['shard_count'], job.get('by', 'range'))
+    print(f"🧩 Shard {job['shard_index'] + 1}/{job['shard_count']}: {len(accounts)} accounts "
+          f"(sepolia={job['rpc_url']}, giwa={job['giwa_rpc_url']})")
+
+    results = run_action(bot, config, accounts, job['action'], job.get('params', {})) if accounts else []
+    return {'shard': job['shard_index'], 'accounts': len(accounts), 'results': results, 'summary': summarize(results)}
+
+
+class ShardRequestHandler(socketserver.StreamRequestHandler):
+    """Protokol sederhana: satu baris JSON job masuk, satu baris JSON hasil keluar."""
+
+    pool = None  # ProcessPoolExecutor milik server: tiap shard jalan di process sendiri
+    token = None
+    config_file = 'config.json'
+    rpcs = set()
+
+    def authorize(self, job):
+        """Cek token & bersihkan job dari client: config lokal, RPC yang dikenal, param terbatas."""
+        if not hmac.compare_digest(str(job.pop('token', '')).encode(), self.token.encode()):
+            raise PermissionError("invalid shard token")
+        for key in ('rpc_url', 'giwa_rpc_url'):
+            if job.get(key) not in self.rpcs:
+                raise PermissionError(f"{key} not in worker config: {job.get(key)}")
+        if job.get('action') not in ACTIONS:
+            raise PermissionError(f"Unknown action: {job.get('action')}")
+        params = job.get('params') or {}
+        job['params'] = {k: params[k] for k in REMOTE_PARAMS if k in params}
+        job['config_file'] = self.config_file
+        return job
+
+    def handle(self):
+        try:
+            job = self.authorize(json.loads(self.rfile.readline()))
+            response = self.pool.submit(run_shard, job).result()
+        except Exception as e:
+            response = {'error': str(e)}
+        self.wfile.write((json.dumps(response, default=str) + "\n").encode())
+
+
+def serve(host='127.0.0.1', port=DEFAULT_PORT, processes=None, token=None, config_file='config.json'):
+    """Jalankan worker server; tiap koneksi = satu shard job di process terpisah."""
+    if not token:
+        raise ValueError(f"Shard worker butuh token (--token atau env {TOKEN_ENV})")
+    config = ConfigManager.load_config(config_file)
+    if not config:
+        raise RuntimeError(f"{config_file} tidak bisa dimuat")
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count() or 1) as pool:
+        ShardRequestHandler.pool = pool
+        ShardRequestHandler.token = token
+        ShardRequestHandler.config_file = config_file
+        ShardRequestHandler.rpcs = allowed_rpcs(config)
+        with socketserver.ThreadingTCPServer((host, port), ShardRequestHandler) as server:
+            print(f"🛰️  Shard worker listening on {host}:{port}")
+            server.serve_forever()
+
+
+def run_remote(address, job, token, timeout=None):
+    """Kirim job (dengan token worker) ke worker remote dan tunggu hasilnya."""
+    host, _, port = address.partition(':')
+    with socket.create_connection((host, int(port or DEFAULT_PORT)), timeout=timeout) as conn:
+        conn.sendall((json.dumps({**job, 'token': token}) + "\n").encode())
+        with conn.makefile('rb') as stream:
+            response = json.loads(stream.readline())
+    if 'error' in response:
+        raise RuntimeError(f"{address}: {response['error']}")
+    return response
+
+
+# =========================
+# Coordinator
+# =========================
+
+def coordinate(config, action, shard_count, by='range', hosts=None, params=None, config_file='config.json',
+               token=None):
+    """
+    Bagi akun ke `shard_count` shard, jalankan paralel (process lokal atau host remote),
+    lalu gabungkan hasil. `token` wajib untuk host remote (sama dengan token worker).
+
+    Returns:
+        dict: results (gabungan), summary (gabungan), shards (ringkasan per shard)
+    """
+    jobs = []
+    for i in range(shard_count):
+        rpc_url, giwa_rpc_url = assign_rpc(config, i)
+        jobs.append({
+            'action': action,
+            'params': params or {},
+            'shard_index': i,
+            'shard_count': shard_count,
+            'by': by,
+            'rpc_url': rpc_url,
+            'giwa_rpc_url': giwa_rpc_url,
+            'config_file': config_file,
+        })
+
+    where = f"{len(hosts)} hosts" if hosts else "local processes"
+    print(f"🗂️  Running '{action}' in {shard_count} shards ({by}) on {where}...")
+
+    merged, shards = [], []
+    if hosts:
+        executor = ThreadPoolExecutor(max_workers=shard_count)
+        futures = {executor.submit(run_remote, hosts[i % len(hosts)], job, token): job for i, job in enumerate(jobs)}
+    else:
+        executor = ProcessPoolExecutor(max_workers=shard_count)
+        futures = {executor.submit(run_shard, job): job for job in jobs}
+
+    with executor:
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                out = future.result()
+                merged.extend(out['results'])
+                shards.append({'shard': out['shard'], 'accounts': out['accounts'], **out['summary']})
+                print(f"✅ Shard {out['shard'] + 1} done: {out['summary']}")
+            except Exception as e:
+                print(f"❌ Shard {job['shard_index'] + 1} failed: {e}")
+                shards.append({'shard': job['shard_index'], 'error': str(e)})
+
+    return {
+        'results': merged,
+        'summary': summarize(merged),
+        'shards': sorted(shards, key=lambda s: s['shard']),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded multi-process / multi-host runner")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_p = sub.add_parser('run', help='Coordinator: bagi akun & jalankan shard')
+    run_p.add_argument('--action', choices=ACTIONS, required=True)
+    run_p.add_argument('--shards', type=int, default=None, help='Jumlah shard (default: jumlah CPU / host)')
+    run_p.add_argument('--by', choices=('range', 'hash'), default='range')
+    run_p.add_argument('--hosts', default='', help='host:port worker remote, dipisah koma')
+    run_p.add_argument('--config', default='config.json')
+    run_p.add_argument('--name')
+    run_p.add_argument('--symbol')
+    run_p.add_argument('--amount')
+    run_p.add_argument('--token', default=os.environ.get(TOKEN_ENV), help=f'Token worker remote (default: env {TOKEN_ENV})')
+
+    serve_p = sub.add_parser('serve', help='Worker: terima shard job lewat socket')
+    serve_p.add_argument('--host', default='127.0.0.1')
+    serve_p.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_p.add_argument('--processes', type=int, default=None, help='Max shard paralel (default: jumlah CPU)')
+    serve_p.add_argument('--token', default=os.environ.get(TOKEN_ENV), help=f'Token rahasia bersama (default: env {TOKEN_ENV})')
+    serve_p.add_argument('--config', default='config.json')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        if not args.token:
+            sys.exit(f"❌ Set --token atau env {TOKEN_ENV} untuk worker")
+        serve(args.host, args.port, args.processes, args.token, args.config)
+        return
+
+    config = ConfigManager.load_config(args.config)
+    if not config:
+        sys.exit(1)
+
+    hosts = [h.strip() for h in args.hosts.split(',') if h.strip()]
+    shard_count = args.shards or (len(hosts) if hosts else os.cpu_count() or 1)
+    params = {k: v for k, v in (('name', args.name), ('symbol', args.symbol), ('amount', args.amount)) if v}
+    if hosts and not args.token:
+        sys.exit(f"❌ Set --token atau env {TOKEN_ENV} untuk host remote")
+
+    out = coordinate(config, args.action, shard_count, args.by, hosts, params, args.config, args.token)
+
+    summary = out['summary']
+    print(f"\n📊 Sharded {args.action} Summary:")
+    print(f"✅ Success: {summary['success']}")
+    print(f"❌ Errors:  {summary['errors']}")
+    print(f"📝 Total:   {summary['total']}")
+
+    if config.get('save_results', True):
+        with open(f'sharded_{args.action}_results.json', 'w') as f:
+            json.dump(out, f, indent=2, default=str)
+        print(f"💾 Results saved to sharded_{args.action}_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Batch method bot dijalankan end-to-end terhadap mockrpc (server in-process):
+deploy / call / bridge, fault injection, tracking deposit L1 → L2, bundler,
+verifier dan indexer.
+"""
+
+import pytest
+from eth_account import Account
+
+from indexer import EventIndex
+from mockrpc import MockChain, serve
+from utils import MultiAccountFromPK, RetryPolicy
+
+GIWA_CHAIN_ID = 91342
+SEPOLIA_CHAIN_ID = 11155111
+FAST_RETRY = {
+    "base_delay": {"transient": 0.01, "nonce": 0.01, "fee": 0.01},
+    "max_delay": 0.05,
+    "max_attempts": {"transient": 8, "nonce": 5, "fee": 3},
+}
+DEAD = "0x000000000000000000000000000000000000dEaD"
+
+
+def start(chain):
+    server = serve(chain, port=0, background=True)
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_accounts(n):
+    return [
+        {"private_key": acc.key.hex(), "address": acc.address, "line_number": i + 1}
+        for i, acc in enumerate(Account.create() for _ in range(n))
+    ]
+
+
+@pytest.fixture
+def chains():
+    """(bot, sepolia MockChain, giwa MockChain); deposit di Sepolia di-relay ke GIWA."""
+    giwa = MockChain(chain_id=GIWA_CHAIN_ID, seed=1)
+    sepolia = MockChain(chain_id=SEPOLIA_CHAIN_ID, seed=2, deposit_target=giwa)
+    servers = []
+    urls = []
+    for chain in (sepolia, giwa):
+        server, url = start(chain)
+        servers.append(server)
+        urls.append(url)
+    bot = MultiAccountFromPK(urls[0], urls[1], retry_policy=RetryPolicy.from_config(FAST_RETRY),
+                             concurrency={"adaptive": False})
+    yield bot, sepolia, giwa
+    for server in servers:
+        server.shutdown()
+
+
+def test_send_transaction_batch_deploys_verifiable_contracts(chains):
+    bot, _, giwa = chains
+    accounts = make_accounts(8)
+
+    results = bot.send_transaction_batch(accounts, bot.get_owlto_hex_data(), gas_limit=300_000, max_workers=4,
+                                         wait_for_receipt=True, network="giwa")
+    assert [r["status"] for r in results] == ["success"] * len(accounts)
+
+    # Tanpa contract_address: alamat diturunkan dari nonce lewat eth_getTransactionByHash
+    deployments = [{"address": r["address"], "tx_hash": r["tx_hash"], "kind": "owlto"} for r in results]
+    verified = bot.verify_deployments(deployments, "giwa")
+    assert {v["status"] for v in verified} == {"verified"}
+    assert {v["contract_address"] for v in verified} == {r["contract_address"] for r in results}
+
+
+def test_send_call_batch_mints_are_indexed(chains, tmp_path):
+    bot, _, giwa = chains
+    accounts = make_accounts(6)
+    to, data, value = bot.get_omnihub_mint_params()
+
+    results = bot.send_call_batch(accounts, to, data, value_wei=value, max_workers=3, network="giwa")
+    assert all(r["status"] == "sent" for r in results)
+    assert giwa.stats["logs"] == len(accounts)
+
+    index = EventIndex(bot, db_path=str(tmp_path / "index.db"), start_blocks={"giwa": 0}, confirmations=0)
+    found = index.sync(accounts, networks=("giwa",))
+    assert found["omnihub"] == len(accounts)
+    assert index.done_addresses("giwa", "omnihub") == {a["address"].lower() for a in accounts}
+
+
+def test_bridge_deposits_arrive_on_l2(chains, tmp_path):
+    bot, sepolia, giwa = chains
+    accounts = make_accounts(5)
+
+    results = bot.bridge_sepolia_to_giwa(iter(accounts), amount_eth="0.01", max_workers=2, simulate=True)
+    assert len(results) == len(accounts) and all("tx_hash" in r for r in results)
+
+    tracked = bot.track_bridge_deposits(results, timeout=30, poll_interval=0.1)
+    assert [t["status"] for t in tracked] == ["arrived"] * len(accounts)
+    assert giwa.stats["mined"] == len(accounts)
+
+    index = EventIndex(bot, db_path=str(tmp_path / "index.db"), start_blocks={"sepolia": 0}, confirmations=0)
+    assert index.sync(accounts, networks=("sepolia",))["bridge"] == len(accounts)
+
+
+def test_bundle_all_in_reports_contracts_from_event(chains, tmp_path):
+    bot, _, giwa = chains
+    funder, *accounts = make_accounts(4)
+
+    bundler = bot.ensure_bundler_contract(funder, "giwa", registry_file=str(tmp_path / "bundler.json"))
+    results = bot.bundle_all_in(accounts, bundler, gas_limit=4_000_000, max_workers=2, network="giwa", timeout=30)
+
+    assert [r["status"] for r in results] == ["success"] * len(accounts)
+    for r in results:
+        assert giwa.codes[r["owlto_sc"]["contract_address"]] != "0x"
+        assert giwa.codes[r["erc20"]["contract_address"]] != "0x"
+
+
+@pytest.mark.parametrize("faults, stat", [
+    ({"p429": 0.1}, "http_429"),
+    ({"p5xx": 0.1}, "http_5xx"),
+    ({"rate_limit": 12}, "http_429"),
+    ({"nonce_error": 0.3}, "nonce_errors"),
+    ({"latency": "lognormal:0.01,0.5"}, None),
+])
+def test_send_call_batch_survives_faults(faults, stat):
+    chain = MockChain(chain_id=GIWA_CHAIN_ID, seed=7, **faults)
+    server, url = start(chain)
+    try:
+        bot = MultiAccountFromPK(url, url, retry_policy=RetryPolicy.from_config(FAST_RETRY))
+        accounts = make_accounts(10)
+        results = bot.send_call_batch(accounts, DEAD, "0x", gas_limit=21_000, max_workers=4, network="giwa")
+        assert [r.get("status") for r in results] == ["sent"] * len(accounts)
+        receipts = bot.wait_for_receipts("giwa", [r["tx_hash"] for r in results], timeout=10, poll_interval=0.1)
+        assert len(receipts) == len(accounts)
+        if stat:
+            assert chain.stats[stat] > 0
+    finally:
+        server.shutdown()
+
+
+def test_dropped_transactions_never_confirm():
+    chain = MockChain(chain_id=GIWA_CHAIN_ID, seed=3, drop=0.3)
+    server, url = start(chain)
+    try:
+        bot = MultiAccountFromPK(url, url, retry_policy=RetryPolicy.from_config(FAST_RETRY))
+        accounts = make_accounts(10)
+        results = bot.send_call_batch(accounts, DEAD, "0x", gas_limit=21_000, max_workers=4, network="giwa")
+        receipts = bot.wait_for_receipts("giwa", [r["tx_hash"] for r in results], timeout=1, poll_interval=0.1)
+        assert chain.stats["dropped"] > 0
+        assert len(receipts) == len(accounts) - chain.stats["dropped"]
+    finally:
+        server.shutdown()
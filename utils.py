@@ -1,35 +1,93 @@
 from web3 import Web3
+from eth_account import Account
 from hexbytes import HexBytes
+from eth_utils import keccak
+import rlp
+import requests
 import time
 import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import asyncio
+import queue
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import json
 
+# keccak("TransactionDeposited(address,address,uint256,bytes)") dari OptimismPortal
+TRANSACTION_DEPOSITED_TOPIC = "0xb3813568d9991fc951961fcb4c784893574240a28925604d09fc577c55bb7c32"
+DEPOSIT_TX_TYPE = b"\x7e"
+
+# Selector revert standar Solidity
+ERROR_STRING_SELECTOR = "08c379a0"  # Error(string)
+PANIC_SELECTOR = "4e487b71"  # Panic(uint256)
+BALANCE_OF_SELECTOR = "0x70a08231"  # balanceOf(address)
+
+# keccak("Bundled(address,address,address)") dari kontrak bundler all-in
+BUNDLED_TOPIC = "0x931f932a94430d5ca7fcf31031d6e1ff16df5139fa6763e8a4ba8f8185e617ec"
+
+# Lokasi runtime code di dalam init code (argumen CODECOPY di constructor): (offset, length)
+OWLTO_RUNTIME_SLICE = (0x1e4, 0x3f)
+ERC20_RUNTIME_SLICE = (0x8e0, 0xd96)
+
 class MultiAccountFromPK:
-    def __init__(self, rpc_url, giwa_rpc_url=None):
+    def __init__(self, rpc_url, giwa_rpc_url=None, retry_policy=None, concurrency=None, fee_schedule=None,
+                 websocket=None):
         self.main_rpc = rpc_url
         self.giwa_rpc = giwa_rpc_url
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url)) # Default to main RPC
+        # Retry + backoff per kelas error untuk semua jalur kirim TX
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Setting AIMD controller (blok `concurrency` di config.json)
+        self.concurrency_config = concurrency or {}
+        # Tahan batch sampai fee di bawah ceiling (blok `fee_schedule` di config.json)
+        self.fee_schedule = fee_schedule or {}
+        self._fee_grants = threading.local()  # network yang window-nya sudah diberikan (per thread)
+
+        # Satu konteks independen per network (provider, chain_id, fee, nonce),
+        # jadi batch Sepolia & GIWA bisa jalan bersamaan di proses yang sama.
+        self.clients = {'sepolia': NetworkClient('sepolia', rpc_url)}
+        if giwa_rpc_url:
+            self.clients['giwa'] = NetworkClient('giwa', giwa_rpc_url)
+        self.network = 'sepolia'  # Default network untuk method tanpa `network`
+
+        # Langganan newHeads per network (blok `websocket` di config.json, URL kosong = HTTP polling)
+        websocket = websocket or {}
+        for name, client in self.clients.items():
+            if websocket.get(name):
+                client.heads = HeadSubscription(client, websocket[name], websocket.get('pending_txs', False)).start()
+
+    @property
+    def w3(self):
+        """Web3 milik network default (kompatibilitas kode lama)."""
+        return self.client().w3
+
+    def client(self, network_name=None):
+        """Konteks NetworkClient untuk `network_name` (default: network aktif)."""
+        name = (network_name or self.network).lower()
+        if name not in self.clients:
+            if name == 'giwa':
+                raise ValueError("GIWA RPC URL not configured in config.json")
+            raise ValueError(f"Unknown network: {network_name}")
+        return self.clients[name]
 
     def set_network(self, network_name: str):
-        """Switch the Web3 provider to the specified network."""
-        if network_name.lower() == 'giwa':
-            if not self.giwa_rpc:
-                print("❌ GIWA RPC URL not configured in config.json")
-                return False
-            self.w3 = Web3(Web3.HTTPProvider(self.giwa_rpc))
-            print(f"🔄 Switched network to GIWA")
-        elif network_name.lower() == 'sepolia':
-            self.w3 = Web3(Web3.HTTPProvider(self.main_rpc))
-            print(f"🔄 Switched network to Sepolia")
-        else:
-            print(f"❌ Unknown network: {network_name}")
+        """
+        Set network default untuk method yang dipanggil tanpa `network`.
+        Tidak mengganti provider milik network lain, jadi thread yang
+        sedang jalan tetap memakai network yang dia mulai.
+        """
+        try:
+            client = self.client(network_name)
+        except ValueError as e:
+            print(f"❌ {e}")
             return False
-        
+
+        self.network = client.name
+        print(f"🔄 Switched network to {'GIWA' if client.name == 'giwa' else 'Sepolia'}")
+
         # Verify connection
         try:
-            chain_id = self.w3.eth.chain_id
-            print(f"✅ Connected to network with Chain ID: {chain_id}")
+            print(f"✅ Connected to network with Chain ID: {client.chain_id}")
             return True
         except Exception as e:
             print(f"❌ Failed to connect to {network_name.upper()} network: {e}")
@@ -63,13 +121,13 @@ class MultiAccountFromPK:
                 "Expected 'raw_transaction' or 'rawTransaction' attribute."
             )
 
-    def send_raw_transaction_universal(self, signed_txn):
+    def send_raw_transaction_universal(self, signed_txn, network=None):
         """
         Universal method untuk mengirim raw transaction dengan kompatibilitas lengkap.
         """
         try:
             raw_data = self.get_raw_transaction_data(signed_txn)
-            return self.w3.eth.send_raw_transaction(raw_data)
+            return self.client(network).w3.eth.send_raw_transaction(raw_data)
         except Exception as e:
             raise Exception(f"Failed to send raw transaction: {str(e)}")
 
@@ -98,6 +156,137 @@ class MultiAccountFromPK:
             'uses_snake_case': major_version >= 7
         }
 
+    # =========================
+    # JSON-RPC batch helpers
+    # =========================
+
+    def _rpc_url(self, network_name: str):
+        """RPC URL untuk network 'sepolia' atau 'giwa'."""
+        return self.client(network_name).rpc_url
+
+    def _rpc_batch(self, rpc_url, calls, chunk_size=100, timeout=30):
+        """
+        Kirim banyak JSON-RPC call dalam satu HTTP request (batch).
+        web3.py v6 belum punya batch request, jadi pakai `requests` langsung.
+
+        Args:
+            rpc_url: URL RPC tujuan
+            calls: List of (method, params)
+            chunk_size: Max call per HTTP request (banyak RPC publik membatasi ukuran batch)
+
+        Returns:
+            List hasil sesuai urutan `calls`. Call yang error berisi dict {"error": ...}.
+        """
+        results = [None] * len(calls)
+        for start in range(0, len(calls), chunk_size):
+            chunk = calls[start:start + chunk_size]
+            payload = [
+                {"jsonrpc": "2.0", "id": start + i, "method": method, "params": params}
+                for i, (method, params) in enumerate(chunk)
+            ]
+            response = requests.post(rpc_url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            body = response.json()
+            if isinstance(body, dict):
+                # Beberapa node membalas satu error object untuk seluruh batch
+                raise Exception(f"Batch RPC error: {body.get('error', body)}")
+            for item in body:
+                idx = item.get("id")
+                if not isinstance(idx, int) or not 0 <= idx < len(results):
+                    continue
+                results[idx] = {"error": item["error"]} if "error" in item else item.get("result")
+        return results
+
+    def wait_for_receipts(self, network_name, tx_hashes, timeout=300, poll_interval=3, on_receipt=None):
+        """
+        Tunggu banyak receipt sekaligus dengan satu batch request per polling
+        (bukan `wait_for_transaction_receipt` per TX).
+
+        Args:
+            network_name: 'sepolia' atau 'giwa'
+            tx_hashes: Iterable tx hash (hex string)
+            timeout: Detik maksimal menunggu (0 = cek satu kali saja)
+            on_receipt: Callback (tx_hash, receipt) dipanggil begitu receipt ditemukan
+
+        Returns:
+            Dict tx_hash -> receipt (dict JSON mentah). TX yang timeout tidak ada di dict.
+        """
+        client = self.client(network_name)
+        rpc_url = client.rpc_url
+        pending = {self._normalize_hash(h) for h in tx_hashes if h}
+        found = {}
+        deadline = time.time() + timeout
+        seen = {}
+        self._head_advanced(client.name, seen, poll_interval)
+
+        while pending:
+            ordered = list(pending)
+            try:
+                receipts = self._rpc_batch(
+                    rpc_url, [("eth_getTransactionReceipt", [h]) for h in ordered]
+                )
+            except Exception as e:
+                print(f"⚠️ Receipt polling error ({network_name}): {e}")
+                receipts = [None] * len(ordered)
+
+            for tx_hash, receipt in zip(ordered, receipts):
+                if not receipt or "error" in receipt:
+                    continue
+                pending.discard(tx_hash)
+                found[tx_hash] = receipt
+                if on_receipt:
+                    on_receipt(tx_hash, receipt)
+
+            if not pending or time.time() >= deadline:
+                break
+            self._await_head(client.name, seen, poll_interval, deadline)
+
+        return found
+
+    def _head_advanced(self, network_name, seen, poll_interval):
+        """
+        Apakah `network_name` perlu dipoll lagi: ada blok baru (newHeads via WebSocket)
+        atau, tanpa WebSocket, `poll_interval` sudah lewat. `seen` dict state milik pemanggil.
+        """
+        heads = self.client(network_name).heads
+        if heads is not None and heads.live:
+            if heads.head != seen.get(network_name):
+                seen[network_name] = heads.head
+                return True
+            return False
+        now = time.time()
+        if now - seen.get((network_name, 'polled_at'), 0) >= poll_interval:
+            seen[(network_name, 'polled_at')] = now
+            return True
+        return False
+
+    def _await_head(self, network_name, seen, poll_interval, deadline):
+        """Tunggu giliran poll berikutnya: blok baru kalau newHeads aktif, selain itu `poll_interval` detik."""
+        heads = self.client(network_name).heads
+        if heads is not None and heads.live:
+            heads.wait_for_head(seen.get(network_name), timeout=max(0.0, deadline - time.time()))
+        else:
+            time.sleep(max(0.0, min(poll_interval, deadline - time.time())))
+        self._head_advanced(network_name, seen, poll_interval)
+
+    def wait_for_receipt(self, network_name, tx_hash, timeout=120):
+        """
+        Receipt satu TX (format web3). Dengan langganan newHeads aktif dicek sekali
+        per blok baru; tanpa WebSocket pakai `wait_for_transaction_receipt` biasa.
+        """
+        client = self.client(network_name)
+        if client.heads is None or not client.heads.live:
+            return client.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        if not self.wait_for_receipts(client.name, [tx_hash], timeout=timeout):
+            raise TimeoutError(f"Transaction {self._normalize_hash(tx_hash)} not mined after {timeout}s")
+        return client.w3.eth.get_transaction_receipt(tx_hash)
+
+    @staticmethod
+    def _normalize_hash(tx_hash):
+        h = tx_hash.hex() if isinstance(tx_hash, (bytes, bytearray)) else str(tx_hash)
+        h = h.lower()
+        return h if h.startswith("0x") else "0x" + h
+
     # =========================
     # GIWA Bridge Integration
     # =========================
@@ -117,33 +306,12 @@ class MultiAccountFromPK:
         """
         Build deposit transaction data untuk bridge ke GIWA.
         Menggunakan depositTransaction function di OptimismPortal.
+        Untuk banyak akun sekaligus pakai DepositCalldata (template, patch recipient saja).
         """
-        # Function signature: depositTransaction(address,uint256,uint64,bool,bytes)
-        function_selector = "0xe9e05c42"
-        
-        # Encode parameters:
-        # address to = recipient_address
-        # uint256 value = amount_wei  
-        # uint64 gasLimit = 100000 (default L2 gas limit)
-        # bool isCreation = false
-        # bytes data = empty (0x)
-        
-        # Manual ABI encoding
-        to_param = recipient_address[2:].zfill(64)  # address padded to 32 bytes
-        value_param = hex(amount_wei)[2:].zfill(64)  # uint256 value
-        gas_limit_param = hex(100000)[2:].zfill(64)  # uint64 gasLimit 
-        is_creation_param = "00" * 32  # bool false
-        data_offset_param = hex(5 * 32)[2:].zfill(64)  # offset to data (5*32 bytes)
-        data_length_param = "00" * 32  # data length = 0
-        
-        encoded_params = (
-            to_param + value_param + gas_limit_param + 
-            is_creation_param + data_offset_param + data_length_param
-        )
-        
-        return function_selector + encoded_params
+        return "0x" + DepositCalldata(amount_wei).for_recipient(recipient_address).hex()
 
-    def bridge_sepolia_to_giwa(self, accounts, amount_eth="0.001", gas_limit=150000, max_workers=5):
+    def bridge_sepolia_to_giwa(self, accounts, amount_eth="0.001", gas_limit=150000, max_workers=5, network='sepolia',
+                               simulate=False):
         """
         Bridge ETH dari Sepolia ke GIWA untuk multiple accounts.
         
@@ -152,82 +320,82 @@ class MultiAccountFromPK:
             amount_eth: Amount ETH to bridge (string)
             gas_limit: Gas limit untuk transaksi
             max_workers: Max concurrent workers
+            network: Network L1 tempat bridge dikirim (default 'sepolia')
+            simulate: Dry-run semua TX dengan eth_call dulu, akun yang akan revert di-skip
         """
         contracts = self.get_giwa_bridge_contracts()
         portal_address = contracts['optimism_portal']
-        amount_wei = self.w3.to_wei(amount_eth, 'ether')
+        amount_wei = Web3.to_wei(amount_eth, 'ether')
         
-        print(f"🌉 Starting bridge {amount_eth} ETH from Sepolia to GIWA for {len(accounts)} accounts...")
+        count = f"{len(accounts)} " if hasattr(accounts, '__len__') else ""  # accounts boleh iterator (streaming)
+        print(f"🌉 Starting bridge {amount_eth} ETH from Sepolia to GIWA for {count}accounts...")
         print(f"📍 OptimismPortal: {portal_address}")
         
+        # Calldata dibangun sekali; tiap worker hanya patch word recipient
+        deposit_data = DepositCalldata(amount_wei)
         results = []
+        if simulate:
+            accounts, results = self._simulation_gate(
+                accounts,
+                lambda acc: {
+                    "from": acc["address"], "to": portal_address, "value": amount_wei, "gas": gas_limit,
+                    "data": deposit_data.for_recipient(acc["address"]),
+                },
+                network,
+            )
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            
-            for account in accounts:
-                # Build deposit transaction data
-                deposit_data = self.build_deposit_transaction_data(
-                    amount_wei, 
-                    account['address']
-                )
-                
-                future = executor.submit(
-                    self._send_bridge_transaction,
-                    account['private_key'],
-                    account['address'], 
-                    portal_address,
-                    deposit_data,
-                    amount_wei,  # value to send
-                    gas_limit,
-                    account['line_number']
-                )
-                futures.append(future)
-                time.sleep(random.uniform(0.3, 1.0))  # Spread requests
-            
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    results.append(result)
-                    if result.get('status') == 'success':
-                        print(f"✅ Bridge: {result['address']} - TX: {result['tx_hash'][:10]}...")
-                    else:
-                        print(f"📤 Sent: {result['address']} - TX: {result['tx_hash'][:10]}...")
-                except Exception as e:
-                    print(f"❌ Bridge Error: {e}")
-                    results.append({"error": str(e)})
+        controller = self._concurrency_controller(self.client(network), max_workers)
+        self.await_fee_window(network, controller)
+        # deposit_data di-encode di worker (patch recipient), bukan di thread submit
+        work = lambda acc: self._send_bridge_transaction(
+            acc['private_key'], acc['address'], portal_address, deposit_data, amount_wei, gas_limit,
+            acc['line_number'], network,
+        )
+        for _, result, error in self._stream_batch(controller, accounts, work, spread=(0.3, 1.0)):
+            if error is not None:
+                print(f"❌ Bridge Error: {error}")
+                results.append({"error": str(error)})
+                continue
+            results.append(result)
+            if result.get('status') == 'success':
+                print(f"✅ Bridge: {result['address']} - TX: {result['tx_hash'][:10]}...")
+            else:
+                print(f"📤 Sent: {result['address']} - TX: {result['tx_hash'][:10]}...")
+        controller.log_settled(network)
         
         return results
 
-    def _send_bridge_transaction(self, private_key, from_address, to_address, data, value_wei, gas_limit, line_number):
+    def _send_bridge_transaction(self, private_key, from_address, to_address, data, value_wei, gas_limit, line_number, network='sepolia'):
         """
         Send single bridge transaction dengan value (ETH yang di-bridge).
+        `data` boleh DepositCalldata: recipient (= pengirim) di-patch di sini.
         """
+        client = self.client(network)
         try:
-            nonce = self.w3.eth.get_transaction_count(from_address)
-            gas_price = self.w3.eth.gas_price
+            if isinstance(data, DepositCalldata):
+                data = data.for_recipient(from_address)
+            gas_price = self.retry_policy.call(client.fees.gas_price)
             
-            tx = {
+            tx = self._with_nonce({
                 'from': from_address,
-                'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit,
                 'to': Web3.to_checksum_address(to_address),
                 'value': int(value_wei),  # ETH amount to bridge
                 'data': data,
-                'chainId': self.w3.eth.chain_id,
-            }
+                'chainId': client.chain_id,
+            }, client)
             
-            signed_txn = self.w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = self.send_raw_transaction_universal(signed_txn)
+            tx_hash = self._sign_and_send(tx, private_key, client)
             
             return {
                 'address': from_address,
                 'tx_hash': tx_hash.hex(),
                 'line_number': line_number,
-                'status': 'sent'
+                'status': 'sent',
+                'sent_at': time.time()
             }
-            
+
         except Exception as e:
             error_message = str(e)
             
@@ -247,44 +415,201 @@ class MultiAccountFromPK:
     def check_bridge_balances(self, accounts, giwa_rpc="https://sepolia-rpc.giwa.io"):
         """
         Check balance di kedua network (Sepolia dan GIWA).
+
+        Returns:
+            List dict per akun: address, line_number, sepolia (wei), giwa (wei).
+            Dipakai juga untuk sizing disperse & sweep.
         """
-        # Pastikan self.w3 connect ke Ethereum Sepolia
-        current_chain_id = self.w3.eth.chain_id
+        # Pastikan klien Sepolia memang connect ke Ethereum Sepolia
+        sepolia = self.client('sepolia')
+        current_chain_id = sepolia.chain_id
         print(f"🔍 Current RPC Chain ID: {current_chain_id}")
         
         if current_chain_id == 91342:  # GIWA chain ID
             print("⚠️  WARNING: Bot is connected to GIWA, not Ethereum Sepolia!")
             print("💡 Please update config.json rpc_url to Ethereum Sepolia RPC")
-            return
+            return []
         
-        # Setup GIWA client 
-        giwa_w3 = Web3(Web3.HTTPProvider(giwa_rpc))
-        giwa_chain_id = giwa_w3.eth.chain_id
+        # Setup GIWA client (pakai konteks GIWA kalau sudah dikonfigurasi)
+        giwa = self.clients.get('giwa') or NetworkClient('giwa', giwa_rpc)
+        giwa_w3 = giwa.w3
+        giwa_chain_id = giwa.chain_id
         print(f"🔍 GIWA RPC Chain ID: {giwa_chain_id}")
         
         print("\n💰 Bridge Balance Check:")
         print("=" * 60)
         
+        balances = []
         for account in accounts:  # Show all accounts
             try:
                 addr = account['address']
                 
                 # Ethereum Sepolia balance (Chain ID: 11155111)
-                sepolia_bal_wei = self.w3.eth.get_balance(addr)
-                sepolia_bal_eth = self.w3.from_wei(sepolia_bal_wei, "ether")
+                sepolia_bal_wei = sepolia.state.get_balance(addr)
+                sepolia_bal_eth = Web3.from_wei(sepolia_bal_wei, "ether")
                 
                 # GIWA Sepolia balance (Chain ID: 91342)
-                giwa_bal_wei = giwa_w3.eth.get_balance(addr)
+                giwa_bal_wei = giwa.state.get_balance(addr)
                 giwa_bal_eth = giwa_w3.from_wei(giwa_bal_wei, "ether")
                 
                 print(f"🔹 {addr}")
                 print(f"   Ethereum Sepolia (11155111): {sepolia_bal_eth:.6f} ETH")
                 print(f"   GIWA Sepolia (91342):        {giwa_bal_eth:.6f} ETH")
                 print()
+
+                balances.append({
+                    'address': addr,
+                    'line_number': account.get('line_number'),
+                    'sepolia': sepolia_bal_wei,
+                    'giwa': giwa_bal_wei,
+                })
                 
             except Exception as e:
                 print(f"❌ Error checking {addr}: {e}")
 
+        self.print_cache_stats(sepolia, giwa)
+        return balances
+
+    def derive_l2_deposit_hashes(self, receipt, portal_address=None):
+        """
+        Turunkan hash deposit TX di L2 (GIWA) dari event `TransactionDeposited`
+        pada receipt L1. Mengikuti spec OP Stack:
+          sourceHash = keccak256(bytes32(0) ++ keccak256(l1BlockHash ++ bytes32(logIndex)))
+          txHash     = keccak256(0x7E ++ rlp([sourceHash, from, to, mint, value, gas, isSystemTx, data]))
+        """
+        portal = (portal_address or self.get_giwa_bridge_contracts()['optimism_portal']).lower()
+        deposited_topic = HexBytes(TRANSACTION_DEPOSITED_TOPIC)
+        hashes = []
+
+        for log in receipt.get('logs', []):
+            topics = [HexBytes(t) for t in log.get('topics', [])]
+            if log.get('address', '').lower() != portal or len(topics) != 4 or topics[0] != deposited_topic:
+                continue
+            if int.from_bytes(topics[3], 'big') != 0:  # hanya opaqueData versi 0
+                continue
+
+            from_addr = bytes(topics[1][-20:])
+            to_addr = bytes(topics[2][-20:])
+
+            # data = abi.encode(bytes opaqueData)
+            data = HexBytes(log['data'])
+            length = int.from_bytes(data[32:64], 'big')
+            opaque = bytes(data[64:64 + length])
+
+            # opaqueData = abi.encodePacked(mint, value, gasLimit, isCreation, data)
+            mint = int.from_bytes(opaque[0:32], 'big')
+            value = int.from_bytes(opaque[32:64], 'big')
+            gas_limit = int.from_bytes(opaque[64:72], 'big')
+            is_creation = opaque[72] == 1
+            payload = opaque[73:]
+
+            log_index = log['logIndex']
+            log_index = int(log_index, 16) if isinstance(log_index, str) else int(log_index)
+            source_hash = keccak(
+                b'\x00' * 32 + keccak(bytes(HexBytes(log['blockHash'])) + log_index.to_bytes(32, 'big'))
+            )
+
+            encoded = rlp.encode([
+                source_hash,
+                from_addr,
+                b'' if is_creation else to_addr,
+                mint,
+                value,
+                gas_limit,
+                0,  # isSystemTx = false
+                payload,
+            ])
+            hashes.append("0x" + keccak(DEPOSIT_TX_TYPE + encoded).hex())
+
+        return hashes
+
+    def track_bridge_deposits(self, bridge_results, timeout=900, poll_interval=5, on_arrival=None):
+        """
+        Lacak deposit Sepolia → GIWA sampai dana sampai di L2.
+
+        1) Tunggu receipt L1 semua bridge TX (batch polling di Sepolia)
+        2) Baca event TransactionDeposited & turunkan hash deposit TX L2
+        3) Tunggu semua deposit di GIWA sekaligus (batch polling)
+
+        Args:
+            bridge_results: Hasil dari `bridge_sepolia_to_giwa`
+            on_arrival: Callback (result) dipanggil per akun begitu dana sampai di GIWA,
+                        supaya aksi GIWA untuk akun itu bisa langsung jalan.
+
+        Returns:
+            List dict per akun: address, l1/l2 tx hash, status, latency (detik).
+        """
+        sent = [r for r in bridge_results if r.get('tx_hash') and 'error' not in r]
+        if not sent:
+            print("ℹ️ Tidak ada bridge TX untuk dilacak")
+            return []
+
+        started = time.time()
+        deadline = started + timeout
+        tracked = {}
+        for r in sent:
+            l1_hash = self._normalize_hash(r['tx_hash'])
+            tracked[l1_hash] = {
+                'address': r['address'],
+                'line_number': r.get('line_number'),
+                'l1_tx_hash': l1_hash,
+                'l2_tx_hash': None,
+                'status': 'pending_l1',
+                'sent_at': r.get('sent_at', started),
+            }
+        by_l2_hash = {}
+
+        print(f"\n🔭 Tracking {len(tracked)} deposits (L1 receipt → L2 arrival)...")
+
+        def on_l1_receipt(l1_hash, receipt):
+            entry = tracked[l1_hash]
+            entry['l1_confirmed_at'] = time.time()
+            if int(receipt.get('status', '0x0'), 16) != 1:
+                entry['status'] = 'l1_failed'
+                print(f"❌ L1 bridge TX gagal: {entry['address']} - TX: {l1_hash[:10]}...")
+                return
+            l2_hashes = self.derive_l2_deposit_hashes(receipt)
+            if not l2_hashes:
+                entry['status'] = 'no_deposit_event'
+                print(f"⚠️ Event TransactionDeposited tidak ditemukan: {entry['address']}")
+                return
+            entry['l2_tx_hash'] = l2_hashes[0]
+            entry['status'] = 'pending_l2'
+            by_l2_hash[l2_hashes[0]] = entry
+            print(f"📦 L1 confirmed: {entry['address']} → L2 deposit {l2_hashes[0][:10]}...")
+
+        def on_l2_receipt(l2_hash, receipt):
+            entry = by_l2_hash[l2_hash]
+            entry['arrived_at'] = time.time()
+            entry['latency'] = round(entry['arrived_at'] - entry['sent_at'], 1)
+            ok = int(receipt.get('status', '0x0'), 16) == 1
+            entry['status'] = 'arrived' if ok else 'l2_failed'
+            if ok:
+                print(f"✅ Arrived on GIWA: {entry['address']} — {entry['latency']}s")
+                if on_arrival:
+                    on_arrival(entry)
+            else:
+                print(f"❌ Deposit gagal di GIWA: {entry['address']} - TX: {l2_hash[:10]}...")
+
+        # Kedua tahap di-poll bergantian supaya akun yang L1-nya cepat tidak menunggu yang lambat;
+        # tiap network dicek per blok baru (newHeads) atau per poll_interval
+        seen = {}
+        while time.time() < deadline:
+            pending_l1 = [h for h, e in tracked.items() if e['status'] == 'pending_l1']
+            pending_l2 = [h for h, e in by_l2_hash.items() if e['status'] == 'pending_l2']
+            if not pending_l1 and not pending_l2:
+                break
+            if pending_l1 and self._head_advanced('sepolia', seen, poll_interval):
+                self.wait_for_receipts('sepolia', pending_l1, timeout=0, on_receipt=on_l1_receipt)
+            if pending_l2 and self._head_advanced('giwa', seen, poll_interval):
+                self.wait_for_receipts('giwa', pending_l2, timeout=0, on_receipt=on_l2_receipt)
+            time.sleep(0.2)
+
+        for entry in tracked.values():
+            if entry['status'] in ('pending_l1', 'pending_l2'):
+                entry['status'] = 'timeout'
+        return list(tracked.values())
+
     # =========================
     # Bytecode & Encoding utils
     # =========================
@@ -372,23 +697,23 @@ class MultiAccountFromPK:
         value_wei = 35_000_000_000_000  # 0.000035 ETH
         return factory, selector, value_wei
 
-    def deploy_gmonchain(self, accounts, gas_limit=300_000, max_workers=5):
+    def deploy_gmonchain(self, accounts, gas_limit=300_000, max_workers=5, network=None, simulate=False):
         """
         Kirim TX ke factory GMONChain (batch, non-blocking seperti fitur #2).
         """
         to, data, value_wei = self.get_gmonchain_call_params()
         print(f"🧩 Starting GMONChain deployment for {len(accounts)} accounts...")
-        return self.send_call_batch(accounts, to, data, value_wei, gas_limit, max_workers)
+        return self.send_call_batch(accounts, to, data, value_wei, gas_limit, max_workers, network=network, simulate=simulate)
 
     # === NFT Features ===
-    
-    def mint_omnihub_nft(self, accounts, gas_limit=2_000_000, max_workers=5):
+
+    def get_omnihub_mint_params(self):
         """
-        Mint Omnihub NFT:
-        - Hardcode target contract & value
-        - Skip akun yang sudah memiliki NFT (balanceOf > 0)
+        Param panggilan mint Omnihub NFT:
+        - to: kontrak NFT Omnihub
+        - data: mint calldata (hardcode)
+        - value_wei: 0.001 ETH
         """
-        # === hardcode target dan value ===
         target_contract = Web3.to_checksum_address("0x5893B6684057eaBDeCB400526C8410EAFca6d541")
         value_wei = Web3.to_wei(0.001, "ether")
         data = (
@@ -399,27 +724,26 @@ class MultiAccountFromPK:
             "0000000000000000000000000000000000000000000000000000000000000080"
             "0000000000000000000000000000000000000000000000000000000000000000"
         )
+        return target_contract, data, value_wei
 
-        # cek NFT yang sama dengan target contract
-        nft = self.w3.eth.contract(
-            address=target_contract,
-            abi=[
-                {
-                    "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
-                    "name": "balanceOf",
-                    "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-                    "stateMutability": "view",
-                    "type": "function",
-                }
-            ],
-        )
+    def mint_omnihub_nft(self, accounts, gas_limit=2_000_000, max_workers=5, network=None, simulate=False):
+        """
+        Mint Omnihub NFT:
+        - Hardcode target contract & value
+        - Skip akun yang sudah memiliki NFT (balanceOf > 0)
+        """
+        target_contract, data, value_wei = self.get_omnihub_mint_params()
+
+        # cek NFT yang sama dengan target contract (balanceOf lewat cache state)
+        state = self.client(network).state
 
         print("\n🔎 Memeriksa kepemilikan Omnihub NFT...")
         eligible, skipped = [], []
         
         for acc in accounts:
             try:
-                bal = nft.functions.balanceOf(acc["address"]).call()
+                call_data = BALANCE_OF_SELECTOR + acc["address"][2:].lower().rjust(64, "0")
+                bal = int.from_bytes(state.call(target_contract, call_data, account=acc["address"]) or b"\x00", "big")
                 if int(bal) == 0:
                     eligible.append(acc)
                 else:
@@ -441,6 +765,8 @@ class MultiAccountFromPK:
             value_wei=value_wei,
             gas_limit=gas_limit,
             max_workers=max_workers,
+            network=network,
+            simulate=simulate,
         )
 
         return {
@@ -453,18 +779,24 @@ class MultiAccountFromPK:
     # File & wallet
     # =============
     
-    def load_private_keys(self, filename):
-        """Load private keys dari akun.txt."""
+    def load_private_keys(self, filename, only_lines=None):
+        """
+        Load private keys dari akun.txt.
+        `only_lines` (set nomor baris) membatasi derivasi key ke baris tertentu saja,
+        dipakai worker shard supaya tidak menurunkan semua key.
+        """
         accounts = []
         with open(filename, 'r') as f:
             for line_num, line in enumerate(f, 1):
                 pk = line.strip()
                 if not pk:
                     continue
+                if only_lines is not None and line_num not in only_lines:
+                    continue
                 try:
                     if not pk.startswith('0x'):
                         pk = '0x' + pk
-                    acct = self.w3.eth.account.from_key(pk)
+                    acct = Account.from_key(pk)
                     accounts.append(
                         {"private_key": pk, "address": acct.address, "line_number": line_num}
                     )
@@ -476,16 +808,22 @@ class MultiAccountFromPK:
     # Deploy API
     # ===========
     
-    def deploy_owlto_smart_contract(self, accounts, gas_limit=2_000_000, max_workers=5):
-        """Fitur #1: deploy Owlto, menunggu receipt (cek sukses on-chain)."""
+    def deploy_owlto_smart_contract(self, accounts, gas_limit=2_000_000, max_workers=5, network=None, simulate=False,
+                                    wait_for_receipt=True):
+        """
+        Fitur #1: deploy Owlto, default menunggu receipt (cek sukses on-chain).
+        Dengan `wait_for_receipt=False` hasil tetap berisi contract_address (dihitung lokal).
+        """
         hex_data = self.get_owlto_hex_data()
         print(f"🦉 Starting Owlto Smart Contract deployment for {len(accounts)} accounts...")
         return self.send_transaction_batch(
-            accounts, hex_data, gas_limit, max_workers, wait_for_receipt=True
+            accounts, hex_data, gas_limit, max_workers, wait_for_receipt=wait_for_receipt, network=network,
+            simulate=simulate
         )
 
     def deploy_owlto_erc20_contract(
-        self, accounts, name="cuandrop", symbol="cndrp", gas_limit=2_000_000, max_workers=5, wait_for_receipt=False
+        self, accounts, name="cuandrop", symbol="cndrp", gas_limit=2_000_000, max_workers=5, wait_for_receipt=False,
+        network=None, simulate=False
     ):
         """
         Fitur #2: deploy ERC20 Owlto.
@@ -495,62 +833,57 @@ class MultiAccountFromPK:
         hex_data = self.get_owlto_erc20_hex_data(name, symbol)
         print(f"🪙 Starting Owlto ERC20 deployment: {name} ({symbol}) for {len(accounts)} accounts...")
         return self.send_transaction_batch(
-            accounts, hex_data, gas_limit, max_workers, wait_for_receipt=wait_for_receipt
+            accounts, hex_data, gas_limit, max_workers, wait_for_receipt=wait_for_receipt, network=network,
+            simulate=simulate
         )
 
     # =====================
     # Batch send primitives (UPDATED with Universal Compatibility)
     # =====================
     
-    def send_call_batch(self, accounts, to, data, value_wei=0, gas_limit=300_000, max_workers=5):
+    def send_call_batch(self, accounts, to, data, value_wei=0, gas_limit=300_000, max_workers=5, network=None,
+                        simulate=False):
         """Batch call ke alamat `to` dgn data & value (tanpa tunggu receipt)."""
+        network = self.client(network).name  # dikunci di awal batch
         results = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            for account in accounts:
-                futures.append(
-                    executor.submit(
-                        self._send_single_call,
-                        account['private_key'],
-                        account['address'],
-                        to,
-                        data,
-                        value_wei,
-                        gas_limit,
-                        account['line_number']
-                    )
-                )
-                time.sleep(random.uniform(0.2, 0.8))
-            
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    results.append(result)
-                    print(f"✅ Success: {result['address']} - TX: {result['tx_hash'][:10]}...")
-                except Exception as e:
-                    print(f"❌ Error: {e}")
-                    results.append({"error": str(e)})
+        if simulate:
+            accounts, results = self._simulation_gate(
+                accounts,
+                lambda acc: {"from": acc["address"], "to": to, "data": data, "value": value_wei, "gas": gas_limit},
+                network,
+            )
+        controller = self._concurrency_controller(self.client(network), max_workers)
+        self.await_fee_window(network, controller)
+        work = lambda acc: self._send_single_call(
+            acc['private_key'], acc['address'], to, data, value_wei, gas_limit, acc['line_number'], network
+        )
+        for _, result, error in self._stream_batch(controller, accounts, work):
+            if error is not None:
+                print(f"❌ Error: {error}")
+                results.append({"error": str(error)})
+                continue
+            results.append(result)
+            print(f"✅ Success: {result['address']} - TX: {result['tx_hash'][:10]}...")
+        controller.log_settled(network)
         return results
 
-    def _send_single_call(self, private_key, from_address, to, data, value_wei, gas_limit, line_number):
+    def _send_single_call(self, private_key, from_address, to, data, value_wei, gas_limit, line_number, network=None):
         """Kirim single TX call (tanpa tunggu receipt) - UPDATED with Universal Compatibility."""
+        client = self.client(network)
         try:
-            nonce = self.w3.eth.get_transaction_count(from_address)
-            gas_price = self.w3.eth.gas_price
+            gas_price = self.retry_policy.call(client.fees.gas_price)
             
-            tx = {
+            tx = self._with_nonce({
                 'from': from_address,
-                'nonce': nonce,
                 'gasPrice': gas_price,
                 'gas': gas_limit,
                 'to': Web3.to_checksum_address(to),
                 'value': int(value_wei),
                 'data': data,
-                'chainId': self.w3.eth.chain_id
-            }
+                'chainId': client.chain_id
+            }, client)
             
-            signed = self.w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = self.send_raw_transaction_universal(signed)
+            tx_hash = self._sign_and_send(tx, private_key, client)
             
             return {
                 'address': from_address,
@@ -562,68 +895,269 @@ class MultiAccountFromPK:
             raise Exception(f"Line {line_number} ({from_address}): {str(e)}")
 
     def send_transaction_batch(
-        self, accounts, hex_data, gas_limit=2_000_000, max_workers=5, wait_for_receipt=False
+        self, accounts, hex_data, gas_limit=2_000_000, max_workers=5, wait_for_receipt=False, network=None,
+        simulate=False
     ):
         """Kirim transaksi paralel dari banyak akun - UPDATED with Universal Compatibility."""
+        network = self.client(network).name  # dikunci di awal batch
         results = []
-        delay_min, delay_max = 0.2, 0.8
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            for account in accounts:
-                fn = (
-                    self._send_single_transaction_with_receipt
-                    if wait_for_receipt
-                    else self._send_single_transaction
-                )
-
-                future = executor.submit(
-                    fn,
-                    account["private_key"],
-                    account["address"],
-                    hex_data,
-                    gas_limit,
-                    account["line_number"],
-                )
-                futures.append(future)
-                time.sleep(random.uniform(delay_min, delay_max))
+        if simulate:
+            accounts, results = self._simulation_gate(
+                accounts,
+                lambda acc: {"from": acc["address"], "to": None, "data": hex_data, "value": 0, "gas": gas_limit},
+                network,
+            )
+        # Alamat kontrak dihitung lokal saat kirim, jadi receipt tidak perlu
+        # ditunggu per thread: semua dikonfirmasi sekaligus setelah batch terkirim.
+        controller = self._concurrency_controller(self.client(network), max_workers)
+        self.await_fee_window(network, controller)
+        work = lambda acc: self._send_single_transaction(
+            acc["private_key"], acc["address"], hex_data, gas_limit, acc["line_number"], network
+        )
+        for _, result, error in self._stream_batch(controller, accounts, work):
+            if error is not None:
+                print(f"❌ Error: {error}")
+                results.append({"error": str(error)})
+                continue
+            results.append(result)
+            if wait_for_receipt:
+                print(f"📤 Sent: {result['address']} - TX: {result['tx_hash'][:10]}...")
+            elif result.get("status") in ("success", "sent"):
+                print(f"✅ Success: {result['address']} - TX: {result['tx_hash'][:10]}...")
+            else:
+                print(f"ℹ️ {result}")
+        controller.log_settled(network)
 
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    results.append(result)
-                    if result.get("status") in ("success", "sent"):
-                        print(f"✅ Success: {result['address']} - TX: {result['tx_hash'][:10]}...")
-                    else:
-                        print(f"ℹ️ {result}")
-                except Exception as e:
-                    print(f"❌ Error: {e}")
-                    results.append({"error": str(e)})
+        if wait_for_receipt:
+            results = self.confirm_receipts(results, network)
         return results
 
-    def _base_tx(self, from_address, gas_limit, hex_data):
+    def confirm_receipts(self, results, network=None, timeout=120):
+        """
+        Konfirmasi receipt semua hasil 'sent' dengan batch polling.
+        Hasil sukses jadi status 'success' + gas_used; yang gagal/timeout jadi entri error
+        (format sama dengan mode tunggu-receipt per TX).
+        """
+        network = self.client(network).name
+        sent = [r for r in results if r.get("status") == "sent" and r.get("tx_hash")]
+        if not sent:
+            return results
+
+        print(f"⏳ Waiting receipts for {len(sent)} transactions...")
+        receipts = self.wait_for_receipts(network, [r["tx_hash"] for r in sent], timeout=timeout)
+
+        confirmed = []
+        for r in results:
+            if r.get("status") != "sent" or not r.get("tx_hash"):
+                confirmed.append(r)
+                continue
+            prefix = f"Line {r['line_number']} ({r['address']})"
+            receipt = receipts.get(self._normalize_hash(r["tx_hash"]))
+            if receipt is None:
+                error = f"{prefix}: Receipt timeout after {timeout}s (TX {r['tx_hash']})"
+            else:
+                gas_used = int(receipt.get("gasUsed", "0x0"), 16)
+                if int(receipt.get("status", "0x0"), 16) == 1:
+                    confirmed.append({**r, "status": "success", "gas_used": gas_used})
+                    print(f"✅ Success: {r['address']} - TX: {r['tx_hash'][:10]}...")
+                    continue
+                error = f"{prefix}: Contract creation FAILED - Transaction status: 0, Gas used: {gas_used}"
+            print(f"❌ Error: {error}")
+            confirmed.append({"error": error})
+        return confirmed
+
+    def _concurrency_controller(self, client, max_workers):
+        """
+        Controller concurrency untuk satu batch di `client`.
+        Mode adaptive (default): controller AIMD milik network, limit terakhir dipakai
+        lagi di batch berikutnya. Mode fixed: tepat `max_workers` seperti dulu.
+        """
+        cfg = self.concurrency_config
+        if not cfg.get('adaptive', True):
+            return AdaptiveConcurrency(initial=max_workers, minimum=max_workers, maximum=max_workers)
+        if client.concurrency is None:
+            client.concurrency = AdaptiveConcurrency(
+                initial=max_workers,
+                minimum=cfg.get('min', 1),
+                maximum=max(cfg.get('max', 16), max_workers),
+                target_latency=cfg.get('target_latency', 2.0),
+                max_error_rate=cfg.get('max_error_rate', 0.1),
+            )
+        return client.concurrency
+
+    def _stream_batch(self, controller, accounts, fn, spread=(0.2, 0.8)):
+        """
+        Executor streaming: akun diambil lazily dari iterable `accounts`, paling banyak
+        `controller.limit` task in-flight, dan hasil di-yield begitu selesai (submit masih jalan).
+        Tidak ada list futures: memory tetap datar berapapun jumlah akun.
+
+        `fn(account)` dijalankan di worker. Yield (account, result, error).
+        Tanpa adaptive, jeda acak lama (`spread` detik) dipertahankan untuk menyebar request.
+        """
+        done = queue.Queue()
+
+        def run(account):
+            try:
+                done.put((account, controller.track(fn, account), None))
+            except Exception as e:
+                done.put((account, None, e))
+
+        it = iter(accounts)
+        account = next(it, None)
+        pending = 0
+        with ThreadPoolExecutor(max_workers=controller.maximum) as executor:
+            while account is not None or pending:
+                if account is not None and not pending:
+                    # Belum ada hasil yang ditunggu (slot bisa dipakai batch lain): blok di controller
+                    controller.acquire()
+                    acquired = True
+                else:
+                    acquired = account is not None and controller.try_acquire()
+
+                if acquired:
+                    executor.submit(run, account)
+                    pending += 1
+                    account = next(it, None)
+                    if not controller.adaptive:
+                        time.sleep(random.uniform(*spread))
+                else:
+                    # Window penuh (backpressure): akun berikutnya baru diambil setelah satu task selesai
+                    pending -= 1
+                    yield done.get()
+
+                while pending:
+                    try:
+                        item = done.get_nowait()
+                    except queue.Empty:
+                        break
+                    pending -= 1
+                    yield item
+
+    def await_fee_window(self, network=None, controller=None):
+        """
+        Mode fee schedule: tunggu blok dengan fee di bawah ceiling (atau deadline),
+        lalu buang cache gas price & naikkan concurrency ke maksimum untuk burst.
+        Return info window, atau None kalau fee schedule tidak aktif untuk network ini.
+        """
+        client = self.client(network)
+        window = FeeWindow.from_config(self, self.fee_schedule, client.name)
+        if window is None:
+            return None
+        if client.name in self._fee_granted():
+            # Sudah di dalam fee_window entry point luar: jangan tunggu lagi (deadline tidak dimulai ulang)
+            if controller is not None and controller.adaptive:
+                controller.burst()
+            return None
+        info = window.wait(client)
+        client.fees.invalidate()
+        if controller is not None and controller.adaptive:
+            controller.burst()
+        return info
+
+    @contextmanager
+    def fee_window(self, network=None, controller=None):
+        """
+        Gate fee schedule sekali untuk alur berlapis (mis. deploy helper lalu batch):
+        await_fee_window di dalam blok ini (thread yang sama) langsung lolos.
+        """
+        network = self.client(network).name
+        info = self.await_fee_window(network, controller)
+        granted = self._fee_granted()
+        outer = network not in granted
+        granted.add(network)
+        try:
+            yield info
+        finally:
+            if outer:
+                granted.discard(network)
+
+    def _fee_granted(self):
+        if not hasattr(self._fee_grants, 'networks'):
+            self._fee_grants.networks = set()
+        return self._fee_grants.networks
+
+    def _base_tx(self, from_address, gas_limit, hex_data, client):
         """Bangun dict transaksi dengan field penting & data tervalidasi."""
-        return {
+        tx = {
             "from": from_address,
-            "nonce": self.w3.eth.get_transaction_count(from_address),
-            "gasPrice": self.w3.eth.gas_price,
+            "gasPrice": self.retry_policy.call(client.fees.gas_price),
             "gas": gas_limit,
             "to": None,  # contract creation
             "value": 0,  # penting: 0 ETH
             "data": self._as_tx_data(hex_data),
-            "chainId": self.w3.eth.chain_id,  # penting untuk EIP-155
+            "chainId": client.chain_id,  # penting untuk EIP-155
         }
+        return self._with_nonce(tx, client)
 
-    def _send_single_transaction(self, private_key, from_address, hex_data, gas_limit, line_number):
+    def _with_nonce(self, tx, client):
+        """
+        Alokasikan nonce paling akhir, setelah semua field lain berhasil dibangun:
+        kalau gas price / data gagal, nonce belum terpakai dan tidak ada gap.
+        """
+        tx["nonce"] = self.retry_policy.call(client.nonces.next, tx["from"])
+        return tx
+
+    @staticmethod
+    def _invalidate_sent(client, tx):
+        """State pengirim & penerima TX tidak lagi valid di cache."""
+        client.state.invalidate_address(tx["from"])
+        if tx.get("to"):
+            client.state.invalidate_address(tx["to"])
+
+    def _sign_and_send(self, tx, private_key, client):
+        """
+        Sign & broadcast `tx` dengan retry sesuai kelas error (lihat RetryPolicy):
+        transient → kirim ulang TX yang sama, nonce → resync & sign ulang,
+        fee → gas price dinaikkan & sign ulang, fatal → langsung raise.
+        `tx` di-update in-place (nonce/gasPrice final). Nonce lokal di-resync kalau tetap gagal.
+        """
+        policy = self.retry_policy
+        policy.record_send()
+        attempts = {}
+        try:
+            signed_txn = client.w3.eth.account.sign_transaction(tx, private_key)
+        except Exception:
+            client.nonces.resync(tx["from"])  # nonce sudah dialokasikan tapi TX tidak pernah terkirim
+            raise
+        while True:
+            try:
+                tx_hash = self.send_raw_transaction_universal(signed_txn, client.name)
+                self._invalidate_sent(client, tx)
+                return tx_hash
+            except Exception as e:
+                if policy.is_already_known(e):
+                    # Broadcast sebelumnya (mis. yang timeout) ternyata sudah masuk mempool
+                    self._invalidate_sent(client, tx)
+                    return HexBytes(keccak(self.get_raw_transaction_data(signed_txn)))
+                kind = policy.classify(e)
+                attempts[kind] = attempts.get(kind, 0) + 1
+                delay = policy.next_delay(kind, attempts[kind])
+                if delay is None:
+                    client.nonces.resync(tx["from"])
+                    raise
+                print(f"🔁 {tx['from'][:10]}… {kind} error, retry {attempts[kind]} in {delay:.1f}s: {e}")
+                time.sleep(delay)
+
+            if kind == RetryPolicy.NONCE:
+                client.nonces.resync(tx["from"])
+                tx["nonce"] = policy.call(client.nonces.next, tx["from"])
+            elif kind == RetryPolicy.FEE:
+                client.fees.invalidate()
+                tx["gasPrice"] = policy.bump_gas_price(tx["gasPrice"], policy.call(client.fees.gas_price))
+            if kind != RetryPolicy.TRANSIENT:
+                signed_txn = client.w3.eth.account.sign_transaction(tx, private_key)
+
+    def _send_single_transaction(self, private_key, from_address, hex_data, gas_limit, line_number, network=None):
         """Kirim transaksi TANPA menunggu receipt (mode 'sent') - UPDATED with Universal Compatibility."""
+        client = self.client(network)
         try:
-            tx = self._base_tx(from_address, gas_limit, hex_data)
-            signed_txn = self.w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = self.send_raw_transaction_universal(signed_txn)
+            tx = self._base_tx(from_address, gas_limit, hex_data, client)
+            tx_hash = self._sign_and_send(tx, private_key, client)
             
             return {
                 "address": from_address,
                 "tx_hash": tx_hash.hex(),
+                "contract_address": self.compute_create_address(from_address, tx["nonce"]),
                 "line_number": line_number,
                 "status": "sent",
             }
@@ -631,15 +1165,15 @@ class MultiAccountFromPK:
             raise Exception(f"Line {line_number} ({from_address}): {str(e)}")
 
     def _send_single_transaction_with_receipt(
-        self, private_key, from_address, hex_data, gas_limit, line_number
+        self, private_key, from_address, hex_data, gas_limit, line_number, network=None
     ):
         """Kirim transaksi & TUNGGU receipt (cek status on-chain) - UPDATED with Universal Compatibility."""
+        client = self.client(network)
         try:
-            tx = self._base_tx(from_address, gas_limit, hex_data)
-            signed_txn = self.w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = self.send_raw_transaction_universal(signed_txn)
+            tx = self._base_tx(from_address, gas_limit, hex_data, client)
+            tx_hash = self._sign_and_send(tx, private_key, client)
             
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            receipt = self.wait_for_receipt(client.name, tx_hash, timeout=120)
 
             if receipt.status == 1:
                 return {
@@ -657,6 +1191,12 @@ class MultiAccountFromPK:
         except Exception as e:
             raise Exception(f"Line {line_number} ({from_address}): {str(e)}")
 
+    @staticmethod
+    def compute_create_address(sender, nonce):
+        """Alamat kontrak hasil CREATE: keccak256(rlp([sender, nonce]))[12:]."""
+        sender_bytes = bytes.fromhex(sender[2:] if sender.startswith("0x") else sender)
+        return Web3.to_checksum_address(keccak(rlp.encode([sender_bytes, int(nonce)]))[12:])
+
     def _as_tx_data(self, hexstr: str) -> HexBytes:
         """Validate & convert hex string ke HexBytes untuk tx.data."""
         if not isinstance(hexstr, str):
@@ -671,31 +1211,668 @@ class MultiAccountFromPK:
             s = "0" + s
         return HexBytes("0x" + s)
 
+    # =========================
+    # Pre-send simulation (eth_call)
+    # =========================
+
+    @staticmethod
+    def decode_revert_reason(data):
+        """Decode revert data: Error(string), Panic(uint256) atau hex mentah."""
+        if not data:
+            return "reverted without reason"
+        h = data[2:] if data.startswith("0x") else data
+        try:
+            if h.startswith(ERROR_STRING_SELECTOR):
+                payload = bytes.fromhex(h[8:])
+                length = int.from_bytes(payload[32:64], 'big')
+                return payload[64:64 + length].decode('utf-8', errors='replace')
+            if h.startswith(PANIC_SELECTOR):
+                return f"Panic(0x{int(h[8:72], 16):02x})"
+        except ValueError:
+            pass
+        return "0x" + h
+
+    def simulate_calls(self, calls, network=None):
+        """
+        Dry-run banyak TX dengan eth_call terhadap blok 'pending' dalam batch JSON-RPC.
+
+        Args:
+            calls: List dict call {from, to (None = create), data (hex string atau bytes), value, gas}
+
+        Returns:
+            List None (lolos) atau string revert reason, sesuai urutan `calls`.
+        """
+        return self._simulate_objects([self._eth_call_object(call) for call in calls], network)
+
+    def _eth_call_object(self, call):
+        """Dict call -> object eth_call JSON-RPC (data bytes/hex dinormalisasi, angka jadi hex)."""
+        data = call.get("data") or "0x"
+        if not isinstance(data, (bytes, bytearray)):
+            data = self._as_tx_data(data)
+        obj = {
+            "from": Web3.to_checksum_address(call["from"]),
+            "data": Web3.to_hex(data),
+            "value": hex(int(call.get("value", 0))),
+        }
+        if call.get("to"):
+            obj["to"] = Web3.to_checksum_address(call["to"])
+        if call.get("gas"):
+            obj["gas"] = hex(int(call["gas"]))
+        return obj
+
+    def _simulate_objects(self, objects, network=None):
+        """Batch eth_call untuk object yang sudah dinormalisasi (lihat `simulate_calls`)."""
+        client = self.client(network)
+        batch = [("eth_call", [obj, "pending"]) for obj in objects]
+        outcomes = []
+        for result in self._rpc_batch(client.rpc_url, batch):
+            if isinstance(result, dict) and "error" in result:
+                error = result["error"]
+                data = error.get("data")
+                if isinstance(data, dict):  # beberapa node membungkus data revert
+                    data = data.get("data")
+                if isinstance(data, str) and data.startswith("0x") and len(data) > 2:
+                    outcomes.append(self.decode_revert_reason(data))
+                else:
+                    outcomes.append(error.get("message", "execution reverted"))
+            else:
+                outcomes.append(None)
+        return outcomes
+
+    def _simulation_gate(self, accounts, build_call, network):
+        """
+        Saring akun yang TX-nya akan revert sebelum apa pun di-sign/broadcast.
+
+        Args:
+            build_call: Fungsi account -> dict call untuk `simulate_calls`
+
+        Returns:
+            (akun yang lolos, list hasil error untuk akun yang ditolak)
+        """
+        # Call yang gagal dibangun di sisi client (data/alamat invalid) juga pasti gagal dikirim:
+        # akun itu ditolak, bukan simulasinya yang di-skip
+        objects, simulated, rejected = [], [], []
+        for acc in accounts:
+            try:
+                objects.append(self._eth_call_object(build_call(acc)))
+                simulated.append(acc)
+            except Exception as e:
+                print(f"🚫 Simulation build error: {acc['address']} — {e}")
+                rejected.append({
+                    "address": acc["address"],
+                    "line_number": acc["line_number"],
+                    "status": "simulation_failed",
+                    "error": f"Line {acc['line_number']} ({acc['address']}): Invalid call: {e}",
+                })
+        try:
+            outcomes = self._simulate_objects(objects, network)
+        except Exception as e:
+            # Hanya kegagalan RPC (tidak bisa dihubungi / batch ditolak) yang melewati simulasi
+            print(f"⚠️ Simulation skipped (RPC: {e})")
+            return simulated, rejected
+
+        passed = []
+        for acc, reason in zip(simulated, outcomes):
+            if reason is None:
+                passed.append(acc)
+                continue
+            print(f"🚫 Simulation revert: {acc['address']} — {reason}")
+            rejected.append({
+                "address": acc["address"],
+                "line_number": acc["line_number"],
+                "status": "simulation_failed",
+                "revert_reason": reason,
+                "error": f"Line {acc['line_number']} ({acc['address']}): Simulation reverted: {reason}",
+            })
+        print(f"🧪 Simulation: {len(passed)} passed, {len(rejected)} would revert")
+        return passed, rejected
+
+    # =================
+    # Disperse & Sweep
+    # =================
+
+    def get_disperse_init_code(self):
+        """
+        Init code kontrak batch-transfer minimal (ditulis langsung dalam opcode).
+
+        Calldata = deretan word 32-byte: (value_wei << 160) | recipient.
+        Untuk setiap word kontrak melakukan CALL(recipient, value); kalau ada yang
+        gagal seluruh TX revert. Sisa msg.value dikembalikan ke pengirim.
+        """
+        return (
+            "0x604a80600b6000396000f3"  # constructor: return runtime 74 byte
+            "60005b803611156039578035600080808084"  # loop: word = calldata[i]
+            "60a01c8573ffffffffffffffffffffffffffffffffffffffff165af11560455750602001600256"  # call(to, value)
+            "5b600080808047335af150005b600080fd"  # refund sisa ke caller / revert
+        )
+
+    def encode_disperse_payload(self, transfers):
+        """Encode [(address, value_wei), ...] ke calldata kontrak disperse."""
+        words = []
+        for address, value_wei in transfers:
+            if not 0 < int(value_wei) < 2 ** 96:
+                raise ValueError(f"Invalid disperse amount for {address}: {value_wei}")
+            words.append(f"{(int(value_wei) << 160) | int(address, 16):064x}")
+        return "0x" + "".join(words)
+
+    def ensure_disperse_contract(self, funder, network=None, registry_file="disperse_contracts.json"):
+        """
+        Alamat kontrak disperse di network ini. Deploy sekali oleh `funder`
+        lalu disimpan di `registry_file` (per chain_id) untuk dipakai ulang.
+        """
+        return self._ensure_helper_contract(
+            "disperse", self.get_disperse_init_code(), 200_000, funder, network, registry_file
+        )
+
+    def _ensure_helper_contract(self, label, init_code, gas_limit, funder, network, registry_file):
+        """Deploy kontrak helper sekali per chain_id, alamatnya disimpan di `registry_file`."""
+        client = self.client(network)
+        chain_key = str(client.chain_id)
+
+        try:
+            with open(registry_file, "r") as f:
+                registry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            registry = {}
+
+        known = registry.get(chain_key)
+        if known and client.state.get_code(known):
+            return Web3.to_checksum_address(known)
+
+        print(f"📦 Deploying {label} contract on {client.name}...")
+        result = self._send_single_transaction_with_receipt(
+            funder['private_key'], funder['address'], init_code,
+            gas_limit, funder.get('line_number'), client.name
+        )
+        address = result['contract_address']
+        registry[chain_key] = address
+        with open(registry_file, "w") as f:
+            json.dump(registry, f, indent=2)
+        print(f"✅ {label.capitalize()} contract: {address}")
+        return address
+
+    # =========================
+    # Bundler (Owlto + ERC20 + GMON dalam satu TX)
+    # =========================
+
+    def get_bundler_init_code(self):
+        """
+        Init code kontrak bundler all-in (ditulis langsung dalam opcode).
+
+        Calldata (lihat `encode_bundle_payload`): 4 word header
+        [len owlto][len erc20][target call][len call data] lalu ketiga payload berurutan.
+        Kontrak melakukan CREATE Owlto, CREATE ERC20, lalu CALL target dengan msg.value;
+        kalau salah satu gagal seluruh TX revert (revert data diteruskan). Sukses →
+        event Bundled(address indexed account, address owlto, address erc20).
+        """
+        return (
+            "0x608380600b6000396000f3"  # constructor: return runtime 131 byte
+            "6000358060806000378060006000f08015607857"  # owlto = create(calldata[0x80:+len1])
+            "60203580836080016000378060006000f08015607857"  # erc20 = create(calldata setelahnya)
+            "6060358083860160800160003760006000826000346040355af115607857"  # call(target, msg.value, data)
+            "5060205250600052337f931f932a94430d5ca7fcf31031d6e1ff16df5139fa6763e8a4ba8f8185e617ec"
+            "60406000a200"  # log Bundled(caller, owlto, erc20)
+            "5b3d600060003e3d6000fd"  # revert dengan returndata
+        )
+
+    def ensure_bundler_contract(self, funder, network=None, registry_file="bundler_contracts.json"):
+        """Alamat kontrak bundler di network ini (deploy sekali oleh `funder`, disimpan di registry)."""
+        return self._ensure_helper_contract(
+            "bundler", self.get_bundler_init_code(), 200_000, funder, network, registry_file
+        )
+
+    def encode_bundle_payload(self, owlto_init, erc20_init, target, call_data):
+        """Calldata bundler: header 4 word + init code Owlto + init code ERC20 + call data GMON."""
+        parts = [bytes.fromhex(h[2:] if h.startswith("0x") else h) for h in (owlto_init, erc20_init, call_data)]
+        header = b"".join(n.to_bytes(32, "big") for n in (len(parts[0]), len(parts[1]), int(target, 16), len(parts[2])))
+        return "0x" + (header + b"".join(parts)).hex()
+
+    @staticmethod
+    def parse_bundled_logs(receipt):
+        """Event Bundled di receipt → {account: (owlto_address, erc20_address)}."""
+        out = {}
+        for log in receipt.get("logs", []):
+            topics = log.get("topics", [])
+            if len(topics) == 2 and topics[0].lower() == BUNDLED_TOPIC:
+                data = log["data"][2:]
+                out[Web3.to_checksum_address("0x" + topics[1][-40:])] = (
+                    Web3.to_checksum_address("0x" + data[24:64]),
+                    Web3.to_checksum_address("0x" + data[88:128]),
+                )
+        return out
+
+    def bundle_all_in(self, accounts, bundler, name="cuandrop", symbol="cndrp", gas_limit=None, max_workers=5,
+                      network=None, timeout=120):
+        """
+        Owlto + ERC20 + GMON per akun dalam SATU TX ke kontrak bundler (atomic).
+
+        Payload sama untuk semua akun, jadi cukup satu send_call_batch lalu satu
+        batch polling receipt. Catatan: deployer / caller on-chain ketiga aksi
+        adalah kontrak bundler, bukan akun (akun = tx.origin).
+
+        Returns:
+            List dict per akun seperti Try All In: owlto_sc, erc20, gmon, status.
+        """
+        client = self.client(network)
+        factory, selector, gmon_value = self.get_gmonchain_call_params()
+        data = self.encode_bundle_payload(
+            self.get_owlto_hex_data(), self.get_owlto_erc20_hex_data(name, symbol), factory, selector
+        )
+        accounts = list(accounts)
+        if not accounts:
+            return []
+        if gas_limit is None:
+            try:
+                estimate = client.w3.eth.estimate_gas({
+                    "from": accounts[0]["address"], "to": bundler, "value": gmon_value, "data": data,
+                })
+                gas_limit = int(estimate * 1.2)
+            except Exception as e:
+                print(f"⚠️ Estimate gas bundle gagal ({e}) → pakai 4,000,000")
+                gas_limit = 4_000_000
+
+        print(f"📦 Bundling Owlto + ERC20 + GMON via {bundler} (gas {gas_limit:,})...")
+        sent = self.send_call_batch(accounts, bundler, data, gmon_value, gas_limit, max_workers, client.name)
+        hashes = [r["tx_hash"] for r in sent if "tx_hash" in r]
+        receipts = self.wait_for_receipts(client.name, hashes, timeout=timeout) if hashes else {}
+
+        results = []
+        for r in sent:
+            if "tx_hash" not in r:
+                results.append({**r, "status": "error"})
+                continue
+            entry = {"address": r["address"], "line_number": r.get("line_number"), "tx_hash": r["tx_hash"]}
+            receipt = receipts.get(self._normalize_hash(r["tx_hash"]))
+            if receipt is None:
+                step = {"tx_hash": r["tx_hash"], "status": "sent"}
+                entry.update({"owlto_sc": dict(step), "erc20": dict(step), "gmon": dict(step), "status": "sent"})
+            elif int(receipt.get("status", "0x0"), 16) != 1:
+                entry.update({
+                    "status": "failed",
+                    "gas_used": int(receipt.get("gasUsed", "0x0"), 16),
+                    "error": f"Bundle reverted - Gas used: {int(receipt.get('gasUsed', '0x0'), 16)}",
+                })
+            else:
+                owlto, erc20 = self.parse_bundled_logs(receipt).get(Web3.to_checksum_address(r["address"]), (None, None))
+                step = {"tx_hash": r["tx_hash"], "status": "success"}
+                entry.update({
+                    "owlto_sc": {**step, "contract_address": owlto},
+                    "erc20": {**step, "contract_address": erc20},
+                    "gmon": dict(step),
+                    "gas_used": int(receipt.get("gasUsed", "0x0"), 16),
+                    "status": "success",
+                })
+            results.append(entry)
+        return results
+
+    def plan_disperse(self, balances, network, min_eth, target_eth):
+        """
+        Dari data `check_bridge_balances`: akun dengan balance < `min_eth`
+        di-top-up sampai `target_eth`. Return list (address, amount_wei).
+        """
+        min_wei = Web3.to_wei(min_eth, 'ether')
+        target_wei = Web3.to_wei(target_eth, 'ether')
+        return [
+            (b['address'], target_wei - b[network])
+            for b in balances
+            if b[network] < min_wei and target_wei > b[network]
+        ]
+
+    def disperse_funds(self, funder, transfers, network=None, chunk_size=100, wait_for_receipt=True):
+        """
+        Kirim dana ke banyak akun: satu TX per chunk lewat kontrak disperse.
+
+        Args:
+            funder: Account dict pengirim (treasury)
+            transfers: List (address, amount_wei), mis. dari `plan_disperse`
+            chunk_size: Jumlah penerima per TX
+        """
+        client = self.client(network)
+        if not transfers:
+            print("✅ Tidak ada akun yang perlu di-top-up")
+            return []
+
+        self.await_fee_window(client.name)
+        contract = self.ensure_disperse_contract(funder, client.name)
+        chunks = [transfers[i:i + chunk_size] for i in range(0, len(transfers), chunk_size)]
+        total_wei = sum(amount for _, amount in transfers)
+        print(f"💸 Dispersing {Web3.from_wei(total_wei, 'ether')} ETH to {len(transfers)} accounts "
+              f"in {len(chunks)} TX on {client.name}...")
+
+        results = []
+        for i, chunk in enumerate(chunks, 1):
+            data = self.encode_disperse_payload(chunk)
+            value = sum(amount for _, amount in chunk)
+            call = {'from': funder['address'], 'to': contract, 'value': value, 'data': data}
+            try:
+                # Transfer ke akun baru ±34k gas; estimate dulu, fallback ke perkiraan kasar
+                try:
+                    gas_limit = int(client.w3.eth.estimate_gas(call) * 1.2)
+                except Exception:
+                    gas_limit = 50_000 + 40_000 * len(chunk)
+                tx = self._with_nonce({
+                    **call,
+                    'gasPrice': self.retry_policy.call(client.fees.gas_price),
+                    'gas': gas_limit,
+                    'data': self._as_tx_data(data),
+                    'chainId': client.chain_id,
+                }, client)
+                tx_hash = self._sign_and_send(tx, funder['private_key'], client)
+                for address, _ in chunk:
+                    client.state.invalidate_address(address)
+                results.append({
+                    'chunk': i,
+                    'recipients': [address for address, _ in chunk],
+                    'value_wei': value,
+                    'tx_hash': self._normalize_hash(tx_hash),
+                    'status': 'sent',
+                })
+                print(f"📤 Chunk {i}/{len(chunks)}: {len(chunk)} recipients - TX: {self._normalize_hash(tx_hash)[:10]}...")
+            except Exception as e:
+                print(f"❌ Chunk {i}/{len(chunks)} error: {e}")
+                results.append({'chunk': i, 'recipients': [a for a, _ in chunk], 'error': str(e)})
+
+        if wait_for_receipt:
+            sent = {r['tx_hash']: r for r in results if 'tx_hash' in r}
+            receipts = self.wait_for_receipts(client.name, list(sent), timeout=180)
+            for tx_hash, r in sent.items():
+                receipt = receipts.get(tx_hash)
+                if receipt is None:
+                    continue
+                r['status'] = 'success' if int(receipt.get('status', '0x0'), 16) == 1 else 'failed'
+                if r['status'] == 'failed':
+                    r['error'] = "Disperse TX reverted"
+        return results
+
+    def plan_sweep(self, balances, network, threshold_eth, keep_eth="0", gas_limit=21_000):
+        """
+        Dari data `check_bridge_balances`: akun dengan balance > `threshold_eth`
+        menyapu sisa (balance - keep - biaya gas) ke treasury. Return list (address, amount_wei).
+        """
+        client = self.client(network)
+        threshold_wei = Web3.to_wei(threshold_eth, 'ether')
+        keep_wei = Web3.to_wei(keep_eth, 'ether')
+        # Buffer 2x gas price supaya tidak gagal kalau fee naik sedikit
+        fee_wei = gas_limit * client.fees.gas_price() * 2
+        plan = []
+        for b in balances:
+            amount = b[network] - keep_wei - fee_wei
+            if b[network] > threshold_wei and amount > 0:
+                plan.append((b['address'], amount))
+        return plan
+
+    def sweep_funds(self, accounts, transfers, treasury_address, network=None, max_workers=5, simulate=False):
+        """
+        Konsolidasi balance ke treasury: satu transfer per akun, dikirim paralel
+        lewat executor streaming yang sama dengan batch lain (controller + fee window).
+        """
+        network = self.client(network).name
+        by_address = {acc['address']: acc for acc in accounts}
+        treasury = Web3.to_checksum_address(treasury_address)
+        print(f"🧹 Sweeping {len(transfers)} accounts → {treasury} on {network}...")
+
+        # Akun + jumlah sweep, dibangun lazily saat executor mengambil akun berikutnya
+        items = (
+            {**by_address[address], 'sweep_wei': amount}
+            for address, amount in transfers
+            if address in by_address and address != treasury
+        )
+        results = []
+        if simulate:
+            items, results = self._simulation_gate(
+                items,
+                lambda acc: {"from": acc["address"], "to": treasury, "value": acc["sweep_wei"], "gas": 21_000},
+                network,
+            )
+        controller = self._concurrency_controller(self.client(network), max_workers)
+        self.await_fee_window(network, controller)
+        work = lambda acc: self._send_single_call(
+            acc['private_key'], acc['address'], treasury, "0x", acc['sweep_wei'], 21_000, acc['line_number'], network
+        )
+        for _, result, error in self._stream_batch(controller, items, work):
+            if error is not None:
+                print(f"❌ Sweep Error: {error}")
+                results.append({"error": str(error)})
+                continue
+            results.append(result)
+            print(f"✅ Swept: {result['address']} - TX: {result['tx_hash'][:10]}...")
+        controller.log_settled(network)
+        return results
+
+    # =========================
+    # Deployment verification (eth_getCode)
+    # =========================
+
+    def expected_runtime_hashes(self):
+        """keccak runtime code yang seharusnya ada di alamat kontrak Owlto & ERC20."""
+        expected = {}
+        for kind, init_code, (offset, length) in (
+            ("owlto", self.get_owlto_hex_data(), OWLTO_RUNTIME_SLICE),
+            ("erc20", self.get_owlto_erc20_bytecode(), ERC20_RUNTIME_SLICE),
+        ):
+            runtime = bytes.fromhex(init_code[2:])[offset:offset + length]
+            expected[kind] = "0x" + keccak(runtime).hex()
+        return expected
+
+    def verify_deployments(self, deployments, network=None, chunk_size=100):
+        """
+        Cek apakah runtime code yang benar benar-benar ada di setiap alamat kontrak.
+
+        Alamat diambil dari `contract_address`; kalau tidak ada, nonce TX dibaca
+        (batch eth_getTransactionByHash) lalu alamat CREATE dihitung lokal. Code semua
+        alamat diambil dengan batch eth_getCode dan keccak-nya dibandingkan dengan hash
+        runtime Owlto / ERC20.
+
+        Args:
+            deployments: List dict dengan address, tx_hash / contract_address, line_number,
+                         dan opsional kind ('owlto' / 'erc20'; tanpa kind → cocokkan ke semua)
+
+        Returns:
+            List dict per deployment dengan status verified / missing / mismatch / unknown.
+        """
+        client = self.client(network)
+        expected = self.expected_runtime_hashes()
+        entries = [{**d, "contract_address": d.get("contract_address")} for d in deployments]
+
+        need_nonce = [e for e in entries if not e["contract_address"] and e.get("tx_hash")]
+        if need_nonce:
+            txs = self._rpc_batch(
+                client.rpc_url, [("eth_getTransactionByHash", [e["tx_hash"]]) for e in need_nonce], chunk_size
+            )
+            for e, tx in zip(need_nonce, txs):
+                if isinstance(tx, dict) and "nonce" in tx and not tx.get("to"):
+                    e["contract_address"] = self.compute_create_address(tx["from"], int(tx["nonce"], 16))
+
+        with_address = [e for e in entries if e["contract_address"]]
+        codes = self._rpc_batch(
+            client.rpc_url, [("eth_getCode", [e["contract_address"], "latest"]) for e in with_address], chunk_size
+        )
+        code_of = {id(e): code for e, code in zip(with_address, codes)}
+
+        results = []
+        for e in entries:
+            code = code_of.get(id(e))
+            result = {
+                "address": e.get("address"),
+                "line_number": e.get("line_number"),
+                "kind": e.get("kind"),
+                "tx_hash": e.get("tx_hash"),
+                "contract_address": e["contract_address"],
+            }
+            if not e["contract_address"]:
+                result.update({"status": "unknown", "error": "TX tidak ditemukan / bukan TX deploy"})
+            elif not isinstance(code, str):
+                result.update({"status": "unknown", "error": f"eth_getCode gagal: {code}"})
+            elif code in ("0x", "0x0", ""):
+                result.update({"status": "missing", "error": "Tidak ada code di alamat kontrak"})
+            else:
+                code_hash = "0x" + keccak(hexstr=code).hex()
+                wanted = [e["kind"]] if e.get("kind") in expected else list(expected)
+                match = next((k for k in wanted if expected[k] == code_hash), None)
+                result["code_hash"] = code_hash
+                if match:
+                    result.update({"status": "verified", "kind": match})
+                else:
+                    result.update({"status": "mismatch", "error": f"Code hash {code_hash[:12]}… tidak cocok"})
+            results.append(result)
+        return results
+
+    # =========================
+    # Nonce gap repair
+    # =========================
+
+    def scan_nonce_gaps(self, accounts, network=None):
+        """
+        Baca nonce 'latest' & 'pending' semua akun dalam batch JSON-RPC.
+
+        - stuck: nonce latest..pending-1 (TX di mempool yang belum mined)
+        - holes: nonce pending..local-1, dialokasikan bot tapi tidak pernah sampai ke node
+          (TX berikutnya dari akun ini antre di belakangnya)
+
+        Returns:
+            List dict per akun yang bermasalah: address, line_number, latest, pending, local, stuck, holes.
+        """
+        client = self.client(network)
+        calls = []
+        for acc in accounts:
+            calls.append(("eth_getTransactionCount", [acc["address"], "latest"]))
+            calls.append(("eth_getTransactionCount", [acc["address"], "pending"]))
+        counts = self._rpc_batch(client.rpc_url, calls)
+
+        gaps = []
+        for i, acc in enumerate(accounts):
+            latest, pending = counts[2 * i], counts[2 * i + 1]
+            if not isinstance(latest, str) or not isinstance(pending, str):
+                print(f"⚠️ Gagal baca nonce {acc['address']}: {latest if not isinstance(latest, str) else pending}")
+                continue
+            latest, pending = int(latest, 16), int(pending, 16)
+            local = client.nonces.peek(acc["address"])
+            stuck = list(range(latest, pending))
+            holes = list(range(pending, local)) if local is not None else []
+            if stuck or holes:
+                gaps.append({
+                    "address": acc["address"],
+                    "line_number": acc.get("line_number"),
+                    "latest": latest,
+                    "pending": pending,
+                    "local": local,
+                    "stuck": stuck,
+                    "holes": holes,
+                })
+        return gaps
+
+    def _send_filler(self, private_key, address, nonce, gas_price, client, replace):
+        """
+        Self-transfer 0 ETH di `nonce`. `replace`=True: gas price dinaikkan sampai
+        menggantikan TX yang nyangkut. Return dict hasil (tx_hash atau note).
+        """
+        policy = self.retry_policy
+        tx = {
+            "from": address,
+            "to": address,
+            "value": 0,
+            "gas": 21_000,
+            "gasPrice": int(gas_price),
+            "nonce": nonce,
+            "chainId": client.chain_id,
+            "data": b"",
+        }
+        for attempt in range(1, policy.max_attempts[RetryPolicy.FEE] + 2):
+            signed_txn = client.w3.eth.account.sign_transaction(tx, private_key)
+            try:
+                tx_hash = self.send_raw_transaction_universal(signed_txn, client.name)
+                self._invalidate_sent(client, tx)
+                return {"nonce": nonce, "tx_hash": self._normalize_hash(tx_hash), "gas_price": tx["gasPrice"]}
+            except Exception as e:
+                kind = policy.classify(e)
+                if kind == RetryPolicy.NONCE or policy.is_already_known(e):
+                    # TX asli sudah mined / sudah ada di mempool → nonce ini tidak perlu diisi
+                    return {"nonce": nonce, "note": "already resolved"}
+                if kind == RetryPolicy.FEE and not replace:
+                    # Hole ternyata sudah terisi TX antrean kita sendiri
+                    return {"nonce": nonce, "note": "queued tx present"}
+                if kind == RetryPolicy.FATAL or attempt > policy.max_attempts.get(kind, 0):
+                    raise
+                if kind == RetryPolicy.FEE:
+                    tx["gasPrice"] = policy.bump_gas_price(tx["gasPrice"], tx["gasPrice"])
+                else:
+                    time.sleep(policy.next_delay(kind, attempt) or 1)
+        raise Exception(f"nonce {nonce}: gagal mengganti TX setelah {attempt} percobaan")
+
+    def repair_nonce_gaps(self, accounts, gaps, network=None, max_workers=5, replace_bump=1.25):
+        """
+        Isi hole & ganti TX nyangkut dengan self-transfer 0 ETH, paralel per akun
+        (nonce dalam satu akun dikirim berurutan). NonceManager akun diresync sesudahnya.
+
+        Returns:
+            List dict per akun: address, line_number, filled [...] atau error.
+        """
+        client = self.client(network)
+        by_address = {acc["address"]: acc for acc in accounts}
+        gas_price = int(self.retry_policy.call(client.fees.gas_price) * replace_bump)
+
+        def repair(gap):
+            acc = by_address[gap["address"]]
+            filled = []
+            try:
+                for nonce in gap["stuck"]:
+                    filled.append(self._send_filler(acc["private_key"], acc["address"], nonce, gas_price, client, True))
+                for nonce in gap["holes"]:
+                    filled.append(self._send_filler(acc["private_key"], acc["address"], nonce, gas_price, client, False))
+            finally:
+                client.nonces.resync(acc["address"])
+            return {"address": acc["address"], "line_number": acc.get("line_number"), "filled": filled}
+
+        results = []
+        controller = self._concurrency_controller(client, max_workers)
+        gaps = (gap for gap in gaps if gap["address"] in by_address)
+        for gap, result, error in self._stream_batch(controller, gaps, repair):
+            if error is not None:
+                print(f"❌ Repair Error {gap['address']}: {error}")
+                results.append({"address": gap["address"], "line_number": gap.get("line_number"),
+                                "error": f"Line {gap.get('line_number')} ({gap['address']}): {error}"})
+                continue
+            results.append(result)
+            sent = sum(1 for f in result["filled"] if "tx_hash" in f)
+            print(f"🩹 {result['address']}: {sent} filler TX, "
+                  f"{len(result['filled']) - sent} already resolved")
+        controller.log_settled(client.name)
+        return results
+
     # ===========
     # Utilities
     # ===========
     
-    def check_balances(self, accounts):
+    def check_balances(self, accounts, network=None):
+        client = self.client(network)
         print("\n💰 Checking balances...")
         for account in accounts:
             try:
-                bal_wei = self.w3.eth.get_balance(account["address"])
-                bal_eth = self.w3.from_wei(bal_wei, "ether")
+                bal_wei = client.state.get_balance(account["address"])
+                bal_eth = Web3.from_wei(bal_wei, "ether")
                 print(f"Line {account['line_number']}: {account['address']} - {bal_eth:.6f} ETH")
             except Exception as e:
                 print(f"❌ Error checking balance for line {account['line_number']}: {e}")
+        self.print_cache_stats(client)
+
+    def print_cache_stats(self, *clients):
+        for client in clients:
+            st = client.state.stats()
+            print(f"🗃️  Cache {client.name}: {st['hits']} hits / {st['misses']} misses "
+                  f"({st['hit_rate']:.0%}), {st['entries']} entries @ block {st['head']}")
 
     def save_results(self, results, filename="transaction_results.json"):
         with open(filename, "w") as f:
             json.dump(results, f, indent=2)
         print(f"💾 Results saved to {filename}")
 
-    def get_network_info(self):
+    def get_network_info(self, network=None):
         try:
-            chain_id = self.w3.eth.chain_id
-            block_number = self.w3.eth.block_number
-            gas_price = self.w3.eth.gas_price
-            gas_price_gwei = self.w3.from_wei(gas_price, "gwei")
+            client = self.client(network)
+            chain_id = client.chain_id
+            block_number = client.w3.eth.block_number
+            gas_price = client.w3.eth.gas_price
+            gas_price_gwei = Web3.from_wei(gas_price, "gwei")
 
             return {
                 "chain_id": chain_id,
@@ -707,20 +1884,26 @@ class MultiAccountFromPK:
             print(f"❌ Error getting network info: {e}")
             return None
 
-    def estimate_total_gas_cost(self, accounts_count, gas_limit, gas_price=None):
+    def estimate_total_gas_cost(self, accounts_count, gas_limit, gas_price=None, network=None, expected_gas=None):
+        """Worst case akun × gas_limit × gas price; `expected_gas` (gasUsed terukur, gas ledger) → estimasi realistis."""
         if gas_price is None:
-            gas_price = self.w3.eth.gas_price
+            gas_price = self.client(network).fees.gas_price()
 
         total_gas = accounts_count * gas_limit
         total_cost_wei = total_gas * gas_price
-        total_cost_eth = self.w3.from_wei(total_cost_wei, "ether")
+        total_cost_eth = Web3.from_wei(total_cost_wei, "ether")
 
         print("⛽ Gas Estimation:")
         print(f"  Accounts: {accounts_count}")
         print(f"  Gas Limit per TX: {gas_limit:,}")
-        print(f"  Gas Price: {self.w3.from_wei(gas_price, 'gwei'):.2f} Gwei")
+        print(f"  Gas Price: {Web3.from_wei(gas_price, 'gwei'):.2f} Gwei")
         print(f"  Total Gas: {total_gas:,}")
         print(f"  Total Cost: {total_cost_eth:.6f} ETH")
+        expected_cost_wei = None
+        if expected_gas:
+            expected_cost_wei = accounts_count * expected_gas * gas_price
+            print(f"  Expected (measured {expected_gas:,} gas/TX): "
+                  f"{Web3.from_wei(expected_cost_wei, 'ether'):.6f} ETH")
 
         return {
             "accounts_count": accounts_count,
@@ -729,9 +1912,646 @@ class MultiAccountFromPK:
             "total_gas": total_gas,
             "total_cost_wei": total_cost_wei,
             "total_cost_eth": float(total_cost_eth),
+            "expected_cost_wei": expected_cost_wei,
+        }
+
+
+class DepositCalldata:
+    """
+    Template calldata OptimismPortal.depositTransaction(address,uint256,uint64,bool,bytes)
+    untuk satu amount. Dibangun sekali sebagai bytearray; per akun hanya word
+    recipient yang di-patch (tanpa string hex per akun).
+    """
+
+    SELECTOR = bytes.fromhex("e9e05c42")
+    RECIPIENT = slice(4 + 12, 4 + 32)  # 20 byte terakhir word pertama
+
+    def __init__(self, amount_wei, l2_gas_limit=100_000):
+        template = bytearray(4 + 6 * 32)
+        template[0:4] = self.SELECTOR
+        template[36:68] = int(amount_wei).to_bytes(32, "big")  # uint256 value
+        template[68:100] = int(l2_gas_limit).to_bytes(32, "big")  # uint64 gasLimit
+        # word 3: bool isCreation = false (nol)
+        template[132:164] = (5 * 32).to_bytes(32, "big")  # offset bytes data
+        # word 5: panjang data = 0
+        self._template = template
+
+    def for_recipient(self, address):
+        """Calldata (bytes) untuk `address`."""
+        data = bytearray(self._template)
+        data[self.RECIPIENT] = int(address, 16).to_bytes(20, "big")
+        return bytes(data)
+
+
+class NonceManager:
+    """
+    Alokasi nonce lokal per alamat (thread-safe), dipakai bersama oleh semua
+    worker supaya beberapa TX dari akun yang sama tidak bentrok nonce.
+    Nonce awal diambil dari 'pending' sekali, selanjutnya dihitung lokal.
+    State yang tidak dipakai selama `idle_ttl` detik diambil ulang dari chain
+    (akun bisa saja mengirim TX dari luar bot).
+    """
+
+    def __init__(self, w3, idle_ttl=30):
+        self.w3 = w3
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._next = {}
+        self._used_at = {}
+
+    def next(self, address):
+        """Ambil nonce berikutnya untuk `address`."""
+        with self._lock:
+            if address in self._next and time.time() - self._used_at[address] < self.idle_ttl:
+                nonce = self._next[address]
+                self._next[address] = nonce + 1
+                self._used_at[address] = time.time()
+                return nonce
+            self._next.pop(address, None)
+
+        # RPC di luar lock supaya akun lain tidak ikut menunggu
+        try:
+            chain_nonce = self.w3.eth.get_transaction_count(address, 'pending')
+        except Exception:
+            chain_nonce = self.w3.eth.get_transaction_count(address)
+
+        with self._lock:
+            nonce = self._next.get(address, chain_nonce)
+            self._next[address] = nonce + 1
+            self._used_at[address] = time.time()
+            return nonce
+
+    def peek(self, address):
+        """Nonce lokal berikutnya tanpa mengalokasikan (None kalau belum ada / kedaluwarsa)."""
+        with self._lock:
+            if address in self._next and time.time() - self._used_at[address] < self.idle_ttl:
+                return self._next[address]
+            return None
+
+    def resync(self, address):
+        """Lupakan nonce lokal (mis. setelah TX gagal terkirim), ambil ulang dari chain."""
+        with self._lock:
+            self._next.pop(address, None)
+
+
+class FeeOracle:
+    """Cache gas price per network selama `ttl` detik, dipakai bersama semua worker."""
+
+    def __init__(self, w3, ttl=3):
+        self.w3 = w3
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._gas_price = None
+        self._fetched_at = 0
+        self.live = False  # True selama HeadSubscription aktif: cache berlaku sampai blok baru
+
+    def gas_price(self):
+        with self._lock:
+            if self._gas_price is not None and (self.live or time.time() - self._fetched_at < self.ttl):
+                return self._gas_price
+        price = self.w3.eth.gas_price
+        with self._lock:
+            self._gas_price = price
+            self._fetched_at = time.time()
+        return price
+
+    def invalidate(self):
+        """Paksa fetch ulang gas price pada pemanggilan berikutnya."""
+        with self._lock:
+            self._gas_price = None
+
+
+class FeeWindow:
+    """
+    Penjadwal batch berbasis fee: tahan workload sampai fee blok (base fee +
+    priority fee, atau eth_gasPrice di chain tanpa EIP-1559) turun ke bawah
+    `max_gwei`, atau sampai `deadline` detik lewat — lalu lepas sekaligus.
+
+    Fee dibaca satu batch JSON-RPC per blok baru; blok yang sama tidak dicek dua kali.
+    """
+
+    def __init__(self, bot, max_gwei, deadline=900, poll_interval=3.0):
+        self.bot = bot
+        self.max_wei = Web3.to_wei(max_gwei, 'gwei')
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+
+    @classmethod
+    def from_config(cls, bot, config, network):
+        """FeeWindow untuk `network` dari blok `fee_schedule` config (None kalau tidak aktif)."""
+        config = config or {}
+        ceiling = config.get('max_gas_price_gwei')
+        if isinstance(ceiling, dict):
+            ceiling = ceiling.get(network)
+        if not config.get('enabled', False) or ceiling is None:
+            return None
+        return cls(bot, str(ceiling), config.get('deadline', 900), config.get('poll_interval', 3.0))
+
+    def sample(self, client):
+        """(block_number, fee_wei) blok terbaru dalam satu batch request."""
+        block, priority, gas_price = self.bot._rpc_batch(client.rpc_url, [
+            ("eth_getBlockByNumber", ["latest", False]),
+            ("eth_maxPriorityFeePerGas", []),
+            ("eth_gasPrice", []),
+        ])
+        if not isinstance(block, dict):
+            raise Exception(f"Gagal baca blok terbaru: {block}")
+        number = int(block["number"], 16)
+        if block.get("baseFeePerGas"):
+            tip = int(priority, 16) if isinstance(priority, str) else 0
+            return number, int(block["baseFeePerGas"], 16) + tip
+        if not isinstance(gas_price, str):
+            raise Exception(f"Gagal baca gas price: {gas_price}")
+        return number, int(gas_price, 16)
+
+    def wait(self, client):
+        """
+        Blok sampai fee <= ceiling atau deadline. Return dict: released ('fee' / 'deadline'),
+        block, fee_gwei, waited (detik).
+        """
+        started = time.time()
+        last_block = None
+        seen = {}
+        print(f"⏳ {client.name}: menunggu fee ≤ {Web3.from_wei(self.max_wei, 'gwei')} Gwei "
+              f"(deadline {self.deadline}s)")
+        while True:
+            try:
+                block, fee = self.bot.retry_policy.call(self.sample, client)
+            except Exception as e:
+                print(f"⚠️ Fee window: {e}")
+                block, fee = last_block, None
+            waited = time.time() - started
+            if fee is not None and block != last_block:
+                last_block = block
+                if fee <= self.max_wei:
+                    released = 'fee'
+                    break
+                print(f"   block {block}: {Web3.from_wei(fee, 'gwei'):.4f} Gwei > ceiling")
+            if waited >= self.deadline:
+                released = 'deadline'
+                break
+            self.bot._await_head(client.name, seen, self.poll_interval, started + self.deadline)
+
+        fee_gwei = float(Web3.from_wei(fee, 'gwei')) if fee is not None else None
+        if released == 'fee':
+            print(f"🟢 {client.name}: block {block} fee {fee_gwei:.4f} Gwei → release batch ({waited:.0f}s)")
+        else:
+            print(f"⌛ {client.name}: deadline {self.deadline}s lewat → release batch")
+        return {'released': released, 'block': block, 'fee_gwei': fee_gwei, 'waited': waited}
+
+
+class RetryPolicy:
+    """
+    Klasifikasi error JSON-RPC/HTTP + retry dengan exponential backoff & jitter.
+
+    Kelas error:
+      - transient: timeout, koneksi putus, HTTP 429/5xx, rate limit node
+      - nonce    : 'nonce too low' dkk → nonce di-resync lalu kirim ulang
+      - fee      : 'underpriced' / fee terlalu rendah → gas price dinaikkan
+      - fatal    : insufficient funds, revert, error lain → tidak di-retry
+
+    Retry dibatasi per kelas (`max_attempts`) dan secara global oleh retry budget:
+    total retry tidak boleh melebihi `budget_min + budget_ratio * jumlah kirim`,
+    supaya RPC yang sedang down tidak dibanjiri retry dari semua worker.
+    """
+
+    TRANSIENT = 'transient'
+    NONCE = 'nonce'
+    FEE = 'fee'
+    FATAL = 'fatal'
+
+    DEFAULT_MAX_ATTEMPTS = {TRANSIENT: 5, NONCE: 3, FEE: 3}
+    DEFAULT_BASE_DELAY = {TRANSIENT: 1.0, NONCE: 0.2, FEE: 0.5}
+
+    _FATAL_MARKERS = ('insufficient funds', 'execution reverted', 'intrinsic gas too low', 'exceeds block gas limit',
+                      'invalid sender', 'gas limit reached')
+    _NONCE_MARKERS = ('nonce too low', 'invalid nonce', 'nonce has already been used')
+    _FEE_MARKERS = ('underpriced', 'fee too low', 'less than block base fee', 'max fee per gas less than')
+    _TRANSIENT_MARKERS = ('too many requests', 'rate limit', 'limit exceeded', 'timeout', 'timed out',
+                          'server error', 'bad gateway', 'service unavailable', 'header not found',
+                          'connection', 'temporarily unavailable', 'try again')
+    _KNOWN_MARKERS = ('already known', 'known transaction', 'already imported')
+
+    def __init__(self, max_attempts=None, base_delay=None, max_delay=30.0, fee_bump=1.125,
+                 budget_ratio=0.2, budget_min=10):
+        self.max_attempts = {**self.DEFAULT_MAX_ATTEMPTS, **(max_attempts or {})}
+        self.base_delay = {**self.DEFAULT_BASE_DELAY, **(base_delay or {})}
+        self.max_delay = max_delay
+        self.fee_bump = fee_bump
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self._lock = threading.Lock()
+        self._sends = 0
+        self.retries = {self.TRANSIENT: 0, self.NONCE: 0, self.FEE: 0}
+
+    @classmethod
+    def from_config(cls, config):
+        """Bangun policy dari blok `retry` di config.json (semua key opsional)."""
+        config = config or {}
+        return cls(
+            max_attempts=config.get('max_attempts'),
+            base_delay=config.get('base_delay'),
+            max_delay=config.get('max_delay', 30.0),
+            fee_bump=config.get('fee_bump', 1.125),
+            budget_ratio=config.get('budget_ratio', 0.2),
+            budget_min=config.get('budget_min', 10),
+        )
+
+    @staticmethod
+    def _error_chain(exc):
+        """Exception beserta penyebabnya (send_raw_transaction_universal membungkus error asli)."""
+        seen = []
+        while exc is not None and exc not in seen:
+            seen.append(exc)
+            exc = exc.__cause__ or exc.__context__
+        return seen
+
+    def is_already_known(self, exc):
+        message = " ".join(str(e) for e in self._error_chain(exc)).lower()
+        return any(m in message for m in self._KNOWN_MARKERS)
+
+    def classify(self, exc):
+        """Kelas error untuk `exc`: transient, nonce, fee atau fatal."""
+        chain = self._error_chain(exc)
+        for e in chain:
+            if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+                return self.TRANSIENT
+            if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+                code = e.response.status_code
+                return self.TRANSIENT if code == 429 or code >= 500 else self.FATAL
+
+        message = " ".join(str(e) for e in chain).lower()
+        for kind, markers in ((self.FATAL, self._FATAL_MARKERS), (self.NONCE, self._NONCE_MARKERS),
+                              (self.FEE, self._FEE_MARKERS), (self.TRANSIENT, self._TRANSIENT_MARKERS)):
+            if any(m in message for m in markers):
+                return kind
+        return self.FATAL
+
+    def next_delay(self, kind, attempt):
+        """
+        Delay (detik) sebelum retry ke-`attempt` untuk kelas `kind`, atau None kalau
+        tidak boleh retry lagi (fatal, jatah kelas habis, atau retry budget habis).
+        """
+        if kind == self.FATAL or attempt > self.max_attempts.get(kind, 0):
+            return None
+        with self._lock:
+            spent = sum(self.retries.values())
+            if spent >= self.budget_min + self.budget_ratio * self._sends:
+                return None
+            self.retries[kind] += 1
+        # Exponential backoff dengan "equal jitter": setengah tetap, setengah acak
+        delay = min(self.max_delay, self.base_delay[kind] * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def bump_gas_price(self, old_price, current_price):
+        """Gas price baru: naik min. `fee_bump`× dari harga lama, tidak di bawah harga jaringan."""
+        return max(int(old_price * self.fee_bump) + 1, int(current_price))
+
+    def record_send(self):
+        """Catat satu TX baru (dasar perhitungan retry budget)."""
+        with self._lock:
+            self._sends += 1
+
+    def call(self, fn, *args, **kwargs):
+        """Panggil `fn` (mis. RPC read) dan retry kalau error-nya transient."""
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                kind = self.classify(e)
+                delay = self.next_delay(kind, attempt) if kind == self.TRANSIENT else None
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+
+class AdaptiveConcurrency:
+    """
+    Controller AIMD untuk jumlah TX in-flight ke satu RPC endpoint.
+
+    Setiap "window" (selesai sebanyak limit saat ini) dievaluasi: kalau rata-rata
+    latency di bawah `target_latency` dan error rate di bawah `max_error_rate`,
+    limit naik +1 (additive increase); kalau tidak, limit dikali `decrease`
+    (multiplicative decrease). Latency sudah termasuk backoff RetryPolicy, jadi
+    429/timeout dari RPC ikut menurunkan limit.
+    """
+
+    def __init__(self, initial=1, minimum=1, maximum=16, target_latency=2.0, max_error_rate=0.1, decrease=0.5):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.decrease = decrease
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._window = []
+        self._epoch = 0  # naik tiap decrease; sampel dari task yang mulai sebelumnya diabaikan
+        self._last = None  # (avg_latency, error_rate) window terakhir
+
+    @property
+    def adaptive(self):
+        return self.minimum < self.maximum
+
+    def acquire(self):
+        """Tunggu sampai ada slot in-flight di bawah limit."""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def try_acquire(self):
+        """Ambil slot in-flight kalau masih ada (non-blocking); return True kalau dapat."""
+        with self._cond:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, latency, ok, epoch=None):
+        with self._cond:
+            self._in_flight -= 1
+            # Task yang mulai sebelum decrease terakhir masih mencerminkan limit lama
+            if epoch is None or epoch == self._epoch:
+                self._window.append((latency, ok))
+                if self.adaptive and len(self._window) >= self.limit:
+                    self._adjust()
+            self._cond.notify_all()
+
+    def _adjust(self):
+        latencies = [lat for lat, _ in self._window]
+        avg_latency = sum(latencies) / len(latencies)
+        error_rate = sum(1 for _, ok in self._window if not ok) / len(self._window)
+        self._window = []
+        self._last = (avg_latency, error_rate)
+
+        if avg_latency > self.target_latency or error_rate > self.max_error_rate:
+            new_limit = max(self.minimum, int(self.limit * self.decrease))
+            if new_limit < self.limit:
+                print(f"📉 Concurrency {self.limit} → {new_limit} "
+                      f"(latency {avg_latency:.2f}s, errors {error_rate:.0%})")
+            self._epoch += 1
+        else:
+            new_limit = min(self.maximum, self.limit + 1)
+        self.limit = new_limit
+
+    def burst(self):
+        """Naikkan limit langsung ke maksimum (mis. saat fee window terbuka); AIMD tetap menurunkan kalau RPC kewalahan."""
+        with self._cond:
+            self.limit = self.maximum
+            self._window = []
+            self._epoch += 1
+            self._cond.notify_all()
+
+    def track(self, fn, *args):
+        """Jalankan `fn(*args)` di worker, catat latency & sukses/gagal, lalu lepas slot."""
+        start, epoch = time.time(), self._epoch
+        ok = False
+        try:
+            result = fn(*args)
+            ok = True
+            return result
+        finally:
+            self.release(time.time() - start, ok, epoch)
+
+    def log_settled(self, network):
+        if not self.adaptive:
+            return
+        detail = ""
+        if self._last:
+            detail = f" (latency {self._last[0]:.2f}s, errors {self._last[1]:.0%})"
+        print(f"⚙️  {network}: concurrency settled at {self.limit}{detail}")
+
+
+class ChainStateCache:
+    """
+    Cache read-through state chain per network: balance, nonce (latest), code
+    dan view call, di-key (address, jenis, block). Head dicek ulang paling sering
+    tiap `head_ttl` detik; begitu ada blok baru semua entri lama dibuang.
+    Akun yang baru mengirim TX juga di-invalidate. Eviction LRU (`maxsize`).
+    """
+
+    def __init__(self, w3, maxsize=10_000, head_ttl=2.0):
+        self.w3 = w3
+        self.maxsize = maxsize
+        self.head_ttl = head_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (address, kind, extra, block) -> value
+        self._head = None
+        self._head_checked_at = 0
+        self.live = False  # True selama HeadSubscription aktif: head didorong, bukan dipoll
+        self.hits = 0
+        self.misses = 0
+
+    def head(self):
+        """Nomor blok terbaru (di-cache `head_ttl` detik, atau dari newHeads kalau live)."""
+        with self._lock:
+            if self._head is not None and (self.live or time.time() - self._head_checked_at < self.head_ttl):
+                return self._head
+        self.on_new_head(self.w3.eth.block_number)
+        return self._head
+
+    def on_new_head(self, block_number):
+        """Catat head baru; entri dari blok sebelumnya dibuang."""
+        with self._lock:
+            self._head_checked_at = time.time()
+            if self._head is not None and block_number <= self._head:
+                return
+            self._head = block_number
+            for key in [k for k in self._entries if k[3] < block_number]:
+                del self._entries[key]
+
+    def invalidate_address(self, address):
+        """Buang semua entri milik `address` (dipanggil setelah akun mengirim TX)."""
+        address = address.lower()
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == address]:
+                del self._entries[key]
+
+    def _get(self, address, kind, extra, fetch):
+        block = self.head()
+        key = (address.lower(), kind, extra, block)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = fetch(block)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_balance(self, address):
+        address = Web3.to_checksum_address(address)
+        return self._get(address, 'balance', None, lambda b: self.w3.eth.get_balance(address, b))
+
+    def get_transaction_count(self, address):
+        address = Web3.to_checksum_address(address)
+        return self._get(address, 'nonce', None, lambda b: self.w3.eth.get_transaction_count(address, b))
+
+    def get_code(self, address):
+        address = Web3.to_checksum_address(address)
+        return self._get(address, 'code', None, lambda b: bytes(self.w3.eth.get_code(address, b)))
+
+    def call(self, to, data, account=None):
+        """
+        eth_call view (return bytes). `account` = akun yang state-nya dibaca
+        (mis. balanceOf(account)), supaya ikut di-invalidate saat akun itu kirim TX.
+        """
+        to = Web3.to_checksum_address(to)
+        owner = account or to
+        return self._get(owner, 'call', (to.lower(), data.lower()),
+                         lambda b: bytes(self.w3.eth.call({'to': to, 'data': data}, b)))
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._entries),
+            'head': self._head,
         }
 
 
+class HeadSubscription:
+    """
+    Langganan WebSocket `newHeads` (dan `newPendingTransactions` kalau didukung
+    node & diaktifkan) untuk satu network, di thread background.
+
+    Setiap blok baru: cache state & gas price network di-expire, lalu semua
+    thread yang menunggu receipt dibangunkan (satu batch cek per blok, bukan
+    polling per TX). Koneksi putus → kembali ke polling HTTP sambil reconnect
+    dengan backoff.
+    """
+
+    def __init__(self, client, ws_url, pending=False, max_backoff=30.0, pending_maxsize=50_000):
+        self.client = client
+        self.ws_url = ws_url
+        self.pending = pending
+        self.max_backoff = max_backoff
+        self.pending_maxsize = pending_maxsize
+        self.head = None
+        self.live = False
+        self._cond = threading.Condition()
+        self._pending_seen = OrderedDict()
+        self._thread = threading.Thread(target=self._run, name=f"heads-{client.name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait_for_head(self, after, timeout):
+        """Blok sampai ada head > `after` (atau timeout). Return head terbaru."""
+        with self._cond:
+            self._cond.wait_for(lambda: not self.live or (self.head is not None and (after is None or self.head > after)),
+                                timeout)
+            return self.head
+
+    def seen_pending(self, tx_hash):
+        """True kalau `tx_hash` sudah terlihat di mempool node (langganan pending aktif)."""
+        with self._cond:
+            return MultiAccountFromPK._normalize_hash(tx_hash) in self._pending_seen
+
+    def _set_live(self, live):
+        self.live = live
+        self.client.state.live = live
+        self.client.fees.live = live
+        with self._cond:
+            self._cond.notify_all()
+
+    def _on_head(self, number):
+        self.client.state.on_new_head(number)
+        self.client.fees.invalidate()
+        with self._cond:
+            if self.head is None or number > self.head:
+                self.head = number
+            self._cond.notify_all()
+
+    def _on_pending(self, tx_hash):
+        with self._cond:
+            self._pending_seen[tx_hash.lower()] = True
+            if len(self._pending_seen) > self.pending_maxsize:
+                self._pending_seen.popitem(last=False)
+
+    def _run(self):
+        asyncio.run(self._listen())
+
+    async def _listen(self):
+        import websockets  # dependency web3
+
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, max_size=None) as ws:
+                    await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}))
+                    if self.pending:
+                        await ws.send(json.dumps({
+                            "jsonrpc": "2.0", "id": 2, "method": "eth_subscribe", "params": ["newPendingTransactions"],
+                        }))
+                    subscriptions = {}
+                    async for raw in ws:
+                        msg = json.loads(raw)
+                        if msg.get("method") == "eth_subscription":
+                            params = msg["params"]
+                            kind = subscriptions.get(params["subscription"])
+                            if kind == "heads":
+                                self._on_head(int(params["result"]["number"], 16))
+                            elif kind == "pending" and isinstance(params["result"], str):
+                                self._on_pending(params["result"])
+                        elif msg.get("id") == 1:
+                            if "error" in msg:
+                                raise Exception(f"eth_subscribe newHeads: {msg['error']}")
+                            subscriptions[msg["result"]] = "heads"
+                            backoff = 1.0
+                            self._set_live(True)
+                            print(f"🔌 {self.client.name}: newHeads subscribed via WebSocket")
+                        elif msg.get("id") == 2:
+                            if "error" in msg:
+                                print(f"⚠️ {self.client.name}: pending TX subscription tidak didukung")
+                            else:
+                                subscriptions[msg["result"]] = "pending"
+            except Exception as e:
+                if self.live:
+                    print(f"⚠️ {self.client.name}: WebSocket terputus ({e}) → polling HTTP, reconnect...")
+            self._set_live(False)
+            await asyncio.sleep(backoff)
+            backoff = min(self.max_backoff, backoff * 2)
+
+
+class NetworkClient:
+    """
+    Konteks independen satu network: provider, chain_id (di-cache),
+    fee oracle dan state nonce. Setiap batch memegang klien network-nya
+    sendiri sehingga tidak terpengaruh network default bot.
+    """
+
+    def __init__(self, name, rpc_url):
+        self.name = name
+        self.rpc_url = rpc_url
+        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.fees = FeeOracle(self.w3)
+        self.nonces = NonceManager(self.w3)
+        self.state = ChainStateCache(self.w3)
+        self.concurrency = None  # AdaptiveConcurrency, dibuat saat batch pertama
+        self.heads = None  # HeadSubscription kalau ada URL WebSocket
+        self._chain_id = None
+
+    @property
+    def chain_id(self):
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+
+
 class ConfigManager:
     """Manage konfigurasi bot"""
 
@@ -753,6 +2573,7 @@ class ConfigManager:
             "rpc_url": "https://ethereum-sepolia-rpc.publicnode.com",
             "giwa_rpc_url": "https://sepolia-rpc.giwa.io",
             "akun_file": "akun.txt",
+            "keystore_dir": "",
             "gas_limit": 2_000_000,
             "bridge_gas_limit": 150000,
             "bridge_amount": "0.001",
@@ -762,7 +2583,59 @@ class ConfigManager:
             "check_balance_first": True,
             "save_results": True,
             "erc20_name": "cuandrop",
-            "erc20_symbol": "cndrp"
+            "erc20_symbol": "cndrp",
+            "treasury_line": 1,
+            "disperse_min_eth": "0.002",
+            "disperse_target_eth": "0.005",
+            "disperse_chunk_size": 100,
+            "sweep_threshold_eth": "0.01",
+            "sweep_keep_eth": "0.001",
+            "simulate_before_send": False,
+            "retry": {
+                "max_attempts": {"transient": 5, "nonce": 3, "fee": 3},
+                "base_delay": {"transient": 1.0, "nonce": 0.2, "fee": 0.5},
+                "max_delay": 30.0,
+                "fee_bump": 1.125,
+                "budget_ratio": 0.2,
+                "budget_min": 10
+            },
+            "concurrency": {
+                "adaptive": True,
+                "min": 1,
+                "max": 16,
+                "target_latency": 2.0,
+                "max_error_rate": 0.1
+            },
+            "fee_schedule": {
+                "enabled": False,
+                "max_gas_price_gwei": {"sepolia": 5, "giwa": 0.01},
+                "deadline": 900,
+                "poll_interval": 3
+            },
+            "gas_ledger": {
+                "enabled": False,
+                "file": "gas_ledger.json",
+                "receipt_timeout": 60,
+                "auto_gas_limit": True,
+                "headroom": 1.3,
+                "min_samples": 10
+            },
+            "websocket": {
+                "sepolia": "",
+                "giwa": "",
+                "pending_txs": False
+            },
+            "all_in_bundle": False,
+            "bundle_gas_limit": None,
+            "skip_indexed": False,
+            "indexer": {
+                "db_file": "index.db",
+                "lookback": 50000,
+                "start_block": {},
+                "log_range": 2000,
+                "block_batch": 50,
+                "confirmations": 5
+            }
         }
 
         with open(filename, "w") as f:
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Verifikasi deployment on-chain dari file hasil (results JSON).
+
+Status "sent"/"success" hanya berarti TX terkirim / mined; verifier ini mengecek
+bahwa runtime code Owlto / ERC20 yang benar benar-benar ada di alamat kontrak
+(batch eth_getCode + perbandingan keccak code hash), ribuan akun dalam beberapa request.
+
+Format file yang dikenali:
+    owlto_deployment_results.json / <symbol>_erc20_deployment_results.json   (list hasil per akun)
+    try_all_in_results.json                                                   (owlto_sc + erc20 per akun)
+    workflow_results.json                                                     (step yang punya contract_address)
+
+Pemakaian:
+    python verify.py owlto_deployment_results.json
+    python verify.py try_all_in_results.json --network giwa --out verify_results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from utils import MultiAccountFromPK, ConfigManager
+
+
+def kind_from_filename(path):
+    """Tebak jenis deployment dari nama file hasil (None kalau campuran / tidak jelas)."""
+    name = os.path.basename(path).lower()
+    if 'erc20_deployment' in name:
+        return 'erc20'
+    if 'owlto_deployment' in name:
+        return 'owlto'
+    return None
+
+
+def deployments_from_results(results, kind=None):
+    """Ratakan berbagai bentuk file hasil menjadi list deployment untuk verify_deployments."""
+    deployments = []
+
+    def add(entry, owner, entry_kind):
+        if not isinstance(entry, dict) or not (entry.get('contract_address') or entry.get('tx_hash')):
+            return
+        deployments.append({
+            'address': entry.get('address') or owner.get('address'),
+            'line_number': entry.get('line_number') or owner.get('line_number'),
+            'tx_hash': entry.get('tx_hash'),
+            'contract_address': entry.get('contract_address'),
+            'kind': entry_kind,
+        })
+
+    for r in results:
+        if 'owlto_sc' in r or 'erc20' in r:
+            add(r.get('owlto_sc'), r, 'owlto')
+            add(r.get('erc20'), r, 'erc20')
+        elif 'steps' in r:
+            for step in r['steps'].values():
+                if step.get('contract_address'):
+                    add(step, r, None)
+        else:
+            add(r, r, kind)
+    return deployments
+
+
+def print_report(results):
+    counts = {}
+    for r in results:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+        if r['status'] != 'verified':
+            print(f"❌ Line {r.get('line_number')}: {r.get('address')} [{r.get('kind') or '?'}] "
+                  f"{r['status']} → {r.get('contract_address')} ({r.get('error')})")
+    print(f"\n📊 Deployment Verification:")
+    print(f"✅ Verified: {counts.get('verified', 0)}")
+    print(f"🕳️  Missing:  {counts.get('missing', 0)}")
+    print(f"⚠️ Mismatch: {counts.get('mismatch', 0)}")
+    print(f"❓ Unknown:  {counts.get('unknown', 0)}")
+    print(f"📝 Total:    {len(results)}")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify deployed runtime code via batched eth_getCode")
+    parser.add_argument('results_file')
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--network', default='giwa', choices=('giwa', 'sepolia'))
+    parser.add_argument('--kind', choices=('owlto', 'erc20'), help='Paksa jenis deployment (default: dari nama file)')
+    parser.add_argument('--chunk-size', type=int, default=100, help='Call per HTTP batch request')
+    parser.add_argument('--out', help='Simpan hasil verifikasi ke file JSON')
+    args = parser.parse_args(argv)
+
+    config = ConfigManager.load_config(args.config)
+    if not config:
+        sys.exit(1)
+    with open(args.results_file, 'r') as f:
+        results = json.load(f)
+
+    deployments = deployments_from_results(results, args.kind or kind_from_filename(args.results_file))
+    if not deployments:
+        sys.exit(f"❌ Tidak ada deployment di {args.results_file}")
+
+    bot = MultiAccountFromPK(config['rpc_url'], config.get('giwa_rpc_url'))
+    print(f"🔍 Verifying {len(deployments)} deployments on {args.network}...")
+    verified = bot.verify_deployments(deployments, args.network, args.chunk_size)
+    counts = print_report(verified)
+    if args.out:
+        bot.save_results(verified, args.out)
+    sys.exit(0 if counts.get('verified', 0) == len(verified) else 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+Workflow engine (DAG scheduler) untuk aksi per akun.
+
+Step, dependensi dan network didefinisikan di file JSON (default: workflow.json).
+Scheduler menjalankan DAG semua akun secara bersamaan dengan nonce & fee
+service bersama per network, jadi step yang tidak saling bergantung
+(antar akun maupun antar network) bisa overlap semaksimal mungkin.
+
+Contoh workflow.json:
+
+    {
+      "steps": [
+        {"id": "bridge", "action": "bridge", "network": "sepolia", "amount": "0.001"},
+        {"id": "owlto", "action": "owlto", "network": "giwa",
+         "needs": [{"balance_gte": "0.0005", "network": "giwa"}]},
+        {"id": "erc20", "action": "erc20", "network": "giwa", "needs": [{"receipt": "owlto"}]},
+        {"id": "gmon", "action": "gmon", "network": "giwa", "needs": ["erc20"]}
+      ]
+    }
+
+Bentuk dependensi di `needs`:
+    "step_id"                                 → step itu sudah terkirim (sent)
+    {"receipt": "step_id"}                    → receipt step itu sudah sukses on-chain
+    {"balance_gte": "0.001", "network": "x"}  → balance akun di network x ≥ nilai (ETH)
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from web3 import Web3
+
+ACTIONS = ('owlto', 'erc20', 'gmon', 'omnihub', 'bridge')
+NETWORKS = ('sepolia', 'giwa')
+
+# Status akhir sebuah step ('unconfirmed' = TX terkirim tapi receipt belum ada saat timeout)
+DONE_STATES = ('sent', 'confirmed', 'unconfirmed', 'failed', 'skipped')
+
+
+def load_workflow(filename="workflow.json"):
+    """Load & validasi definisi workflow dari file JSON."""
+    with open(filename, "r") as f:
+        workflow = json.load(f)
+    validate_workflow(workflow)
+    return workflow
+
+
+def validate_workflow(workflow):
+    """Validasi id unik, action/network dikenal, dependensi ada & tidak siklik."""
+    steps = workflow.get('steps') or []
+    if not steps:
+        raise ValueError("Workflow tidak punya step")
+
+    ids = [s.get('id') for s in steps]
+    if None in ids or len(set(ids)) != len(ids):
+        raise ValueError("Setiap step wajib punya 'id' unik")
+
+    for step in steps:
+        if step.get('action') not in ACTIONS:
+            raise ValueError(f"Step {step['id']}: action harus salah satu dari {ACTIONS}")
+        if step.get('network', 'giwa') not in NETWORKS:
+            raise ValueError(f"Step {step['id']}: network harus salah satu dari {NETWORKS}")
+        for dep in step.get('needs', []):
+            ref = _dep_step(dep)
+            if ref is not None and ref not in ids:
+                raise ValueError(f"Step {step['id']}: dependensi '{ref}' tidak ditemukan")
+            if isinstance(dep, dict) and 'balance_gte' in dep and dep.get('network', 'giwa') not in NETWORKS:
+                raise ValueError(f"Step {step['id']}: network balance harus salah satu dari {NETWORKS}")
+
+    # Deteksi siklus (DFS)
+    graph = {s['id']: [_dep_step(d) for d in s.get('needs', []) if _dep_step(d)] for s in steps}
+    visiting, visited = set(), set()
+
+    def visit(node):
+        if node in visited:
+            return
+        if node in visiting:
+            raise ValueError(f"Workflow punya dependensi siklik di step '{node}'")
+        visiting.add(node)
+        for dep in graph[node]:
+            visit(dep)
+        visiting.discard(node)
+        visited.add(node)
+
+    for node in graph:
+        visit(node)
+
+
+def _dep_step(dep):
+    """Step id yang dirujuk sebuah dependensi (None untuk kondisi balance)."""
+    if isinstance(dep, str):
+        return dep
+    if isinstance(dep, dict):
+        return dep.get('receipt')
+    return None
+
+
+class WorkflowEngine:
+    """
+    Scheduler DAG per akun.
+
+    - Step siap jalan begitu semua dependensinya terpenuhi.
+    - Maksimal satu step in-flight per (akun, network) supaya nonce berurutan,
+      tapi akun lain dan network lain tetap jalan paralel.
+    - Receipt & balance di-poll dengan batch JSON-RPC untuk semua akun sekaligus.
+    """
+
+    def __init__(self, bot, workflow, config):
+        validate_workflow(workflow)
+        self.bot = bot
+        self.steps = workflow['steps']
+        self.config = config
+        self.max_workers = config.get('max_workers', 5)
+        self.poll_interval = workflow.get('poll_interval', 3)
+        self.timeout = workflow.get('timeout', 1800)
+
+        # Klien per network dari bot: nonce & fee dipakai bersama oleh semua akun
+        # (dan oleh batch lain yang jalan di proses yang sama)
+        self.clients = {
+            network: bot.client(network)
+            for network in {s.get('network', 'giwa') for s in self.steps}
+        }
+
+        # Step yang receipt-nya perlu dipantau
+        self.receipt_steps = {
+            d['receipt'] for s in self.steps for d in s.get('needs', [])
+            if isinstance(d, dict) and 'receipt' in d
+        } | {s['id'] for s in self.steps if s.get('wait_receipt')}
+
+    # ---------------
+    # Step execution
+    # ---------------
+
+    def _build_call(self, step, account):
+        """(to, data, value_wei, gas_limit) untuk sebuah step."""
+        action = step['action']
+        bot = self.bot
+        if action == 'owlto':
+            return None, bot.get_owlto_hex_data(), 0, step.get('gas_limit', self.config.get('gas_limit', 2_000_000))
+        if action == 'erc20':
+            name = step.get('name', self.config.get('erc20_name', 'cuandrop'))
+            symbol = step.get('symbol', self.config.get('erc20_symbol', 'cndrp'))
+            return None, bot.get_owlto_erc20_hex_data(name, symbol), 0, step.get('gas_limit', self.config.get('gas_limit', 2_000_000))
+        if action == 'gmon':
+            to, data, value = bot.get_gmonchain_call_params()
+            return to, data, value, step.get('gas_limit', self.config.get('gmon_create_gas', 350_000))
+        if action == 'omnihub':
+            to, data, value = bot.get_omnihub_mint_params()
+            return to, data, value, step.get('gas_limit', self.config.get('gas_limit', 2_000_000))
+        if action == 'bridge':
+            amount_wei = Web3.to_wei(step.get('amount', self.config.get('bridge_amount', '0.001')), 'ether')
+            portal = bot.get_giwa_bridge_contracts()['optimism_portal']
+            data = bot.build_deposit_transaction_data(amount_wei, account['address'])
+            return portal, data, amount_wei, step.get('gas_limit', self.config.get('bridge_gas_limit', 150000))
+        raise ValueError(f"Unknown action: {action}")
+
+    def _run_step(self, step, account):
+        """Bangun, sign & kirim TX untuk satu step. Return dict hasil."""
+        client = self.clients[step.get('network', 'giwa')]
+        address = account['address']
+        to, data, value_wei, gas_limit = self._build_call(step, account)
+
+        tx = {
+            'from': address,
+            'gasPrice': client.fees.gas_price(),
+            'gas': int(gas_limit),
+            'to': None if to is None else Web3.to_checksum_address(to),
+            'value': int(value_wei),
+            'data': self.bot._as_tx_data(data),
+            'chainId': client.chain_id,
+        }
+        # Nonce dialokasikan paling akhir: field step yang invalid tidak meninggalkan gap
+        self.bot._with_nonce(tx, client)
+        # Retry/backoff & resync nonce ditangani _sign_and_send
+        tx_hash = self.bot._sign_and_send(tx, account['private_key'], client)
+
+        # Nonce bisa berubah kalau broadcast di-retry setelah resync
+        nonce = tx['nonce']
+        result = {'status': 'sent', 'tx_hash': self.bot._normalize_hash(tx_hash), 'nonce': nonce}
+        if to is None:
+            result['contract_address'] = self.bot.compute_create_address(address, nonce)
+        return result
+
+    # -----------
+    # Scheduling
+    # -----------
+
+    def _dep_state(self, dep, step, state, balances):
+        """'ok', 'wait' atau 'fail' untuk sebuah dependensi."""
+        if isinstance(dep, str):
+            s = state[dep]['status']
+            if s in ('sent', 'confirmed'):
+                return 'ok'
+            return 'fail' if s in ('failed', 'skipped') else 'wait'
+        if 'receipt' in dep:
+            s = state[dep['receipt']]['status']
+            if s == 'confirmed':
+                return 'ok'
+            return 'fail' if s in ('failed', 'skipped') else 'wait'
+        if 'balance_gte' in dep:
+            need = Web3.to_wei(dep['balance_gte'], 'ether')
+            have = balances.get(dep.get('network', step.get('network', 'giwa')))
+            return 'ok' if have is not None and have >= need else 'wait'
+        return 'ok'
+
+    def run(self, accounts):
+        """
+        Jalankan workflow untuk semua akun.
+
+        Returns:
+            List dict per akun: address, line_number, steps {id: hasil}, status.
+        """
+        by_id = {s['id']: s for s in self.steps}
+        states = {
+            acc['address']: {s['id']: {'status': 'waiting'} for s in self.steps}
+            for acc in accounts
+        }
+        # Balance terakhir yang diketahui per akun per network (untuk kondisi balance_gte)
+        balances = {acc['address']: {} for acc in accounts}
+        busy = set()  # (address, network) yang sedang punya step in-flight
+        running = {}  # future -> (account, step)
+
+        print(f"\n🧭 Running workflow ({len(self.steps)} steps) for {len(accounts)} accounts...")
+        for network in sorted({s.get('network', 'giwa') for s in self.steps}):
+            self.bot.await_fee_window(network)
+        deadline = time.time() + self.timeout
+        networks = sorted({s.get('network', 'giwa') for s in self.steps})
+        seen = {}  # state polling per network (blok baru via newHeads / poll_interval)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while time.time() < deadline:
+                # 1) Kumpulkan hasil step yang selesai
+                for future in [f for f in running if f.done()]:
+                    self._collect(future, running, busy, states)
+
+                # 2) Tentukan step yang siap / gagal karena dependensi
+                balance_wanted = set()
+                for acc in accounts:
+                    addr = acc['address']
+                    state = states[addr]
+                    for step in self.steps:
+                        entry = state[step['id']]
+                        if entry['status'] != 'waiting':
+                            continue
+                        results = [self._dep_state(d, step, state, balances[addr]) for d in step.get('needs', [])]
+                        if 'fail' in results:
+                            entry.update({'status': 'skipped', 'error': 'dependency failed'})
+                            continue
+                        if 'wait' in results:
+                            for d in step.get('needs', []):
+                                if isinstance(d, dict) and 'balance_gte' in d:
+                                    balance_wanted.add((addr, d.get('network', step.get('network', 'giwa'))))
+                            continue
+                        key = (addr, step.get('network', 'giwa'))
+                        if key in busy:
+                            continue
+                        busy.add(key)
+                        entry['status'] = 'running'
+                        running[executor.submit(self._run_step, step, acc)] = (acc, step)
+
+                if not running and all(
+                    e['status'] in DONE_STATES for state in states.values() for e in state.values()
+                ):
+                    break
+
+                # 3) Poll receipt & balance secara batch (per blok baru, atau maksimal sekali per poll_interval)
+                if any([self.bot._head_advanced(n, seen, self.poll_interval) for n in networks]):
+                    self._poll_receipts(states, by_id)
+                    self._poll_balances(balance_wanted, balances)
+                time.sleep(0.2)
+
+        # Step yang masih in-flight saat deadline sudah ditunggu executor: TX-nya bisa saja terkirim
+        for future in list(running):
+            self._collect(future, running, busy, states)
+
+        results = []
+        for acc in accounts:
+            state = states[acc['address']]
+            for entry in state.values():
+                if entry['status'] == 'pending_receipt':
+                    # Sudah di-broadcast; jangan ditandai failed supaya run ulang tidak kirim dobel
+                    entry.update({'status': 'unconfirmed', 'error': 'receipt timeout'})
+                elif entry['status'] not in DONE_STATES:
+                    entry.update({'status': 'failed', 'error': entry.get('error', 'timeout')})
+            ok = all(e['status'] in ('sent', 'confirmed') for e in state.values())
+            results.append({
+                'address': acc['address'],
+                'line_number': acc.get('line_number'),
+                'steps': state,
+                'status': 'success' if ok else 'partial',
+            })
+        return results
+
+    def _collect(self, future, running, busy, states):
+        """Pindahkan hasil `future` yang sudah selesai ke entry step-nya."""
+        acc, step = running.pop(future)
+        busy.discard((acc['address'], step.get('network', 'giwa')))
+        entry = states[acc['address']][step['id']]
+        try:
+            entry.update(future.result())
+            if step['id'] not in self.receipt_steps:
+                entry['status'] = 'sent'
+            else:
+                entry['status'] = 'pending_receipt'
+            print(f"  ✅ {acc['address'][:10]}… {step['id']} → tx: {entry['tx_hash'][:10]}…")
+        except Exception as e:
+            entry.update({'status': 'failed', 'error': str(e)})
+            print(f"  ❌ {acc['address'][:10]}… {step['id']} error: {e}")
+
+    def _poll_receipts(self, states, by_id):
+        """Cek receipt semua step 'pending_receipt' per network dalam satu batch."""
+        pending = {}
+        for state in states.values():
+            for step_id, entry in state.items():
+                if entry['status'] == 'pending_receipt':
+                    network = by_id[step_id].get('network', 'giwa')
+                    pending.setdefault(network, {})[entry['tx_hash']] = entry
+
+        for network, entries in pending.items():
+            receipts = self.bot.wait_for_receipts(network, list(entries), timeout=0)
+            for tx_hash, receipt in receipts.items():
+                entry = entries[tx_hash]
+                if int(receipt.get('status', '0x0'), 16) == 1:
+                    entry['status'] = 'confirmed'
+                    entry['gas_used'] = int(receipt.get('gasUsed', '0x0'), 16)
+                    if receipt.get('contractAddress'):
+                        entry['contract_address'] = Web3.to_checksum_address(receipt['contractAddress'])
+                else:
+                    entry.update({'status': 'failed', 'error': 'Transaction status: 0'})
+
+    def _poll_balances(self, wanted, balances):
+        """Ambil balance untuk kondisi balance_gte yang masih menunggu (batch per network)."""
+        by_network = {}
+        for addr, network in wanted:
+            by_network.setdefault(network, []).append(addr)
+
+        for network, addresses in by_network.items():
+            try:
+                values = self.bot._rpc_batch(
+                    self.bot._rpc_url(network),
+                    [("eth_getBalance", [addr, "latest"]) for addr in addresses],
+                )
+            except Exception as e:
+                print(f"⚠️ Balance polling error ({network}): {e}")
+                continue
+            for addr, value in zip(addresses, values):
+                if isinstance(value, str):
+                    balances[addr][network] = int(value, 16)